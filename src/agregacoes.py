@@ -0,0 +1,101 @@
+"""Agregações das abas "Estatísticas" e "Análise de Time" do app.
+
+streamlit_app/app.py monta os gráficos a partir destas funções e
+src/benchmark.py mede as mesmas chamadas. As partidas do time vêm da
+MatchTable (linhas já indexadas por time) ou, se configurado, do banco
+SQLite de src/match_store.py.
+"""
+import numpy as np
+
+from .match_table import RESULTADOS, codificar_resultados, pontos_do_time
+
+ROTULOS_RESULTADO = {
+    'HOME_TEAM': 'Vitória Casa',
+    'AWAY_TEAM': 'Vitória Fora',
+    'DRAW': 'Empate'
+}
+
+
+def estatisticas_campeonato(df, tabela):
+    """Visão geral, gols por rodada, distribuição de resultados e gols por time
+
+    `tabela` é a MatchTable de `df`.
+    """
+    total_jogos = int((df['status'] == 'FINISHED').sum())
+    vitorias_casa = int((tabela.resultado == RESULTADOS['HOME_TEAM']).sum())
+    empates = int((tabela.resultado == RESULTADOS['DRAW']).sum())
+
+    gols_rodada = df.groupby('rodada').agg({
+        'gols_casa': 'sum',
+        'gols_fora': 'sum'
+    }).reset_index()
+    gols_rodada['total_gols'] = gols_rodada['gols_casa'] + gols_rodada['gols_fora']
+
+    resultados = df['vencedor'].value_counts()
+    resultados.index = resultados.index.map(ROTULOS_RESULTADO)
+
+    return {
+        'total_jogos': total_jogos,
+        'media_gols': (df['gols_casa'].mean() + df['gols_fora'].mean()) / 2,
+        'vitorias_casa': vitorias_casa / total_jogos * 100 if total_jogos else 0.0,
+        'empates': empates / total_jogos * 100 if total_jogos else 0.0,
+        'gols_rodada': gols_rodada,
+        'resultados': resultados,
+        'gols_pro': df.groupby('time_casa')['gols_casa'].sum() + df.groupby('time_fora')['gols_fora'].sum(),
+        'gols_contra': df.groupby('time_casa')['gols_fora'].sum() + df.groupby('time_fora')['gols_casa'].sum()
+    }
+
+
+def jogos_do_time(df, tabela, time, banco=None):
+    """Partidas do time com resultado, gols marcados e sofridos
+
+    Retorna (jogos, mandante, pontos), com `mandante` e `pontos` alinhados
+    às linhas de `jogos`. Com `banco`, as partidas vêm dos índices do SQLite;
+    se a consulta falhar, da MatchTable.
+    """
+    jogos = banco.partidas_time(time) if banco is not None else None
+    if jogos is not None:
+        mandante = (jogos['time_casa'] == time).to_numpy()
+        pontos = pontos_do_time(codificar_resultados(jogos['vencedor']), mandante)
+    else:
+        # Linhas do time já indexadas na MatchTable, sem comparar nomes
+        linhas = tabela.partidas_time(time)
+        jogos = df.iloc[linhas].copy()
+        mandante = tabela.mandante(linhas, time)
+        pontos = tabela.pontos(linhas, time)
+
+    jogos['resultado'] = np.select(
+        [pontos == 3, pontos == 0], ['Vitória', 'Derrota'], 'Empate'
+    )
+    jogos['gols_marcados'] = jogos['gols_casa'].where(mandante, jogos['gols_fora'])
+    jogos['gols_sofridos'] = jogos['gols_fora'].where(mandante, jogos['gols_casa'])
+    return jogos, mandante, pontos
+
+
+def desempenho_time(mandante, pontos):
+    """Vitórias, empates, derrotas e aproveitamento, no total e em casa/fora
+
+    No total, partidas sem resultado contam como empate, como na coluna
+    `resultado` de jogos_do_time; na divisão casa/fora ficam de fora.
+    """
+    mandante = np.asarray(mandante, dtype=bool)
+    vitorias = pontos == 3
+    empates = (pontos == 1) | (pontos < 0)
+    derrotas = pontos == 0
+    jogos = len(pontos)
+    return {
+        'vitorias': int(vitorias.sum()),
+        'empates': int(empates.sum()),
+        'derrotas': int(derrotas.sum()),
+        'aproveitamento': (3 * int(vitorias.sum()) + int(empates.sum())) / (3 * jogos) * 100 if jogos else 0.0,
+        'casa': {
+            'vitorias': int((vitorias & mandante).sum()),
+            'empates': int(((pontos == 1) & mandante).sum()),
+            'derrotas': int((derrotas & mandante).sum())
+        },
+        'fora': {
+            'vitorias': int((vitorias & ~mandante).sum()),
+            'empates': int(((pontos == 1) & ~mandante).sum()),
+            'derrotas': int((derrotas & ~mandante).sum())
+        }
+    }
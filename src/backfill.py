@@ -0,0 +1,49 @@
+"""Carga histórica de várias temporadas do football-data.
+
+Uso:
+    python -m src.backfill --temporadas 2014-2023 [--competicoes 2013 2014] [--workers 4]
+
+As temporadas são baixadas em paralelo respeitando o limite de taxa da API
+(configurado em `api` no config/config.yaml) e gravadas uma por arquivo em
+data/partidas/<competição>/<temporada>.parquet (ver src/storage.py), de onde
+o app e o treino leem as partidas da competição configurada.
+"""
+import argparse
+from datetime import datetime
+
+from .data_collector import BrasileiraoDataCollector
+
+
+def _temporadas(valores):
+    """Aceita anos avulsos e intervalos: ['2014-2016', '2020'] -> [2014, 2015, 2016, 2020]"""
+    temporadas = []
+    for valor in valores:
+        if '-' in valor:
+            inicio, fim = (int(parte) for parte in valor.split('-', 1))
+            temporadas.extend(range(inicio, fim + 1))
+        else:
+            temporadas.append(int(valor))
+    return sorted(set(temporadas))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Carga histórica de temporadas do football-data')
+    parser.add_argument('--temporadas', nargs='+', required=True, help='Anos ou intervalos (ex.: 2014-2023)')
+    parser.add_argument('--competicoes', nargs='+', type=int, default=None,
+                        help='IDs das competições (padrão: api.competition_id)')
+    parser.add_argument('--workers', type=int, default=4, help='Requisições simultâneas')
+    args = parser.parse_args()
+
+    collector = BrasileiraoDataCollector()
+    inicio = datetime.now()
+    resultado = collector.backfill(_temporadas(args.temporadas), args.competicoes, args.workers)
+    duracao = (datetime.now() - inicio).total_seconds()
+
+    for (competicao, temporada), partidas in sorted(resultado.items()):
+        situacao = f"{partidas} partidas" if partidas is not None else "erro (ver logs/data_collection.log)"
+        print(f"Competição {competicao}, temporada {temporada}: {situacao}")
+    print(f"Concluído em {duracao:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+"""Benchmark do pipeline sobre ligas sintéticas de tamanhos diferentes.
+
+Uso:
+    python -m src.benchmark [--temporadas 1 10 50] [--arvores 100] [--salvar-referencia]
+    python -m src.benchmark inferencia [--temporadas 10] [--arvores 500] [--repeticoes 1000]
+
+Para cada tamanho de liga (gerada por utils.gerar_liga, sempre a mesma para
+a mesma semente) mede preparar_dados_treino, BrasileiraoPredictor.treinar,
+prever_probabilidades e as agregações das abas do app. Os tempos são
+gravados em JSON (`benchmark.saida`) junto com o limite de cada etapa,
+derivado da referência (`benchmark.referencia`) e da tolerância; a saída é 1
+se alguma etapa passar do limite. --salvar-referencia grava os tempos da
+execução como nova referência, que só vale para a máquina em que foi medida.
+
+O comando `inferencia` treina a floresta na maior liga pedida e compara a
+latência de uma previsão isolada no predict_proba do sklearn e na
+FlorestaVetorizada (média, p50, p95 e p99), conferindo que as
+probabilidades coincidem.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+from .agregacoes import desempenho_time, estatisticas_campeonato, jogos_do_time
+from .data_processor import BrasileiraoDataProcessor
+from .inference import benchmark_inferencia
+from .match_table import MatchTable
+from .model import BrasileiraoPredictor
+from .standings import BrasileiraoStandings
+from .utils import carregar_config, gerar_liga
+
+
+def medir(funcao, repeticoes=3):
+    """Mediana em segundos de `repeticoes` execuções e o retorno da última"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        retorno = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos), retorno
+
+
+def agregacoes_app(df, processor, n_times=10):
+    """Agregações feitas pelas abas do app para alguns times e confrontos"""
+    tabela = MatchTable(df)
+    times = tabela.times[:n_times]
+
+    BrasileiraoStandings(df).tabela()
+    processor.calcular_estatisticas_times(df)
+
+    # Previsões: forma recente e confronto direto
+    for time_casa, time_fora in zip(times, np.roll(times, 1)):
+        processor.obter_forma_recente(df, time_casa, tabela=tabela)
+        processor.obter_forma_recente(df, time_fora, tabela=tabela)
+        df.iloc[tabela.confronto(time_casa, time_fora)[::-1]]
+
+    # Análise de Time
+    for time_selecionado in times:
+        _, mandante, pontos = jogos_do_time(df, tabela, time_selecionado)
+        desempenho_time(mandante, pontos)
+
+    # Estatísticas
+    estatisticas_campeonato(df, tabela)
+
+
+def executar_cenario(temporadas, n_times=20, arvores=100, repeticoes=3, semente=42):
+    """Tempos (segundos) de cada etapa do pipeline para uma liga sintética"""
+    df = gerar_liga(n_times=n_times, temporadas=temporadas, semente=semente,
+                    partidas_agendadas=n_times // 2)
+    processor = BrasileiraoDataProcessor()
+    tempos = {}
+
+    tempos['preparar_dados_treino'], (X, y) = medir(
+        lambda: processor.preparar_dados_treino(df), repeticoes
+    )
+
+    predictor = BrasileiraoPredictor()
+    predictor.model.set_params(n_estimators=arvores)
+    tempos['treinar'], resultado = medir(
+        lambda: predictor.treinar(
+            X, y,
+            datas=processor.partidas_treino['data'],
+            rodadas=processor.partidas_treino['rodada_global']
+        ),
+        1
+    )
+    if 'error' in resultado:
+        raise RuntimeError(f"Treino falhou com {temporadas} temporada(s): {resultado['error']}")
+
+    # A primeira previsão monta a floresta vetorizada; fica fora da medição
+    predictor.prever_probabilidades(X[-1:])
+    lote = X[-380:]
+    tempos['prever_probabilidades_lote'], _ = medir(lambda: predictor.prever_probabilidades(lote), repeticoes)
+    tempos['prever_probabilidades_partida'], _ = medir(lambda: predictor.prever_probabilidades(X[-1:]), repeticoes)
+
+    tempos['agregacoes_app'], _ = medir(lambda: agregacoes_app(df, processor), repeticoes)
+
+    return {'partidas': int(len(df)), 'amostras_treino': int(len(X)), 'tempos': tempos}
+
+
+def executar_inferencia(temporadas, n_times=20, arvores=500, repeticoes=1000, semente=42):
+    """Latências de uma previsão isolada no sklearn e na FlorestaVetorizada"""
+    df = gerar_liga(n_times=n_times, temporadas=temporadas, semente=semente)
+    processor = BrasileiraoDataProcessor()
+    X, y = processor.preparar_dados_treino(df)
+
+    predictor = BrasileiraoPredictor()
+    predictor.model.set_params(n_estimators=arvores)
+    predictor.model.fit(X, y)
+    return benchmark_inferencia(predictor.model, X, repeticoes)
+
+
+def comparar(resultados, referencia, tolerancia):
+    """Acrescenta referência, limite e regressão a cada etapa; retorna as regressões"""
+    regressoes = []
+    for cenario, dados in resultados.items():
+        etapas = {}
+        for etapa, segundos in dados['tempos'].items():
+            base = referencia.get(cenario, {}).get('tempos', {}).get(etapa)
+            if isinstance(base, dict):
+                base = base.get('segundos')
+            limite = base * (1 + tolerancia) if base is not None else None
+            regressao = limite is not None and segundos > limite
+            etapas[etapa] = {
+                'segundos': round(segundos, 6),
+                'referencia': base,
+                'limite': round(limite, 6) if limite is not None else None,
+                'regressao': regressao
+            }
+            if regressao:
+                regressoes.append((cenario, etapa, segundos, limite))
+        dados['tempos'] = etapas
+    return regressoes
+
+
+def _gravar_json(dados, caminho):
+    diretorio = os.path.dirname(caminho) or '.'
+    os.makedirs(diretorio, exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(dir=diretorio, suffix='.tmp')
+    try:
+        with os.fdopen(descritor, 'w', encoding='utf-8') as arquivo:
+            json.dump(dados, arquivo, indent=2, ensure_ascii=False)
+        os.replace(temporario, caminho)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do pipeline com ligas sintéticas')
+    parser.add_argument('comando', nargs='?', choices=['pipeline', 'inferencia'], default='pipeline',
+                        help='pipeline (padrão) ou latência de inferência')
+    parser.add_argument('--config', default='config/config.yaml')
+    parser.add_argument('--temporadas', nargs='+', type=int, default=None,
+                        help='Tamanhos das ligas em temporadas (padrão: benchmark.temporadas)')
+    parser.add_argument('--arvores', type=int, default=None, help='Árvores da floresta no treino')
+    parser.add_argument('--repeticoes', type=int, default=None, help='Execuções por etapa (mediana)')
+    parser.add_argument('--tolerancia', type=float, default=None,
+                        help='Folga sobre a referência antes de acusar regressão (0.25 = 25%%)')
+    parser.add_argument('--saida', default=None, help='JSON com os resultados')
+    parser.add_argument('--referencia', default=None, help='JSON de referência')
+    parser.add_argument('--salvar-referencia', action='store_true',
+                        help='Grava os tempos desta execução como referência')
+    args = parser.parse_args()
+
+    config = carregar_config(args.config).get('benchmark', {})
+    temporadas = args.temporadas or config.get('temporadas', [1, 10, 50])
+    arvores = args.arvores or config.get('arvores', 100)
+    repeticoes = args.repeticoes or config.get('repeticoes', 3)
+    tolerancia = args.tolerancia if args.tolerancia is not None else config.get('tolerancia', 0.25)
+    saida = args.saida or config.get('saida', 'benchmarks/resultados.json')
+    caminho_referencia = args.referencia or config.get('referencia', 'benchmarks/referencia.json')
+
+    if args.comando == 'inferencia':
+        config_inferencia = config.get('inferencia', {})
+        resultado = executar_inferencia(
+            max(args.temporadas or [config_inferencia.get('temporadas', 10)]),
+            config.get('n_times', 20),
+            args.arvores or config_inferencia.get('arvores', 500),
+            args.repeticoes or config_inferencia.get('repeticoes', 1000)
+        )
+        for caminho in ('sklearn', 'vetorizada'):
+            latencia = resultado[caminho]
+            print(
+                f"{caminho:>10}  média {latencia['media_ms']:8.3f} ms  p50 {latencia['p50_ms']:8.3f} ms  "
+                f"p95 {latencia['p95_ms']:8.3f} ms  p99 {latencia['p99_ms']:8.3f} ms"
+            )
+        print(f"Diferença máxima entre as probabilidades: {resultado['diferenca_maxima']:.3g}")
+        return
+
+    resultados = {}
+    for n in temporadas:
+        cenario = f"{n}_temporadas"
+        resultados[cenario] = executar_cenario(n, config.get('n_times', 20), arvores, repeticoes)
+        for etapa, segundos in resultados[cenario]['tempos'].items():
+            print(f"{cenario:>14} {etapa:<30} {segundos * 1000:10.2f} ms")
+
+    referencia = {}
+    if not args.salvar_referencia and os.path.exists(caminho_referencia):
+        with open(caminho_referencia, encoding='utf-8') as arquivo:
+            referencia = json.load(arquivo).get('cenarios', {})
+    regressoes = comparar(resultados, referencia, tolerancia)
+
+    relatorio = {
+        'criado_em': datetime.now().isoformat(),
+        'ambiente': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'sklearn': sklearn.__version__,
+            'cpus': os.cpu_count()
+        },
+        'parametros': {'arvores': arvores, 'repeticoes': repeticoes, 'tolerancia': tolerancia},
+        'cenarios': resultados
+    }
+    _gravar_json(relatorio, saida)
+    print(f"Resultados salvos em {saida}")
+    if args.salvar_referencia:
+        _gravar_json(relatorio, caminho_referencia)
+        print(f"Referência salva em {caminho_referencia}")
+
+    for cenario, etapa, segundos, limite in regressoes:
+        print(f"REGRESSÃO {cenario} {etapa}: {segundos * 1000:.2f} ms (limite {limite * 1000:.2f} ms)")
+    if regressoes:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
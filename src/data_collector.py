@@ -1,19 +1,64 @@
-import requests
 import pandas as pd
+import numpy as np
 import os
+import json
 from dotenv import load_dotenv
 import logging
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
 import time
 
+from .http_client import CacheRespostas, ClienteAPI
+from .json_stream import iterar_array
+from . import storage
+from .standings import BrasileiraoStandings
+from .utils import carregar_config
+
+
+def _converter_datas(datas):
+    """Converte os utcDate de uma vez (formato fixo da API, com fallback ISO 8601)"""
+    try:
+        return pd.to_datetime(datas, utc=True, format='%Y-%m-%dT%H:%M:%SZ')
+    except (ValueError, TypeError):
+        return pd.to_datetime(datas, utc=True, format='ISO8601')
+
 
 class BrasileiraoDataCollector:
+    # Status de partidas que ainda podem mudar (placar, data ou status)
+    STATUS_ABERTOS = ['SCHEDULED', 'TIMED', 'IN_PLAY', 'PAUSED']
+
     def __init__(self):
         load_dotenv()
         self.api_key = os.getenv('FOOTBALL_API_KEY')
-        self.base_url = 'http://api.football-data.org/v4'
         self.headers = {'X-Auth-Token': self.api_key}
-        self.competition_id = 2013  # ID do Brasileirão
+
+        try:
+            config_api = carregar_config().get('api', {})
+        except FileNotFoundError:
+            config_api = {}
+        # FOOTBALL_API_URL aponta o coletor para outro servidor (ex.: src/mock_api.py)
+        self.base_url = (
+            os.getenv('FOOTBALL_API_URL')
+            or config_api.get('base_url', 'http://api.football-data.org/v4')
+        )
+        self.competition_id = config_api.get('competition_id', 2013)  # ID do Brasileirão
+        self.temporada = config_api.get('temporada', 2023)  # Temporada atual
+        self.cliente = ClienteAPI(
+            self.base_url,
+            headers=self.headers,
+            requisicoes_por_minuto=config_api.get('requisicoes_por_minuto', 10),
+            timeout_conexao=config_api.get('timeout_conexao', 5),
+            timeout_leitura=config_api.get('timeout_leitura', 30),
+            max_tentativas=config_api.get('max_tentativas', 5),
+            backoff_base=config_api.get('backoff_base', 1.0),
+            backoff_max=config_api.get('backoff_max', 60.0),
+            cache=CacheRespostas(
+                config_api.get('cache_diretorio', 'data/cache'),
+                ttl=config_api.get('cache_ttl', 300)
+            )
+        )
+        # Indica se a última resposta de partidas diferia da que estava em cache
+        self.partidas_alteradas = True
 
         os.makedirs('logs', exist_ok=True)
         logging.basicConfig(
@@ -22,110 +67,387 @@ class BrasileiraoDataCollector:
             format='%(asctime)s - %(levelname)s - %(message)s'
         )
 
-    def get_matches(self):
-        """Obtém partidas do Brasileirão da temporada atual"""
+    def _obter_partidas(self, competicao, temporada, decodificar=True):
+        """Partidas de uma competição e temporada: (dados, alterado)"""
+        return self.cliente.get_json_cache(
+            f"/competitions/{competicao}/matches", params={'season': temporada},
+            decodificar=decodificar
+        )
+
+    def get_matches(self, temporada=None, competicao=None, decodificar=True):
+        """Obtém partidas do Brasileirão (por padrão, da temporada atual)
+
+        Com decodificar=False, devolve a origem do JSON (corpo gravado no
+        cache ou a resposta em stream) para process_matches_data ler em partes.
+        """
+        temporada = temporada or self.temporada
+        competicao = competicao or self.competition_id
         try:
-            url = f"{self.base_url}/competitions/2013/matches"
-            params = {'season': 2023}  # Temporada atual
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            logging.info(f"Dados obtidos com sucesso")
-            return response.json()
+            dados, self.partidas_alteradas = self._obter_partidas(competicao, temporada, decodificar)
+            logging.info(f"Dados obtidos com sucesso: competição {competicao}, temporada {temporada}")
+            return dados
         except Exception as e:
             logging.error(f"Erro ao obter dados: {str(e)}")
             return None
 
-    def get_team_standing(self):
-        """Obtém classificação atual do Brasileirão"""
+    def get_team_standing(self, temporada=None, competicao=None):
+        """Obtém classificação do Brasileirão (por padrão, da temporada atual)"""
+        temporada = temporada or self.temporada
+        competicao = competicao or self.competition_id
         try:
-            url = f"{self.base_url}/competitions/2013/standings"
-            params = {'season': 2023}  # Temporada atual
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json()
+            dados, _ = self.cliente.get_json_cache(
+                f"/competitions/{competicao}/standings", params={'season': temporada}
+            )
+            return dados
         except Exception as e:
             logging.error(f"Erro ao obter classificação: {str(e)}")
             return None
 
-    def process_matches_data(self, matches_data):
-        """Processa dados das partidas"""
-        matches_list = []
-
-        for match in matches_data.get('matches', []):
-            match_dict = {
-                'rodada': match.get('matchday', 0),
-                'data': match.get('utcDate', ''),
-                'status': match.get('status', ''),
-                'time_casa': match.get('homeTeam', {}).get('name', ''),
-                'time_fora': match.get('awayTeam', {}).get('name', ''),
-                'gols_casa': match.get('score', {}).get('fullTime', {}).get('home', 0),
-                'gols_fora': match.get('score', {}).get('fullTime', {}).get('away', 0),
-                'vencedor': match.get('score', {}).get('winner', ''),
-                'temporada': 2023  # Temporada atual
-            }
-            matches_list.append(match_dict)
+    def process_matches_data(self, matches_data, temporada=None):
+        """Processa dados das partidas
+
+        `matches_data` pode ser o payload já decodificado ou a origem do JSON
+        (texto, caminho de arquivo, arquivo aberto ou resposta do requests),
+        lida incrementalmente por iterar_array. Cada partida é escrita direto
+        em colunas tipadas pré-alocadas (times, status e vencedor como códigos
+        de categoria, gols em int8) e as datas são convertidas de uma vez no
+        final. A temporada de cada partida vem do próprio payload (ano de
+        season.startDate); na falta dele, usa `temporada` ou a temporada atual.
+        """
+        temporada_padrao = temporada or self.temporada
+
+        capacidade = 512
+        if isinstance(matches_data, dict):
+            capacidade = max(len(matches_data.get('matches') or []), 1)
+        colunas = {
+            'id': np.zeros(capacidade, dtype=np.int64),
+            'sem_id': np.zeros(capacidade, dtype=bool),
+            'rodada': np.zeros(capacidade, dtype=np.int16),
+            'data': np.empty(capacidade, dtype=object),
+            'status': np.zeros(capacidade, dtype=np.int8),
+            'time_casa': np.zeros(capacidade, dtype=np.int16),
+            'time_fora': np.zeros(capacidade, dtype=np.int16),
+            'gols_casa': np.zeros(capacidade, dtype=np.int8),
+            'gols_fora': np.zeros(capacidade, dtype=np.int8),
+            'sem_gols_casa': np.zeros(capacidade, dtype=bool),
+            'sem_gols_fora': np.zeros(capacidade, dtype=bool),
+            'vencedor': np.zeros(capacidade, dtype=np.int8),
+            'temporada': np.zeros(capacidade, dtype=np.int16)
+        }
+        # Código de cada valor de texto, na ordem em que aparecem (None = -1;
+        # fases eliminatórias trazem times ainda indefinidos com nome nulo)
+        categorias = {'time': {None: -1}, 'status': {None: -1}, 'vencedor': {None: -1}}
+
+        def codigo(tipo, valor):
+            codigos = categorias[tipo]
+            if valor not in codigos:
+                codigos[valor] = len(codigos) - 1
+            return codigos[valor]
+
+        n = 0
+        for match in iterar_array(matches_data, 'matches'):
+            if n == capacidade:
+                capacidade *= 2
+                for chave, valores in colunas.items():
+                    colunas[chave] = np.resize(valores, capacidade)
 
-        df = pd.DataFrame(matches_list)
-        df['data'] = pd.to_datetime(df['data'])
+            placar = match.get('score') or {}
+            tempo_normal = placar.get('fullTime') or {}
+            gols_casa = tempo_normal.get('home', 0)
+            gols_fora = tempo_normal.get('away', 0)
+            id_partida = match.get('id')
+            inicio_temporada = (match.get('season') or {}).get('startDate') or ''
+
+            colunas['id'][n] = id_partida or 0
+            colunas['sem_id'][n] = id_partida is None
+            colunas['rodada'][n] = match.get('matchday') or 0
+            colunas['data'][n] = match.get('utcDate')
+            colunas['status'][n] = codigo('status', match.get('status', ''))
+            colunas['time_casa'][n] = codigo('time', (match.get('homeTeam') or {}).get('name', ''))
+            colunas['time_fora'][n] = codigo('time', (match.get('awayTeam') or {}).get('name', ''))
+            colunas['gols_casa'][n] = gols_casa or 0
+            colunas['gols_fora'][n] = gols_fora or 0
+            colunas['sem_gols_casa'][n] = gols_casa is None
+            colunas['sem_gols_fora'][n] = gols_fora is None
+            colunas['vencedor'][n] = codigo('vencedor', placar.get('winner'))
+            colunas['temporada'][n] = (
+                int(inicio_temporada[:4]) if inicio_temporada[:4].isdigit() else temporada_padrao
+            )
+            n += 1
+
+        colunas = {chave: valores[:n] for chave, valores in colunas.items()}
+
+        def categorico(tipo, codigos):
+            nomes = [valor for valor in categorias[tipo] if valor is not None]
+            return pd.Categorical.from_codes(codigos, categories=nomes)
+
+        df = pd.DataFrame({
+            'id': pd.arrays.IntegerArray(colunas['id'], colunas['sem_id']),
+            'rodada': colunas['rodada'],
+            'data': _converter_datas(colunas['data']),
+            'status': categorico('status', colunas['status']),
+            'time_casa': categorico('time', colunas['time_casa']),
+            'time_fora': categorico('time', colunas['time_fora']),
+            'gols_casa': pd.arrays.IntegerArray(colunas['gols_casa'], colunas['sem_gols_casa']),
+            'gols_fora': pd.arrays.IntegerArray(colunas['gols_fora'], colunas['sem_gols_fora']),
+            'vencedor': categorico('vencedor', colunas['vencedor']),
+            'temporada': colunas['temporada']
+        })
 
         # Ordenar por rodada
         df = df.sort_values(['rodada', 'data'])
 
-        logging.info(f"Processados {len(matches_list)} jogos da temporada 2023")
+        logging.info(f"Processados {n} jogos (temporada {temporada_padrao})")
         return df
 
     def process_standings_data(self, standings_data):
-        """Processa dados da classificação"""
-        standings_list = []
+        """Processa dados da classificação
+
+        Aceita as mesmas origens de process_matches_data; a tabela (a primeira
+        de `standings`) é escrita em colunas int16 pré-alocadas.
+        """
         try:
-            for team in standings_data['standings'][0]['table']:
-                team_dict = {
-                    'posicao': team.get('position', 0),
-                    'time': team.get('team', {}).get('name', ''),
-                    'pontos': team.get('points', 0),
-                    'jogos': team.get('playedGames', 0),
-                    'vitorias': team.get('won', 0),
-                    'empates': team.get('draw', 0),
-                    'derrotas': team.get('lost', 0),
-                    'gols_pro': team.get('goalsFor', 0),
-                    'gols_contra': team.get('goalsAgainst', 0),
-                    'saldo_gols': team.get('goalDifference', 0)
-                }
-                standings_list.append(team_dict)
-
-            return pd.DataFrame(standings_list)
+            grupo = next(iter(iterar_array(standings_data, 'standings')))
+            tabela = grupo['table']
+
+            campos = {
+                'posicao': 'position',
+                'pontos': 'points',
+                'jogos': 'playedGames',
+                'vitorias': 'won',
+                'empates': 'draw',
+                'derrotas': 'lost',
+                'gols_pro': 'goalsFor',
+                'gols_contra': 'goalsAgainst',
+                'saldo_gols': 'goalDifference'
+            }
+            colunas = {coluna: np.zeros(len(tabela), dtype=np.int16) for coluna in campos}
+            times = np.empty(len(tabela), dtype=object)
+
+            for i, team in enumerate(tabela):
+                times[i] = (team.get('team') or {}).get('name', '')
+                for coluna, campo in campos.items():
+                    colunas[coluna][i] = team.get(campo) or 0
+
+            df = pd.DataFrame(colunas)
+            df.insert(1, 'time', pd.Categorical(times))
+            return df
         except Exception as e:
             logging.error(f"Erro ao processar classificação: {str(e)}")
             return None
 
-    def update_data(self):
-        """Atualiza dados do Brasileirão"""
+    def _consolidar_particoes(self):
+        """Partidas de todas as temporadas da competição configurada
+
+        Com `storage.exportar_csv` ativo, também exporta data/brasileirao_matches.csv.
+        """
+        df = storage.carregar_partidas(self.competition_id)
+        if storage.configuracao()['exportar_csv']:
+            storage.exportar_csv(df, storage.CSV_PARTIDAS)
+        return df
+
+    def _baixar_temporada(self, competicao, temporada):
+        """Baixa e grava a partição de uma temporada; retorna o nº de partidas"""
+        dados, _ = self._obter_partidas(competicao, temporada, decodificar=False)
+        df = self.process_matches_data(dados, temporada=temporada)
+        storage.salvar_temporada(df, temporada, competicao)
+        return len(df)
+
+    def backfill(self, temporadas, competicoes=None, max_workers=4):
+        """Baixa várias temporadas (e competições) em paralelo
+
+        As requisições rodam em um pool limitado de threads que compartilham
+        o ClienteAPI, então o limite de taxa da API vale para todas. Cada
+        temporada vira uma partição do armazenamento (src/storage.py) e a
+        classificação é recalculada com as partidas da competição configurada.
+        Retorna {(competição, temporada): nº de partidas ou None se falhou}.
+        """
+        competicoes = competicoes or [self.competition_id]
+        tarefas = [(competicao, temporada) for competicao in competicoes for temporada in temporadas]
+        resultado = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futuros = {
+                executor.submit(self._baixar_temporada, competicao, temporada): (competicao, temporada)
+                for competicao, temporada in tarefas
+            }
+            for futuro in as_completed(futuros):
+                competicao, temporada = futuros[futuro]
+                try:
+                    resultado[(competicao, temporada)] = futuro.result()
+                    logging.info(
+                        f"Backfill: competição {competicao}, temporada {temporada}: "
+                        f"{resultado[(competicao, temporada)]} partidas"
+                    )
+                except Exception as e:
+                    resultado[(competicao, temporada)] = None
+                    logging.error(f"Backfill: erro na competição {competicao}, temporada {temporada}: {str(e)}")
+
+        if any(n for (competicao, _), n in resultado.items() if competicao == self.competition_id):
+            df = self._consolidar_particoes()
+            standings_df = BrasileiraoStandings(df).tabela()
+            if standings_df is not None:
+                storage.salvar_classificacao(standings_df)
+
+        return resultado
+
+    def update_data(self, usar_api_classificacao=False):
+        """Atualiza dados do Brasileirão
+
+        A classificação é derivada dos próprios resultados das partidas; com
+        usar_api_classificacao=True ela é buscada no endpoint de standings.
+        Se a API devolve as mesmas partidas da última vez (cache em disco,
+        304 ou corpo idêntico), os arquivos não são reprocessados.
+        """
         try:
             # Coletar dados das partidas
-            matches_data = self.get_matches()
+            matches_data = self.get_matches(decodificar=False)
             if matches_data is None:
                 return None
 
+            # Resposta idêntica à anterior: o armazenamento já está em dia
+            if not self.partidas_alteradas and self.temporada in storage.temporadas_salvas(self.competition_id):
+                logging.info("Partidas sem alterações desde a última atualização")
+                return storage.carregar_partidas(self.competition_id)
+
             # Processar dados das partidas
             df = self.process_matches_data(matches_data)
             if df is None:
                 return None
 
-            # Salvar dados
-            os.makedirs('data', exist_ok=True)
-            df.to_csv('data/brasileirao_matches.csv', index=False)
+            # Salvar a partição da temporada e carregar todas as temporadas
+            storage.salvar_temporada(df, self.temporada, self.competition_id)
+            df = self._consolidar_particoes()
             logging.info(f"Dados de jogos salvos: {len(df)} partidas")
 
             # Atualizar classificação
-            standings = self.get_team_standing()
-            if standings:
-                standings_df = self.process_standings_data(standings)
-                if standings_df is not None:
-                    standings_df.to_csv('data/classificacao.csv', index=False)
-                    logging.info("Classificação atualizada")
+            if usar_api_classificacao:
+                standings = self.get_team_standing()
+                standings_df = self.process_standings_data(standings) if standings else None
+            else:
+                standings_df = BrasileiraoStandings(df).tabela()
+
+            if standings_df is not None:
+                storage.salvar_classificacao(standings_df)
+                logging.info("Classificação atualizada")
 
             return df
 
         except Exception as e:
             logging.error(f"Erro ao atualizar dados: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+
+    def _carregar_estado_sync(self, caminho='data/sync_estado.json'):
+        if os.path.exists(caminho):
+            with open(caminho, encoding='utf-8') as arquivo:
+                return json.load(arquivo)
+        return {}
+
+    def _salvar_estado_sync(self, estado, caminho='data/sync_estado.json'):
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump(estado, arquivo)
+        os.replace(temporario, caminho)
+
+    @staticmethod
+    def _linhas_alteradas(atual, novo):
+        """Máscara das linhas de `novo` que diferem de `atual` (mesmo índice)"""
+        alterada = pd.Series(False, index=novo.index)
+        for coluna in novo.columns:
+            if coluna not in atual.columns:
+                alterada[:] = True
+                break
+            # Como objeto: categorias e tipos anuláveis dos dois lados podem diferir
+            a = atual[coluna].reindex(novo.index).astype(object)
+            b = novo[coluna].astype(object)
+            alterada |= (a != b) & ~(a.isna() & b.isna())
+        return alterada
+
+    def sync_data(self, janela_dias=3):
+        """Sincronização incremental das partidas
+
+        Busca apenas as partidas entre a última sincronização (menos
+        `janela_dias`) e hoje mais `janela_dias`, além das que ainda estão em
+        STATUS_ABERTOS, e faz upsert pelo id da partida. Só as partições
+        das temporadas afetadas são regravadas, e a classificação salva (a
+        da temporada mais recente) só é recalculada, com as partidas dessa
+        temporada, quando alguma mudança a atinge. Sem partidas com id ou sem
+        sincronização anterior, faz a carga completa com update_data e todas
+        as partidas contam como novas.
+
+        Retorna o DataFrame das partidas novas ou alteradas (vazio se nada
+        mudou; repetir a sincronização sem novidades na API não altera nada)
+        ou None em caso de erro. Quem chama decide com ele o que invalidar;
+        estatísticas e features não são recalculadas aqui.
+        """
+        try:
+            estado = self._carregar_estado_sync()
+            agora = datetime.now(timezone.utc)
+
+            existente = storage.carregar_partidas(self.competition_id)
+            if existente is not None and existente['id'].isna().any():
+                existente = None
+
+            if existente is None or 'ultima_sincronizacao' not in estado:
+                df = self.update_data()
+                if df is None:
+                    return None
+                self._salvar_estado_sync({'ultima_sincronizacao': agora.isoformat()})
+                return df
+
+            ultima = datetime.fromisoformat(estado['ultima_sincronizacao'])
+            janela = timedelta(days=janela_dias)
+            params_janela = {
+                'dateFrom': (min(ultima, agora) - janela).strftime('%Y-%m-%d'),
+                'dateTo': (agora + janela).strftime('%Y-%m-%d')
+            }
+            params_abertos = {'season': self.temporada, 'status': ','.join(self.STATUS_ABERTOS)}
+
+            url = f"/competitions/{self.competition_id}/matches"
+            payloads = [
+                self.cliente.get_json(url, params=params_janela),
+                self.cliente.get_json(url, params=params_abertos)
+            ]
+            partidas = [p for p in payloads if p and p.get('matches')]
+            if not partidas:
+                self._salvar_estado_sync({'ultima_sincronizacao': agora.isoformat()})
+                logging.info("Sincronização: nenhuma partida retornada")
+                return pd.DataFrame(columns=existente.columns)
+
+            delta = pd.concat([self.process_matches_data(p) for p in partidas])
+            delta = delta.drop_duplicates('id', keep='last').set_index('id')
+
+            existente = existente.drop_duplicates('id', keep='last').set_index('id')
+            delta['data'] = pd.to_datetime(delta['data'], utc=True)
+
+            novas = ~delta.index.isin(existente.index)
+            alteradas = novas | self._linhas_alteradas(existente, delta).to_numpy()
+            mudancas = delta[alteradas]
+
+            if not mudancas.empty:
+                # Upsert pelo id da partida
+                existente = pd.concat([existente.drop(mudancas.index, errors='ignore'), mudancas])
+                df = storage.tipar_partidas(existente.reset_index())
+
+                temporadas = mudancas['temporada'].unique()
+                for temporada in temporadas:
+                    storage.salvar_temporada(df[df['temporada'] == temporada], temporada, self.competition_id)
+                df = self._consolidar_particoes()
+
+                atual = df['temporada'].max()
+                if atual in temporadas:
+                    standings_df = BrasileiraoStandings(df[df['temporada'] == atual]).tabela()
+                    if standings_df is not None:
+                        storage.salvar_classificacao(standings_df)
+
+            self._salvar_estado_sync({'ultima_sincronizacao': agora.isoformat()})
+            logging.info(
+                f"Sincronização: {len(delta)} partidas recebidas, {int(novas.sum())} novas, "
+                f"{len(mudancas)} alteradas"
+            )
+            return mudancas.reset_index()
+
+        except Exception as e:
+            logging.error(f"Erro na sincronização incremental: {str(e)}")
+            return None
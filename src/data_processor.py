@@ -3,12 +3,149 @@ import numpy as np
 from sklearn.preprocessing import StandardScaler
 import logging
 import os
+from collections import OrderedDict, deque
+
+from . import storage
+from .match_table import PONTOS_CASA, PONTOS_FORA, MatchTable
+from .standings import BrasileiraoStandings
+
+
+def _media_gols(media_casa, media_fora):
+    """Combina as médias de gols em casa e fora.
+
+    Mantém a precedência da expressão histórica de calcular_estatisticas_time:
+    usa a média em casa quando o time já jogou em casa e só recorre à média
+    fora caso contrário, sempre dividindo por 2.
+    """
+    if media_casa is not None:
+        return float(media_casa / 2)
+    if media_fora is not None:
+        return float(media_fora / 2)
+    return 0.0
+
+
+class EstadoTimes:
+    """Estado acumulado por time, atualizado partida a partida em ordem cronológica"""
+
+    PESOS_FORMA = np.array([1.0, 0.8, 0.6, 0.4, 0.2])
+
+    def __init__(self, ultimas_n_partidas=5):
+        self.ultimas_n_partidas = ultimas_n_partidas
+        self.times = {}
+
+    def _estado(self, time):
+        if time not in self.times:
+            self.times[time] = {
+                'jogos_casa': 0,
+                'jogos_fora': 0,
+                'gols_pro_casa': 0,
+                'gols_contra_casa': 0,
+                'gols_pro_fora': 0,
+                'gols_contra_fora': 0,
+                'vitorias_casa': 0,
+                'vitorias_fora': 0,
+                'empates_casa': 0,
+                'empates_fora': 0,
+                'derrotas_casa': 0,
+                'derrotas_fora': 0,
+                'pontos_recentes': deque(maxlen=self.ultimas_n_partidas)
+            }
+        return self.times[time]
+
+    def atualizar(self, time_casa, time_fora, gols_casa, gols_fora, resultado):
+        """Incorpora o resultado de uma partida finalizada ao estado dos dois times
+
+        `resultado` usa a codificação de MatchTable (2 = vitória casa,
+        1 = empate, 0 = vitória fora, -1 = sem vencedor informado).
+        """
+        casa = self._estado(time_casa)
+        fora = self._estado(time_fora)
+        # Gols chegam em int8 da MatchTable; acumula em int do Python
+        gols_casa, gols_fora = int(gols_casa), int(gols_fora)
+
+        casa['jogos_casa'] += 1
+        casa['gols_pro_casa'] += gols_casa
+        casa['gols_contra_casa'] += gols_fora
+        fora['jogos_fora'] += 1
+        fora['gols_pro_fora'] += gols_fora
+        fora['gols_contra_fora'] += gols_casa
+
+        if resultado == 2:
+            casa['vitorias_casa'] += 1
+            fora['derrotas_fora'] += 1
+            casa['pontos_recentes'].append(3)
+            fora['pontos_recentes'].append(0)
+        elif resultado == 0:
+            casa['derrotas_casa'] += 1
+            fora['vitorias_fora'] += 1
+            casa['pontos_recentes'].append(0)
+            fora['pontos_recentes'].append(3)
+        elif resultado == 1:
+            casa['empates_casa'] += 1
+            fora['empates_fora'] += 1
+            casa['pontos_recentes'].append(1)
+            fora['pontos_recentes'].append(1)
+        else:
+            # Sem vencedor: nenhum ponto para os dois, como em _arrays_time_partida
+            casa['derrotas_casa'] += 1
+            fora['derrotas_fora'] += 1
+            casa['pontos_recentes'].append(0)
+            fora['pontos_recentes'].append(0)
+
+    def estatisticas(self, time, posicao=None):
+        """Estatísticas do time no mesmo formato de calcular_estatisticas_time"""
+        estado = self.times.get(time)
+        if estado is None or len(estado['pontos_recentes']) < 3:
+            return None
+
+        # Mais recente primeiro, como na ordenação decrescente por data
+        pontos_recentes = list(reversed(estado['pontos_recentes']))
+        pesos = self.PESOS_FORMA[:len(pontos_recentes)]
+
+        jogos_casa = estado['jogos_casa']
+        jogos_fora = estado['jogos_fora']
+
+        stats = {
+            'posicao': posicao if posicao is not None else 10,
+            'media_gols_pro': _media_gols(
+                estado['gols_pro_casa'] / jogos_casa if jogos_casa else None,
+                estado['gols_pro_fora'] / jogos_fora if jogos_fora else None
+            ),
+            'media_gols_contra': _media_gols(
+                estado['gols_contra_casa'] / jogos_casa if jogos_casa else None,
+                estado['gols_contra_fora'] / jogos_fora if jogos_fora else None
+            ),
+            'forma_recente': float(np.average(pontos_recentes, weights=pesos)),
+            'vitorias_casa': estado['vitorias_casa'],
+            'vitorias_fora': estado['vitorias_fora'],
+            'derrotas_casa': estado['derrotas_casa'],
+            'derrotas_fora': estado['derrotas_fora'],
+            'jogos_casa': jogos_casa,
+            'jogos_fora': jogos_fora
+        }
+
+        total_pontos_casa = estado['vitorias_casa'] * 3 + estado['empates_casa']
+        total_pontos_fora = estado['vitorias_fora'] * 3 + estado['empates_fora']
+
+        stats['aproveitamento_casa'] = (
+            float(total_pontos_casa / (jogos_casa * 3)) if jogos_casa > 0 else 0
+        )
+        stats['aproveitamento_fora'] = (
+            float(total_pontos_fora / (jogos_fora * 3)) if jogos_fora > 0 else 0
+        )
+
+        return stats
 
 
 class BrasileiraoDataProcessor:
-    def __init__(self):
+    def __init__(self, banco=None):
         self.scaler = StandardScaler()
         self.features = None
+        self.partidas_treino = None
+        # BrasileiraoMatchStore opcional para consultas indexadas por time
+        self.banco = banco
+        # Estruturas derivadas de cada DataFrame recente (ver _indices)
+        self._cache_indices = OrderedDict()
 
         logging.basicConfig(
             filename='logs/data_processing.log',
@@ -16,10 +153,57 @@ class BrasileiraoDataProcessor:
             format='%(asctime)s - %(levelname)s - %(message)s'
         )
 
-    def get_team_position(self, time):
-        """Obtém a posição atual do time na tabela"""
+    MAX_CACHE_INDICES = 4
+
+    def _indices(self, df):
+        """Estruturas derivadas de `df`, construídas uma vez por DataFrame
+
+        Enquanto o mesmo objeto for passado (os DataFrames de partidas são
+        tratados como imutáveis), as chamadas reaproveitam a MatchTable das
+        partidas finalizadas, as posições da tabela mais recente e a
+        classificação completa, esta só montada quando uma data é pedida.
+        O cache guarda a referência ao DataFrame, então o id não é reciclado.
+        """
+        chave = id(df)
+        entrada = self._cache_indices.get(chave)
+        if entrada is None or entrada['df'] is not df or entrada['n'] != len(df):
+            jogos = df[df['status'] == 'FINISHED']
+            entrada = {'df': df, 'n': len(df), 'jogos': jogos, 'tabela': MatchTable(jogos)}
+            self._cache_indices[chave] = entrada
+            while len(self._cache_indices) > self.MAX_CACHE_INDICES:
+                self._cache_indices.popitem(last=False)
+        return entrada
+
+    def _posicoes_finais(self, df):
+        """(MatchTable das finalizadas, posições da tabela mais recente por código)"""
+        indices = self._indices(df)
+        if 'posicoes' not in indices:
+            indices['posicoes'] = BrasileiraoStandings.posicoes_finais(indices['tabela'])
+        return indices['tabela'], indices['posicoes']
+
+    def _classificacao(self, df):
+        """BrasileiraoStandings de `df` (todos os snapshots), em cache"""
+        indices = self._indices(df)
+        if 'classificacao' not in indices:
+            indices['classificacao'] = BrasileiraoStandings(df)
+        return indices['classificacao']
+
+    def get_team_position(self, time, df=None, data=None):
+        """Obtém a posição do time na tabela
+
+        Com `df`, a posição é derivada dos resultados das partidas anteriores
+        a `data` (ou da tabela mais recente); sem `df`, recorre ao arquivo
+        de classificação salvo.
+        """
+        if df is not None:
+            if data is not None:
+                return self._classificacao(df).posicao(time, data)
+            tabela, posicoes = self._posicoes_finais(df)
+            codigo = tabela.codigo(time)
+            return int(posicoes[codigo]) if codigo >= 0 and posicoes[codigo] > 0 else None
+
         try:
-            classificacao = pd.read_csv('data/classificacao.csv')
+            classificacao = storage.carregar_classificacao()
             time_info = classificacao[classificacao['time'] == time]
             if not time_info.empty:
                 return time_info.iloc[0]['posicao']
@@ -27,90 +211,173 @@ class BrasileiraoDataProcessor:
         except:
             return None
 
-    def calcular_estatisticas_time(self, df, nome_time, ultimas_n_partidas=5):
-        """Calcula estatísticas recentes de um time"""
-        # Jogos em casa e fora
-        jogos_casa = df[df['time_casa'] == nome_time].copy()
-        jogos_fora = df[df['time_fora'] == nome_time].copy()
+    def _arrays_time_partida(self, df, times=None):
+        """Formato longo (time-partida) em arrays NumPy, ordenado por time e data.
+
+        Cada partida finalizada vira duas linhas, uma do ponto de vista de cada
+        time. `linha` aponta para a posição da partida em `jogos`.
+        """
+        # MatchTable das partidas finalizadas, construída uma vez por DataFrame
+        indices = self._indices(df)
+        jogos, tabela = indices['jogos'], indices['tabela']
+        n = len(tabela)
+
+        casa = tabela.casa.astype(np.int64)
+        fora = tabela.fora.astype(np.int64)
+        gols_casa = tabela.gols_casa.astype(np.float64)
+        gols_fora = tabela.gols_fora.astype(np.float64)
+
+        # Partida finalizada sem vencedor informado conta como derrota dos dois
+        arrays = {
+            'linha': np.concatenate([np.arange(n), np.arange(n)]),
+            'codigo': np.concatenate([casa, fora]),
+            'codigo_adversario': np.concatenate([fora, casa]),
+            'mandante': np.repeat([True, False], n),
+            'gols_pro': np.concatenate([gols_casa, gols_fora]),
+            'gols_contra': np.concatenate([gols_fora, gols_casa]),
+            'pontos': np.maximum(np.concatenate([
+                PONTOS_CASA[tabela.resultado], PONTOS_FORA[tabela.resultado]
+            ]), 0).astype(np.int64),
+            'data': np.concatenate([tabela.data, tabela.data])
+        }
 
-        # Últimos jogos com peso maior para jogos mais recentes
-        todos_jogos = pd.concat([jogos_casa, jogos_fora]).sort_values('data', ascending=False)
-        ultimos_jogos = todos_jogos.head(ultimas_n_partidas)
+        if times is not None:
+            manter = np.isin(arrays['codigo'], tabela.codificar(times))
+            arrays = {chave: valores[manter] for chave, valores in arrays.items()}
 
-        if len(ultimos_jogos) < 3:
-            return None
+        ordem = np.lexsort((arrays['data'], arrays['codigo']))
+        arrays = {chave: valores[ordem] for chave, valores in arrays.items()}
 
-        # Calcular forma recente com pesos
-        pesos = np.array([1.0, 0.8, 0.6, 0.4, 0.2])[:len(ultimos_jogos)]
-        pontos_recentes = []
-
-        for _, jogo in ultimos_jogos.iterrows():
-            if jogo['time_casa'] == nome_time:
-                if jogo['vencedor'] == 'HOME_TEAM':
-                    pontos_recentes.append(3)
-                elif jogo['vencedor'] == 'DRAW':
-                    pontos_recentes.append(1)
-                else:
-                    pontos_recentes.append(0)
-            else:
-                if jogo['vencedor'] == 'AWAY_TEAM':
-                    pontos_recentes.append(3)
-                elif jogo['vencedor'] == 'DRAW':
-                    pontos_recentes.append(1)
-                else:
-                    pontos_recentes.append(0)
-
-        forma_ponderada = np.average(pontos_recentes, weights=pesos) if pontos_recentes else 0
-
-        # Obter posição na tabela
-        posicao_atual = self.get_team_position(nome_time)
-        if posicao_atual is None:
-            posicao_atual = 10  # valor médio caso não encontre
-
-        stats = {
-            'posicao': posicao_atual,
-            'media_gols_pro': float((
-                                        jogos_casa['gols_casa'].mean() if not jogos_casa.empty else 0 +
-                                                                                                    jogos_fora[
-                                                                                                        'gols_fora'].mean() if not jogos_fora.empty else 0
-                                    ) / 2),
-            'media_gols_contra': float((
-                                           jogos_casa['gols_fora'].mean() if not jogos_casa.empty else 0 +
-                                                                                                       jogos_fora[
-                                                                                                           'gols_casa'].mean() if not jogos_fora.empty else 0
-                                       ) / 2),
-            'forma_recente': float(forma_ponderada),
-            'vitorias_casa': int((jogos_casa['vencedor'] == 'HOME_TEAM').sum()),
-            'vitorias_fora': int((jogos_fora['vencedor'] == 'AWAY_TEAM').sum()),
-            'derrotas_casa': int((jogos_casa['vencedor'] == 'AWAY_TEAM').sum()),
-            'derrotas_fora': int((jogos_fora['vencedor'] == 'HOME_TEAM').sum()),
-            'jogos_casa': len(jogos_casa),
-            'jogos_fora': len(jogos_fora)
-        }
+        return jogos, arrays, tabela.times
 
-        # Calcular aproveitamentos
-        total_pontos_casa = (stats['vitorias_casa'] * 3 +
-                             jogos_casa[jogos_casa['vencedor'] == 'DRAW'].shape[0])
-        total_pontos_fora = (stats['vitorias_fora'] * 3 +
-                             jogos_fora[jogos_fora['vencedor'] == 'DRAW'].shape[0])
+    def tabela_time_partida(self, df, time=None):
+        """Reorganiza as partidas finalizadas em formato longo (time-partida).
 
-        stats['aproveitamento_casa'] = (
-            float(total_pontos_casa / (stats['jogos_casa'] * 3))
-            if stats['jogos_casa'] > 0 else 0
+        Cada jogo vira duas linhas, uma do ponto de vista de cada time, com
+        gols pró/contra e pontos conquistados, ordenadas por time e data.
+        Se `time` for informado, mantém apenas as linhas desse time.
+        """
+        jogos, arrays, nomes = self._arrays_time_partida(
+            df, times=None if time is None else [time]
         )
 
-        stats['aproveitamento_fora'] = (
-            float(total_pontos_fora / (stats['jogos_fora'] * 3))
-            if stats['jogos_fora'] > 0 else 0
-        )
+        return pd.DataFrame({
+            'data': jogos['data'].to_numpy()[arrays['linha']],
+            'time': nomes[arrays['codigo']],
+            'adversario': nomes[arrays['codigo_adversario']],
+            'mandante': arrays['mandante'],
+            'gols_pro': arrays['gols_pro'],
+            'gols_contra': arrays['gols_contra'],
+            'pontos': arrays['pontos']
+        })
+
+    def calcular_estatisticas_times(self, df, ultimas_n_partidas=5, times=None):
+        """Calcula as estatísticas de todos os times de uma vez.
+
+        Retorna um DataFrame indexado por time com as mesmas chaves de
+        calcular_estatisticas_time; times com menos de 3 jogos ficam de fora.
+        `times` restringe o cálculo a uma lista de times.
+        """
+        _, longa, nomes = self._arrays_time_partida(df, times)
+        codigos = longa['codigo']
+        n_times = len(nomes)
+
+        mandante = longa['mandante']
+        visitante = ~mandante
+        pontos = longa['pontos']
+        gols_pro = longa['gols_pro']
+        gols_contra = longa['gols_contra']
+
+        def somar(valores):
+            return np.bincount(codigos, weights=valores, minlength=n_times)
+
+        n_jogos = np.bincount(codigos, minlength=n_times)
+        jogos_casa = np.bincount(codigos[mandante], minlength=n_times)
+        jogos_fora = n_jogos - jogos_casa
+        vitorias_casa = np.bincount(codigos[mandante & (pontos == 3)], minlength=n_times)
+        vitorias_fora = np.bincount(codigos[visitante & (pontos == 3)], minlength=n_times)
+        empates_casa = np.bincount(codigos[mandante & (pontos == 1)], minlength=n_times)
+        empates_fora = np.bincount(codigos[visitante & (pontos == 1)], minlength=n_times)
+        derrotas_casa = np.bincount(codigos[mandante & (pontos == 0)], minlength=n_times)
+        derrotas_fora = np.bincount(codigos[visitante & (pontos == 0)], minlength=n_times)
+
+        # Forma ponderada: distância de cada jogo até o último jogo do time
+        # (a tabela longa já está ordenada por time e data)
+        fim_grupo = np.cumsum(n_jogos)[codigos]
+        distancia = fim_grupo - 1 - np.arange(len(codigos))
+        pesos = EstadoTimes.PESOS_FORMA[:ultimas_n_partidas]
+        recente = distancia < len(pesos)
+        peso_jogo = np.zeros(len(codigos))
+        peso_jogo[recente] = pesos[distancia[recente]]
+        soma_pesos = somar(peso_jogo)
+        forma_recente = somar(peso_jogo * pontos) / np.where(soma_pesos > 0, soma_pesos, 1)
+
+        div_casa = np.where(jogos_casa > 0, jogos_casa, 1)
+        div_fora = np.where(jogos_fora > 0, jogos_fora, 1)
+
+        def media_gols(gols):
+            # Mesma regra de _media_gols, aplicada a todos os times
+            return np.where(
+                jogos_casa > 0,
+                somar(np.where(mandante, gols, 0)) / div_casa,
+                np.where(jogos_fora > 0, somar(np.where(visitante, gols, 0)) / div_fora, 0.0)
+            ) / 2
+
+        # Só os times com jogos suficientes entram (e precisam de posição)
+        validos = n_jogos >= 3
+        tabela, posicoes = self._posicoes_finais(df)
+        posicoes = posicoes[tabela.codificar(nomes)]
+
+        stats = pd.DataFrame({
+            'posicao': np.where(posicoes > 0, posicoes, 10).astype(np.int64),
+            'media_gols_pro': media_gols(gols_pro),
+            'media_gols_contra': media_gols(gols_contra),
+            'forma_recente': forma_recente,
+            'vitorias_casa': vitorias_casa,
+            'vitorias_fora': vitorias_fora,
+            'derrotas_casa': derrotas_casa,
+            'derrotas_fora': derrotas_fora,
+            'jogos_casa': jogos_casa,
+            'jogos_fora': jogos_fora,
+            'aproveitamento_casa': np.where(
+                jogos_casa > 0, (vitorias_casa * 3 + empates_casa) / (div_casa * 3), 0.0
+            ),
+            'aproveitamento_fora': np.where(
+                jogos_fora > 0, (vitorias_fora * 3 + empates_fora) / (div_fora * 3), 0.0
+            )
+        }, index=pd.Index(nomes, name='time'))
 
-        return stats
+        return stats[validos]
+
+    def _stats_time(self, stats, nome_time):
+        """Extrai de calcular_estatisticas_times o dicionário de um time"""
+        if nome_time not in stats.index:
+            return None
+
+        linha = stats.loc[nome_time]
+        return {
+            chave: (int(valor) if chave.startswith(('vitorias', 'derrotas', 'jogos')) else float(valor))
+            for chave, valor in linha.items()
+        }
+
+    def calcular_estatisticas_time(self, df, nome_time, ultimas_n_partidas=5):
+        """Calcula estatísticas recentes de um time"""
+        return self._stats_time(
+            self.calcular_estatisticas_times(df, ultimas_n_partidas, times=[nome_time]),
+            nome_time
+        )
 
     def preparar_features_partida(self, df, time_casa, time_fora):
         """Prepara features para uma partida específica"""
-        stats_casa = self.calcular_estatisticas_time(df, time_casa)
-        stats_fora = self.calcular_estatisticas_time(df, time_fora)
+        stats = self.calcular_estatisticas_times(df, times=[time_casa, time_fora])
+
+        return self._montar_features(
+            self._stats_time(stats, time_casa),
+            self._stats_time(stats, time_fora)
+        )
 
+    def _montar_features(self, stats_casa, stats_fora):
+        """Monta o vetor de 11 features a partir das estatísticas dos dois times"""
         if not stats_casa or not stats_fora:
             return None
 
@@ -135,40 +402,110 @@ class BrasileiraoDataProcessor:
 
         return features
 
-    def preparar_dados_treino(self, df):
-        """Prepara dados para treinamento"""
+    def _features_treino_incremental(self, df):
+        """Gera features de treino em uma única passada cronológica.
+
+        Cada partida enxerga apenas jogos com data estritamente anterior: as
+        partidas de uma mesma data são avaliadas antes de o estado ser
+        atualizado com seus resultados.
+        """
         features_list = []
         targets = []
+        linhas = []
 
-        # Usar apenas jogos finalizados
-        df = df[df['status'] == 'FINISHED'].sort_values('data')
+        # Times como códigos inteiros (os mesmos índices de classificacao.times)
+        tabela = MatchTable(df)
+        estado = EstadoTimes()
+        classificacao = BrasileiraoStandings(df)
+        pendentes = []
+        data_atual = None
 
-        for idx, partida in df.iterrows():
-            dados_anteriores = df[df['data'] < partida['data']]
+        snapshots = classificacao.snapshots(df['data'])
 
-            features = self.preparar_features_partida(
-                dados_anteriores,
-                partida['time_casa'],
-                partida['time_fora']
+        partidas = zip(
+            snapshots, tabela.data.tolist(), tabela.casa.tolist(), tabela.fora.tolist(),
+            tabela.gols_casa.tolist(), tabela.gols_fora.tolist(), tabela.resultado.tolist()
+        )
+        for linha, (snapshot, data, casa, fora, gols_casa, gols_fora, resultado) in enumerate(partidas):
+            if data != data_atual:
+                for jogo in pendentes:
+                    estado.atualizar(*jogo)
+                pendentes = []
+                data_atual = data
+
+            features = self._montar_features(
+                estado.estatisticas(casa, classificacao.posicao_codigo(casa, snapshot)),
+                estado.estatisticas(fora, classificacao.posicao_codigo(fora, snapshot))
             )
 
             if features:
                 features_list.append(features)
-                target = (
-                    2 if partida['vencedor'] == 'HOME_TEAM'
-                    else 1 if partida['vencedor'] == 'DRAW'
-                    else 0
+                targets.append(max(resultado, 0))
+                linhas.append(linha)
+
+            pendentes.append((casa, fora, gols_casa, gols_fora, resultado))
+
+        return features_list, targets, linhas
+
+    def preparar_dados_treino(self, df, incremental=True, scaler=None):
+        """Prepara dados para treinamento
+
+        Com incremental=True as features são geradas em O(N) pelo EstadoTimes;
+        incremental=False refiltra o histórico a cada partida e passa por
+        preparar_features_partida, o mesmo caminho das previsões, e serve de
+        referência de conferência (é O(N²)). Com `scaler`, as
+        features são normalizadas por ele sem reajustá-lo (retreino
+        incremental sobre um artefato existente).
+
+        As partidas que geraram cada linha de X ficam em self.partidas_treino,
+        com a coluna `rodada_global` identificando a rodada entre temporadas.
+        """
+        features_list = []
+        targets = []
+        linhas = []
+
+        # Usar apenas jogos finalizados
+        df = df[df['status'] == 'FINISHED'].sort_values('data')
+
+        if incremental:
+            features_list, targets, linhas = self._features_treino_incremental(df)
+        else:
+            for linha, (idx, partida) in enumerate(df.iterrows()):
+                dados_anteriores = df[df['data'] < partida['data']]
+
+                features = self.preparar_features_partida(
+                    dados_anteriores,
+                    partida['time_casa'],
+                    partida['time_fora']
                 )
-                targets.append(target)
+
+                if features:
+                    features_list.append(features)
+                    target = (
+                        2 if partida['vencedor'] == 'HOME_TEAM'
+                        else 1 if partida['vencedor'] == 'DRAW'
+                        else 0
+                    )
+                    targets.append(target)
+                    linhas.append(linha)
 
         if not features_list:
             return None, None
 
+        partidas = df.iloc[linhas].reset_index(drop=True)
+        rodada_global = partidas['rodada'].astype(np.int64)
+        if 'temporada' in partidas.columns:
+            rodada_global = partidas['temporada'].astype(np.int64) * 1000 + rodada_global
+        self.partidas_treino = partidas.assign(rodada_global=rodada_global)
+
         X = np.array(features_list, dtype=np.float64)
         y = np.array(targets, dtype=np.int32)
 
         # Normalizar features
-        X_scaled = self.scaler.fit_transform(X)
+        if scaler is not None:
+            X_scaled = scaler.transform(X)
+        else:
+            X_scaled = self.scaler.fit_transform(X)
 
         self.features = [
             'posicao_casa',
@@ -186,37 +523,94 @@ class BrasileiraoDataProcessor:
 
         return X_scaled, y
 
-    def preparar_dados_predicao(self, df, time_casa, time_fora):
-        """Prepara dados para previsão"""
+    def preparar_dados_predicao(self, df, time_casa, time_fora, scaler=None):
+        """Prepara dados para previsão
+
+        `scaler` permite usar o scaler salvo no artefato do modelo no lugar
+        do ajustado por preparar_dados_treino.
+        """
         features = self.preparar_features_partida(df, time_casa, time_fora)
 
         if not features:
             return None
 
-        return self.scaler.transform(np.array(features).reshape(1, -1))
-
-    def obter_forma_recente(self, df, time, n_jogos=5):
-        """Obtém sequência de resultados recentes"""
-        jogos = df[
-            (df['time_casa'] == time) |
-            (df['time_fora'] == time)
-            ].sort_values('data', ascending=False).head(n_jogos)
-
-        forma = []
-        for _, jogo in jogos.iterrows():
-            if jogo['time_casa'] == time:
-                if jogo['vencedor'] == 'HOME_TEAM':
-                    forma.append('✅')
-                elif jogo['vencedor'] == 'AWAY_TEAM':
-                    forma.append('❌')
-                else:
-                    forma.append('➖')
-            else:
-                if jogo['vencedor'] == 'AWAY_TEAM':
-                    forma.append('✅')
-                elif jogo['vencedor'] == 'HOME_TEAM':
-                    forma.append('❌')
-                else:
-                    forma.append('➖')
-
-        return forma
\ No newline at end of file
+        scaler = scaler if scaler is not None else self.scaler
+        return scaler.transform(np.array(features).reshape(1, -1))
+
+    def selecionar_partidas(self, df, partidas=None):
+        """Normaliza as partidas a prever em um DataFrame com time_casa e time_fora
+
+        Sem `partidas`, usa todos os jogos SCHEDULED/TIMED de `df`; também
+        aceita uma lista de pares (time_casa, time_fora) ou um DataFrame.
+        """
+        if partidas is None:
+            return df[df['status'].isin(['SCHEDULED', 'TIMED'])].reset_index(drop=True)
+        if isinstance(partidas, pd.DataFrame):
+            return partidas.reset_index(drop=True)
+        return pd.DataFrame(list(partidas), columns=['time_casa', 'time_fora'])
+
+    def preparar_dados_predicao_lote(self, df, partidas=None, scaler=None):
+        """Prepara features de várias partidas em uma única passada
+
+        As estatísticas de todos os times são calculadas uma vez e
+        distribuídas entre as partidas. Retorna a matriz normalizada e as
+        partidas correspondentes; partidas sem histórico suficiente ficam de
+        fora. `scaler` tem o mesmo papel que em preparar_dados_predicao.
+        """
+        partidas = self.selecionar_partidas(df, partidas)
+        if partidas.empty:
+            return None, partidas
+
+        stats = self.calcular_estatisticas_times(df)
+        casa = stats.reindex(partidas['time_casa'])
+        fora = stats.reindex(partidas['time_fora'])
+
+        validas = casa['posicao'].notna().to_numpy() & fora['posicao'].notna().to_numpy()
+        if not validas.any():
+            return None, partidas.iloc[0:0]
+
+        X = np.column_stack([
+            casa['posicao'],
+            casa['media_gols_pro'],
+            casa['media_gols_contra'],
+            casa['forma_recente'],
+            casa['aproveitamento_casa'],
+            fora['posicao'],
+            fora['media_gols_pro'],
+            fora['media_gols_contra'],
+            fora['forma_recente'],
+            fora['aproveitamento_fora'],
+            fora['posicao'].to_numpy() - casa['posicao'].to_numpy()
+        ]).astype(np.float64)[validas]
+
+        scaler = scaler if scaler is not None else self.scaler
+        return scaler.transform(X), partidas[validas].reset_index(drop=True)
+
+    def obter_forma_recente(self, df, time, n_jogos=5, tabela=None):
+        """Obtém sequência de resultados recentes
+
+        Com um banco configurado, lê só as últimas partidas do time pelo
+        índice do banco; senão, usa as linhas já indexadas do time em
+        `tabela` (MatchTable de `df` construída uma vez por versão dos dados)
+        ou na MatchTable que o processador mantém para `df`. O custo não
+        depende do tamanho do histórico.
+        """
+        simbolos = {3: '✅', 1: '➖', 0: '❌'}
+
+        if self.banco is not None:
+            jogos = self.banco.ultimas_partidas(time, n_jogos)
+            if jogos is not None:
+                mandante = (jogos['time_casa'] == time).to_numpy()
+                vencedor = jogos['vencedor'].astype(object).to_numpy()
+                pontos = np.where(
+                    vencedor == 'DRAW', 1,
+                    np.where(vencedor == np.where(mandante, 'HOME_TEAM', 'AWAY_TEAM'), 3, 0)
+                )
+                return [simbolos[p] for p in pontos]
+
+        if tabela is None:
+            # Sem a tabela do chamador, usa a das finalizadas de `df` (em cache)
+            tabela = self._indices(df)['tabela']
+        linhas = tabela.partidas_time(time, apenas_finalizadas=True)[-n_jogos:][::-1]
+        pontos = np.maximum(tabela.pontos(linhas, time), 0)
+        return [simbolos[p] for p in pontos.tolist()]
@@ -0,0 +1,274 @@
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
+from scipy.stats import poisson
+import logging
+import os
+
+
+class BrasileiraoGoalsModel:
+    """Modelo de gols Dixon-Coles (Poisson bivariado com correção de placares baixos).
+
+    Cada time tem força de ataque e de defesa; a média de gols do mandante é
+    exp(vantagem_casa + ataque_casa + defesa_fora) e a do visitante
+    exp(ataque_fora + defesa_casa). O parâmetro rho corrige as probabilidades
+    de 0x0, 1x0, 0x1 e 1x1, e partidas antigas pesam menos (decaimento
+    exponencial por dia). O ajuste é uma única otimização L-BFGS-B com
+    gradiente analítico, então leva milissegundos e pode ser refeito após
+    cada rodada.
+
+    Os métodos têm os nomes dos de BrasileiraoPredictor (treinar, prever e
+    prever_probabilidades) e as classes seguem a ordem de predict_proba
+    (0 = vitória fora, 1 = empate, 2 = vitória casa), mas as entradas são
+    outras: treinar recebe o DataFrame de partidas, não a matriz de
+    features, e as previsões recebem pares (casa, fora) ou um DataFrame com
+    time_casa/time_fora.
+    """
+
+    classes_ = np.array([0, 1, 2])
+
+    def __init__(self, decaimento=0.0019, max_gols=10, regularizacao=0.0):
+        self.decaimento = decaimento
+        self.max_gols = max_gols
+        self.regularizacao = regularizacao
+
+        self.times = None
+        self._indice_time = {}
+        self.ataque = None
+        self.defesa = None
+        self.vantagem_casa = 0.0
+        self.rho = 0.0
+
+        os.makedirs('logs', exist_ok=True)
+        logging.basicConfig(
+            filename='logs/model.log',
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s'
+        )
+
+    def _pares(self, partidas):
+        """Índices (casa, fora) dos times; -1 para times fora do treino"""
+        if isinstance(partidas, pd.DataFrame):
+            casa = partidas['time_casa'].to_numpy()
+            fora = partidas['time_fora'].to_numpy()
+        else:
+            casa, fora = zip(*partidas) if len(partidas) else ((), ())
+
+        idx_casa = np.array([self._indice_time.get(t, -1) for t in casa], dtype=np.int64)
+        idx_fora = np.array([self._indice_time.get(t, -1) for t in fora], dtype=np.int64)
+        return idx_casa, idx_fora
+
+    def _medias(self, idx_casa, idx_fora):
+        """Médias de gols (lambda, mu); times desconhecidos usam força média (0)"""
+        ataque = np.append(self.ataque, 0.0)
+        defesa = np.append(self.defesa, 0.0)
+        lambda_casa = np.exp(self.vantagem_casa + ataque[idx_casa] + defesa[idx_fora])
+        mu_fora = np.exp(ataque[idx_fora] + defesa[idx_casa])
+        return lambda_casa, mu_fora
+
+    @staticmethod
+    def _negativo_verossimilhanca(parametros, casa, fora, gols_casa, gols_fora, pesos,
+                                  n_times, regularizacao):
+        """-log verossimilhança ponderada e gradiente analítico"""
+        ataque = parametros[:n_times]
+        defesa = parametros[n_times:2 * n_times]
+        vantagem_casa, rho = parametros[-2], parametros[-1]
+
+        log_lambda = vantagem_casa + ataque[casa] + defesa[fora]
+        log_mu = ataque[fora] + defesa[casa]
+        lambda_casa = np.exp(log_lambda)
+        mu_fora = np.exp(log_mu)
+
+        # Correção tau de Dixon-Coles para placares até 1x1
+        zero_zero = (gols_casa == 0) & (gols_fora == 0)
+        zero_um = (gols_casa == 0) & (gols_fora == 1)
+        um_zero = (gols_casa == 1) & (gols_fora == 0)
+        um_um = (gols_casa == 1) & (gols_fora == 1)
+
+        tau = np.ones_like(lambda_casa)
+        tau[zero_zero] = 1 - lambda_casa[zero_zero] * mu_fora[zero_zero] * rho
+        tau[zero_um] = 1 + lambda_casa[zero_um] * rho
+        tau[um_zero] = 1 + mu_fora[um_zero] * rho
+        tau[um_um] = 1 - rho
+        tau = np.maximum(tau, 1e-10)
+
+        log_vero = (
+            np.log(tau)
+            + gols_casa * log_lambda - lambda_casa
+            + gols_fora * log_mu - mu_fora
+        )
+
+        # Derivadas em relação a log(lambda), log(mu) e rho
+        d_lambda = gols_casa - lambda_casa
+        d_mu = gols_fora - mu_fora
+        d_rho = np.zeros_like(lambda_casa)
+
+        produto = lambda_casa * mu_fora
+        d_lambda[zero_zero] -= produto[zero_zero] * rho / tau[zero_zero]
+        d_mu[zero_zero] -= produto[zero_zero] * rho / tau[zero_zero]
+        d_rho[zero_zero] = -produto[zero_zero] / tau[zero_zero]
+        d_lambda[zero_um] += lambda_casa[zero_um] * rho / tau[zero_um]
+        d_rho[zero_um] = lambda_casa[zero_um] / tau[zero_um]
+        d_mu[um_zero] += mu_fora[um_zero] * rho / tau[um_zero]
+        d_rho[um_zero] = mu_fora[um_zero] / tau[um_zero]
+        d_rho[um_um] = -1 / tau[um_um]
+
+        d_lambda *= pesos
+        d_mu *= pesos
+
+        grad_ataque = np.bincount(casa, d_lambda, n_times) + np.bincount(fora, d_mu, n_times)
+        grad_defesa = np.bincount(fora, d_lambda, n_times) + np.bincount(casa, d_mu, n_times)
+        gradiente = np.concatenate([
+            grad_ataque, grad_defesa, [d_lambda.sum(), (d_rho * pesos).sum()]
+        ])
+
+        # Soma dos ataques igual a zero (identificabilidade) e penalidade L2
+        soma_ataque = ataque.sum()
+        valor = -np.dot(pesos, log_vero) + soma_ataque ** 2
+        gradiente = -gradiente
+        gradiente[:n_times] += 2 * soma_ataque
+
+        if regularizacao:
+            valor += regularizacao * (np.dot(ataque, ataque) + np.dot(defesa, defesa))
+            gradiente[:2 * n_times] += 2 * regularizacao * parametros[:2 * n_times]
+
+        return valor, gradiente
+
+    def treinar(self, df, data_referencia=None):
+        """Ajusta forças de ataque/defesa, vantagem de casa e rho
+
+        Usa as partidas FINISHED de `df` (colunas de process_matches_data).
+        O peso de cada partida é exp(-decaimento * dias antes da referência),
+        que por padrão é a data da última partida. Parâmetros de um ajuste
+        anterior servem de ponto de partida para os times que continuam.
+        """
+        try:
+            finalizadas = df[df['status'] == 'FINISHED']
+            if len(finalizadas) < 10:
+                return {'error': 'Dados insuficientes para treino'}
+
+            times = np.array(
+                sorted(set(finalizadas['time_casa']) | set(finalizadas['time_fora'])), dtype=object
+            )
+            indice_time = {time: i for i, time in enumerate(times)}
+            n_times = len(times)
+
+            casa = finalizadas['time_casa'].map(indice_time).to_numpy()
+            fora = finalizadas['time_fora'].map(indice_time).to_numpy()
+            gols_casa = finalizadas['gols_casa'].to_numpy().astype(np.float64)
+            gols_fora = finalizadas['gols_fora'].to_numpy().astype(np.float64)
+
+            datas = pd.to_datetime(finalizadas['data'], utc=True)
+            referencia = datas.max() if data_referencia is None else pd.Timestamp(data_referencia)
+            if referencia.tzinfo is None:
+                referencia = referencia.tz_localize('UTC')
+            dias = ((referencia - datas).dt.total_seconds() / 86400).to_numpy()
+            pesos = np.exp(-self.decaimento * np.maximum(dias, 0))
+
+            inicial = np.zeros(2 * n_times + 2)
+            inicial[-2] = 0.25
+            if self.times is not None:
+                for time, i in indice_time.items():
+                    anterior = self._indice_time.get(time)
+                    if anterior is not None:
+                        inicial[i] = self.ataque[anterior]
+                        inicial[n_times + i] = self.defesa[anterior]
+                inicial[-2] = self.vantagem_casa
+                inicial[-1] = self.rho
+
+            limites = [(None, None)] * (2 * n_times + 1) + [(-0.2, 0.2)]
+            resultado = minimize(
+                self._negativo_verossimilhanca,
+                inicial,
+                args=(casa, fora, gols_casa, gols_fora, pesos, n_times, self.regularizacao),
+                jac=True,
+                method='L-BFGS-B',
+                bounds=limites
+            )
+
+            self.times = times
+            self._indice_time = indice_time
+            self.ataque = resultado.x[:n_times]
+            self.defesa = resultado.x[n_times:2 * n_times]
+            self.vantagem_casa = float(resultado.x[-2])
+            self.rho = float(resultado.x[-1])
+
+            # Log loss (H/D/A) das partidas de treino
+            probabilidades = self.prever_probabilidades(finalizadas)
+            y = np.where(gols_casa > gols_fora, 2, np.where(gols_casa == gols_fora, 1, 0))
+            acerto = probabilidades[np.arange(len(y)), y]
+            log_loss_treino = float(-np.mean(np.log(np.clip(acerto, 1e-15, 1.0))))
+
+            logging.info(
+                f"Modelo de gols ajustado: {len(finalizadas)} partidas, {n_times} times, "
+                f"vantagem de casa {self.vantagem_casa:.3f}, rho {self.rho:.3f}, "
+                f"log loss {log_loss_treino:.4f}"
+            )
+
+            return {
+                'n_partidas': int(len(finalizadas)),
+                'n_times': int(n_times),
+                'vantagem_casa': self.vantagem_casa,
+                'rho': self.rho,
+                'log_loss': log_loss_treino,
+                'convergiu': bool(resultado.success),
+                'iteracoes': int(resultado.nit)
+            }
+
+        except Exception as e:
+            logging.error(f"Erro no treino do modelo de gols: {str(e)}")
+            return {'error': str(e)}
+
+    def prever_placares(self, partidas):
+        """Grade de probabilidades de placar para um lote de partidas
+
+        `partidas` é uma lista de pares (casa, fora) ou um DataFrame com
+        time_casa/time_fora. Retorna um array (partidas x gols casa x gols
+        fora) com placares de 0 a max_gols, normalizado para somar 1.
+        """
+        lambda_casa, mu_fora = self._medias(*self._pares(partidas))
+        gols = np.arange(self.max_gols + 1)
+
+        grade = (
+            poisson.pmf(gols[None, :, None], lambda_casa[:, None, None])
+            * poisson.pmf(gols[None, None, :], mu_fora[:, None, None])
+        )
+        # Com médias altas a correção tau fica negativa; zera esses placares
+        # e a renormalização devolve a massa aos demais
+        grade[:, 0, 0] *= np.maximum(1 - lambda_casa * mu_fora * self.rho, 0)
+        grade[:, 0, 1] *= np.maximum(1 + lambda_casa * self.rho, 0)
+        grade[:, 1, 0] *= np.maximum(1 + mu_fora * self.rho, 0)
+        grade[:, 1, 1] *= np.maximum(1 - self.rho, 0)
+
+        return grade / grade.sum(axis=(1, 2), keepdims=True)
+
+    def prever_probabilidades(self, partidas):
+        """Probabilidades (vitória fora, empate, vitória casa) de cada partida"""
+        try:
+            grade = self.prever_placares(partidas)
+            vitoria_casa = np.tril(np.ones(grade.shape[1:], dtype=bool), -1)
+            empate = np.eye(grade.shape[1], dtype=bool)
+            return np.column_stack([
+                grade[:, vitoria_casa.T].sum(axis=1),
+                grade[:, empate].sum(axis=1),
+                grade[:, vitoria_casa].sum(axis=1)
+            ])
+        except Exception as e:
+            logging.error(f"Erro no cálculo de probabilidades do modelo de gols: {str(e)}")
+            return None
+
+    def prever(self, partidas):
+        """Resultado mais provável de cada partida"""
+        probabilidades = self.prever_probabilidades(partidas)
+        if probabilidades is None:
+            return None
+        return self.classes_[np.argmax(probabilidades, axis=1)]
+
+    def placares_provaveis(self, time_casa, time_fora, n=5):
+        """Os n placares mais prováveis de uma partida: [(gols_casa, gols_fora, prob)]"""
+        grade = self.prever_placares([(time_casa, time_fora)])[0]
+        ordem = np.argsort(grade, axis=None)[::-1][:n]
+        gols_casa, gols_fora = np.unravel_index(ordem, grade.shape)
+        return [
+            (int(c), int(f), float(grade[c, f])) for c, f in zip(gols_casa, gols_fora)
+        ]
@@ -0,0 +1,311 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Bytes lidos da resposta por vez ao gravar o corpo no cache
+TAMANHO_BLOCO_CORPO = 1 << 16
+
+
+class LimitadorTaxa:
+    """Token bucket de requisições por minuto, ajustado pelos cabeçalhos da API.
+
+    O balde começa cheio e é reabastecido continuamente. Cada resposta do
+    football-data informa quantas requisições ainda restam no minuto
+    (X-Requests-Available-Minute) e em quantos segundos o contador reinicia
+    (X-RequestCounter-Reset); o balde nunca fica acima do que a API diz
+    restar e, ao zerar, bloqueia até o reinício. Seguro entre threads.
+    """
+
+    def __init__(self, requisicoes_por_minuto=10):
+        self.capacidade = float(requisicoes_por_minuto)
+        self.taxa = self.capacidade / 60
+        self.tokens = self.capacidade
+        self.atualizado = time.monotonic()
+        self.bloqueado_ate = 0.0
+        self._lock = threading.Lock()
+
+    def _reabastecer(self, agora):
+        if self.bloqueado_ate:
+            if agora < self.bloqueado_ate:
+                self.atualizado = agora
+                return
+            # Contador da API reiniciado
+            self.tokens = self.capacidade
+            self.bloqueado_ate = 0.0
+        self.tokens = min(self.capacidade, self.tokens + (agora - self.atualizado) * self.taxa)
+        self.atualizado = agora
+
+    def adquirir(self):
+        """Espera até haver uma requisição disponível e a consome"""
+        while True:
+            with self._lock:
+                agora = time.monotonic()
+                self._reabastecer(agora)
+                if self.bloqueado_ate:
+                    espera = self.bloqueado_ate - agora
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    espera = (1 - self.tokens) / self.taxa
+            time.sleep(espera)
+
+    def atualizar(self, disponiveis=None, reinicio=None):
+        """Sincroniza o balde com os cabeçalhos de limite da resposta"""
+        with self._lock:
+            agora = time.monotonic()
+            self._reabastecer(agora)
+            if disponiveis is not None:
+                self.tokens = min(self.tokens, float(disponiveis))
+                if disponiveis <= 0:
+                    espera = reinicio if reinicio is not None else 60 / self.capacidade
+                    self.bloqueado_ate = max(self.bloqueado_ate, agora + espera)
+
+    def bloquear(self, segundos):
+        """Suspende todas as requisições por `segundos` (ex.: após um 429)"""
+        with self._lock:
+            self.bloqueado_ate = max(self.bloqueado_ate, time.monotonic() + segundos)
+            self.tokens = 0.0
+
+
+def _cabecalho_numerico(headers, nome):
+    valor = headers.get(nome)
+    try:
+        return float(valor) if valor is not None else None
+    except ValueError:
+        return None
+
+
+class CacheRespostas:
+    """Cache em disco (JSON comprimido com gzip) das respostas da API.
+
+    Cada entrada é identificada pela URL e pelos parâmetros e guarda o hash
+    do corpo, o ETag e o Last-Modified; o corpo fica em um arquivo gzip
+    próprio, gravado em blocos à medida que a resposta chega. Dentro de
+    `ttl` segundos a entrada é usada sem nenhuma requisição; depois disso
+    serve para a requisição condicional (If-None-Match/If-Modified-Since).
+    """
+
+    def __init__(self, diretorio='data/cache', ttl=300):
+        self.diretorio = diretorio
+        self.ttl = ttl
+
+    @staticmethod
+    def chave(url, params=None):
+        consulta = urlencode(sorted((params or {}).items()))
+        return hashlib.sha256(f"{url}?{consulta}".encode('utf-8')).hexdigest()
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, f"{chave}.json.gz")
+
+    def caminho_corpo(self, chave):
+        return os.path.join(self.diretorio, f"{chave}.corpo.json.gz")
+
+    def ler(self, chave):
+        """Entrada do cache ou None (também quando o corpo não está no disco)"""
+        try:
+            with gzip.open(self._caminho(chave), 'rt', encoding='utf-8') as arquivo:
+                entrada = json.load(arquivo)
+        except (OSError, ValueError):
+            return None
+        return entrada if os.path.exists(self.caminho_corpo(chave)) else None
+
+    def gravar(self, chave, entrada):
+        os.makedirs(self.diretorio, exist_ok=True)
+        caminho = self._caminho(chave)
+        temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(temporario, 'wt', encoding='utf-8') as arquivo:
+            json.dump(entrada, arquivo)
+        os.replace(temporario, caminho)
+
+    def gravar_corpo(self, chave, blocos, hash_anterior=None):
+        """Grava os blocos (bytes) do corpo sem montá-lo em memória; retorna o hash
+
+        Se o hash coincidir com `hash_anterior`, o arquivo atual é mantido.
+        """
+        os.makedirs(self.diretorio, exist_ok=True)
+        caminho = self.caminho_corpo(chave)
+        temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+        sha = hashlib.sha256()
+        try:
+            with gzip.open(temporario, 'wb') as arquivo:
+                for bloco in blocos:
+                    sha.update(bloco)
+                    arquivo.write(bloco)
+            hash_corpo = sha.hexdigest()
+            if hash_corpo == hash_anterior and os.path.exists(caminho):
+                os.unlink(temporario)
+            else:
+                os.replace(temporario, caminho)
+        except BaseException:
+            if os.path.exists(temporario):
+                os.unlink(temporario)
+            raise
+        return hash_corpo
+
+    def fresca(self, entrada):
+        return entrada is not None and time.time() - entrada['salvo_em'] < self.ttl
+
+
+class ClienteAPI:
+    """Cliente HTTP do football-data: sessão compartilhada, limite de taxa e retentativas.
+
+    Todas as requisições passam pelo LimitadorTaxa. Respostas 429 e 5xx,
+    timeouts e erros de conexão são repetidos com backoff exponencial com
+    jitter (para 429, respeitando Retry-After/X-RequestCounter-Reset). Após
+    `max_tentativas`, o último erro é levantado.
+    """
+
+    STATUS_REPETIR = {429, 500, 502, 503, 504}
+
+    def __init__(self, base_url, headers=None, requisicoes_por_minuto=10, timeout_conexao=5,
+                 timeout_leitura=30, max_tentativas=5, backoff_base=1.0, backoff_max=60.0,
+                 conexoes=10, cache=None):
+        self.base_url = base_url.rstrip('/')
+        self.cache = cache
+        self.timeout = (timeout_conexao, timeout_leitura)
+        self.max_tentativas = max_tentativas
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.limitador = LimitadorTaxa(requisicoes_por_minuto)
+
+        # Keep-alive: conexões reaproveitadas entre chamadas e threads
+        self.sessao = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=conexoes, pool_maxsize=conexoes)
+        self.sessao.mount('http://', adaptador)
+        self.sessao.mount('https://', adaptador)
+        self.sessao.headers.update(headers or {})
+
+    def _espera_backoff(self, tentativa):
+        """Backoff exponencial com jitter completo"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** tentativa))
+
+    def get(self, caminho, params=None, headers=None, stream=False):
+        """GET em base_url + caminho; retorna a resposta (status < 400 ou 304)
+
+        Com stream=True o corpo não é baixado de uma vez: fica para quem lê
+        a resposta (iter_content).
+        """
+        url = f"{self.base_url}{caminho}"
+
+        for tentativa in range(self.max_tentativas):
+            self.limitador.adquirir()
+            try:
+                response = self.sessao.get(
+                    url, params=params, headers=headers, timeout=self.timeout, stream=stream
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if tentativa == self.max_tentativas - 1:
+                    raise
+                espera = self._espera_backoff(tentativa)
+                logging.warning(f"Falha de conexão em {url} ({str(e)}); nova tentativa em {espera:.1f}s")
+                time.sleep(espera)
+                continue
+
+            disponiveis = _cabecalho_numerico(response.headers, 'X-Requests-Available-Minute')
+            reinicio = _cabecalho_numerico(response.headers, 'X-RequestCounter-Reset')
+            self.limitador.atualizar(disponiveis, reinicio)
+
+            if response.status_code not in self.STATUS_REPETIR:
+                response.raise_for_status()
+                return response
+
+            if tentativa == self.max_tentativas - 1:
+                response.raise_for_status()
+            # Libera a conexão de uma resposta descartada (stream=True)
+            response.close()
+
+            espera = self._espera_backoff(tentativa)
+            if response.status_code == 429:
+                retry_after = _cabecalho_numerico(response.headers, 'Retry-After')
+                limite = retry_after if retry_after is not None else reinicio
+                if limite is not None:
+                    espera = limite + random.uniform(0, self.backoff_base)
+            logging.warning(
+                f"HTTP {response.status_code} em {url}; tentativa {tentativa + 1}/{self.max_tentativas}, "
+                f"nova tentativa em {espera:.1f}s"
+            )
+            if response.status_code == 429:
+                # Vale para todas as threads: a espera acontece em adquirir()
+                self.limitador.bloquear(espera)
+            else:
+                time.sleep(espera)
+
+    def get_json(self, caminho, params=None):
+        """GET que retorna o corpo JSON da resposta"""
+        return self.get(caminho, params=params).json()
+
+    def get_json_cache(self, caminho, params=None, decodificar=True):
+        """GET JSON pelo cache em disco: retorna (dados, alterado)
+
+        `alterado` é False quando a entrada ainda está dentro do TTL, quando
+        a API responde 304 ou quando o corpo baixado é idêntico ao guardado.
+        Sem cache configurado, sempre faz a requisição e retorna alterado=True.
+        Com decodificar=False, `dados` é a origem do JSON para quem decodifica
+        em partes (src/json_stream.py): o caminho do corpo no cache ou, sem
+        cache, a própria resposta, baixada em stream. O corpo nunca é lido
+        inteiro para a memória nesse caso.
+        """
+        if self.cache is None:
+            if decodificar:
+                return self.get_json(caminho, params=params), True
+            return self.get(caminho, params=params, stream=True), True
+
+        url = f"{self.base_url}{caminho}"
+        chave = self.cache.chave(url, params)
+        caminho_corpo = self.cache.caminho_corpo(chave)
+
+        def carregar():
+            if not decodificar:
+                return caminho_corpo
+            with gzip.open(caminho_corpo, 'rt', encoding='utf-8') as arquivo:
+                return json.load(arquivo)
+
+        entrada = self.cache.ler(chave)
+        if self.cache.fresca(entrada):
+            logging.info(f"Cache válido (TTL) para {url}")
+            return carregar(), False
+
+        headers = {}
+        if entrada is not None:
+            if entrada.get('etag'):
+                headers['If-None-Match'] = entrada['etag']
+            if entrada.get('last_modified'):
+                headers['If-Modified-Since'] = entrada['last_modified']
+
+        response = self.get(caminho, params=params, headers=headers, stream=True)
+
+        if response.status_code == 304 and entrada is not None:
+            response.close()
+            entrada['salvo_em'] = time.time()
+            self.cache.gravar(chave, entrada)
+            logging.info(f"Resposta não modificada (304) para {url}")
+            return carregar(), False
+
+        with response:
+            hash_corpo = self.cache.gravar_corpo(
+                chave, response.iter_content(chunk_size=TAMANHO_BLOCO_CORPO),
+                entrada.get('hash') if entrada is not None else None
+            )
+        alterado = entrada is None or entrada.get('hash') != hash_corpo
+        self.cache.gravar(chave, {
+            'url': url,
+            'params': params,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'hash': hash_corpo,
+            'salvo_em': time.time()
+        })
+        return carregar(), alterado
+
+    def fechar(self):
+        self.sessao.close()
@@ -0,0 +1,333 @@
+import time
+
+import numpy as np
+
+
+class FlorestaVetorizada:
+    """RandomForestClassifier achatado em arrays NumPy contíguos.
+
+    Todas as árvores são concatenadas em um único conjunto de nós (feature,
+    threshold, filhos e distribuição de classes da folha). As folhas apontam
+    para si mesmas, então a travessia de uma linha em todas as árvores é um
+    laço de `profundidade` passos vetorizados, sem pool de threads nem a
+    validação do sklearn a cada chamada. Reproduz predict_proba dentro da
+    tolerância de ponto flutuante: as comparações usam X em float32, como a
+    árvore do sklearn, e portanto chegam às mesmas folhas, mas a soma das
+    probabilidades das árvores segue outra ordem e pode diferir no último
+    bit (~1e-16).
+    """
+
+    CAMPOS = ['classes_', 'raizes', 'feature', 'threshold', 'esquerda', 'direita', 'valores']
+
+    def __init__(self, classes_, raizes, feature, threshold, esquerda, direita, valores,
+                 profundidade):
+        self.classes_ = classes_
+        self.raizes = raizes
+        self.feature = feature
+        self.threshold = threshold
+        self.esquerda = esquerda
+        self.direita = direita
+        self.valores = valores
+        self.profundidade = int(profundidade)
+
+    @classmethod
+    def de_modelo(cls, modelo):
+        """Achata um RandomForestClassifier treinado"""
+        arvores = [estimador.tree_ for estimador in modelo.estimators_]
+        tamanhos = np.array([arvore.node_count for arvore in arvores])
+        deslocamentos = np.concatenate([[0], np.cumsum(tamanhos)[:-1]])
+
+        esquerda = []
+        direita = []
+        valores = []
+        for arvore, deslocamento in zip(arvores, deslocamentos):
+            folha = arvore.children_left == -1
+            indices = np.arange(arvore.node_count) + deslocamento
+            esquerda.append(np.where(folha, indices, arvore.children_left + deslocamento))
+            direita.append(np.where(folha, indices, arvore.children_right + deslocamento))
+
+            # Mesma normalização de DecisionTreeClassifier.predict_proba
+            valor = arvore.value[:, 0, :].astype(np.float64)
+            normalizador = valor.sum(axis=1, keepdims=True)
+            normalizador[normalizador == 0] = 1
+            valores.append(valor / normalizador)
+
+        feature = np.concatenate([arvore.feature for arvore in arvores])
+
+        return cls(
+            classes_=np.asarray(modelo.classes_),
+            raizes=deslocamentos.astype(np.int64),
+            feature=np.where(feature < 0, 0, feature).astype(np.int64),
+            threshold=np.concatenate([arvore.threshold for arvore in arvores]),
+            esquerda=np.concatenate(esquerda).astype(np.int64),
+            direita=np.concatenate(direita).astype(np.int64),
+            valores=np.concatenate(valores),
+            profundidade=max(arvore.max_depth for arvore in arvores)
+        )
+
+    @property
+    def n_estimators(self):
+        return len(self.raizes)
+
+    def folhas(self, X):
+        """Índice da folha alcançada por cada linha em cada árvore (n x árvores)"""
+        X = np.asarray(X, dtype=np.float32)
+        nos = np.broadcast_to(self.raizes, (len(X), len(self.raizes))).copy()
+        linhas = np.arange(len(X))[:, None]
+
+        for _ in range(self.profundidade):
+            valores = X[linhas, self.feature[nos]]
+            nos = np.where(valores <= self.threshold[nos], self.esquerda[nos], self.direita[nos])
+
+        return nos
+
+    def predict_proba(self, X):
+        """Probabilidades de RandomForestClassifier.predict_proba (iguais por np.allclose)"""
+        nos = self.folhas(X)
+        soma = self.valores[nos].sum(axis=1)
+        return soma / len(self.raizes)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def para_dict(self):
+        """Arrays e profundidade da floresta, para gravar no artefato"""
+        dados = {campo: getattr(self, campo) for campo in self.CAMPOS}
+        dados['profundidade'] = self.profundidade
+        return dados
+
+    @classmethod
+    def de_dict(cls, dados):
+        return cls(**dados)
+
+
+def medir_latencia(funcao, X, repeticoes=1000):
+    """Latência (em ms) de `funcao(X)`: média, p50, p95 e p99"""
+    funcao(X)  # aquecimento
+    tempos = np.empty(repeticoes)
+    for i in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(X)
+        tempos[i] = time.perf_counter() - inicio
+
+    tempos *= 1000
+    return {
+        'media_ms': float(tempos.mean()),
+        'p50_ms': float(np.percentile(tempos, 50)),
+        'p95_ms': float(np.percentile(tempos, 95)),
+        'p99_ms': float(np.percentile(tempos, 99))
+    }
+
+
+def benchmark_inferencia(modelo, X, repeticoes=1000):
+    """Compara predict_proba do sklearn com a FlorestaVetorizada em uma linha
+
+    Retorna as latências dos dois caminhos e a maior diferença absoluta
+    entre as probabilidades calculadas para todo X, que devem coincidir
+    dentro da tolerância de ponto flutuante.
+    """
+    floresta = FlorestaVetorizada.de_modelo(modelo)
+    linha = np.asarray(X[:1])
+
+    esperadas = modelo.predict_proba(X)
+    obtidas = floresta.predict_proba(X)
+    if not np.allclose(esperadas, obtidas):
+        raise ValueError(
+            f"FlorestaVetorizada diverge de predict_proba "
+            f"(diferença máxima {np.abs(esperadas - obtidas).max():.3g})"
+        )
+
+    return {
+        'sklearn': medir_latencia(modelo.predict_proba, linha, repeticoes),
+        'vetorizada': medir_latencia(floresta.predict_proba, linha, repeticoes),
+        'diferenca_maxima': float(np.abs(esperadas - obtidas).max())
+    }
+
+
+def _menor_inteiro(maximo):
+    """Menor tipo inteiro sem sinal capaz de representar `maximo`"""
+    for tipo in (np.uint8, np.uint16, np.uint32):
+        if maximo <= np.iinfo(tipo).max:
+            return tipo
+    return np.uint64
+
+
+def _threshold_float32(threshold):
+    """Converte thresholds para float32 sem mudar nenhuma decisão
+
+    Arredonda para baixo: para qualquer x float32, x <= t vale exatamente
+    quando x <= t32, com t32 o maior float32 que não passa de t.
+    """
+    threshold32 = threshold.astype(np.float32)
+    acima = threshold32.astype(np.float64) > threshold
+    threshold32[acima] = np.nextafter(threshold32[acima], np.float32(-np.inf))
+    return threshold32
+
+
+def _quantizar(probabilidades, escala):
+    """Quantiza distribuições para inteiros que somam exatamente `escala`
+
+    Usa o método do maior resto, de modo que a distribuição dequantizada
+    (q / escala) continua somando 1.
+    """
+    escalado = probabilidades * escala
+    quantizado = np.floor(escalado).astype(np.int64)
+    falta = escala - quantizado.sum(axis=1)
+    ordem = np.argsort(quantizado - escalado, axis=1, kind='stable')
+    recebe = np.arange(probabilidades.shape[1]) < falta[:, None]
+    np.put_along_axis(quantizado, ordem, np.take_along_axis(quantizado, ordem, axis=1) + recebe, axis=1)
+    return quantizado
+
+
+def _log_loss(probabilidades, y_indices):
+    """Log loss de classes já convertidas para índices de coluna"""
+    acerto = probabilidades[np.arange(len(y_indices)), y_indices]
+    return float(-np.mean(np.log(np.clip(acerto, 1e-15, 1.0))))
+
+
+def podar_arvores(floresta, X, y, tolerancia=0.001, min_arvores=50):
+    """Índices das árvores mantidas após a poda gulosa
+
+    Começando pelas árvores com pior log loss individual em (X, y), remove
+    cada uma enquanto o log loss do conjunto restante não passar do log loss
+    da floresta completa mais `tolerancia`. `min_arvores` evita que a poda
+    se ajuste demais ao conjunto de validação.
+    """
+    classes = list(floresta.classes_)
+    y_indices = np.array([classes.index(classe) for classe in y])
+
+    # Probabilidades de cada árvore: (amostras x árvores x classes)
+    por_arvore = floresta.valores[floresta.folhas(X)]
+    n_arvores = por_arvore.shape[1]
+    soma = por_arvore.sum(axis=1)
+    limite = _log_loss(soma / n_arvores, y_indices) + tolerancia
+
+    individuais = [_log_loss(por_arvore[:, t], y_indices) for t in range(n_arvores)]
+    mantidas = np.ones(n_arvores, dtype=bool)
+
+    for t in np.argsort(individuais)[::-1]:
+        restantes = mantidas.sum()
+        if restantes <= max(min_arvores, 1):
+            break
+        candidata = soma - por_arvore[:, t]
+        if _log_loss(candidata / (restantes - 1), y_indices) <= limite:
+            soma = candidata
+            mantidas[t] = False
+
+    return np.flatnonzero(mantidas)
+
+
+class FlorestaCompacta:
+    """Forma compacta e somente de inferência de um RandomForestClassifier.
+
+    Thresholds em float32 (sem alterar decisões), distribuições das folhas
+    quantizadas em uint8 ou uint16 e índices de nós no menor inteiro que os
+    comporta (os filhos são relativos à raiz de cada árvore). Expõe
+    predict_proba, predict e classes_, então pode substituir o estimador
+    em BrasileiraoPredictor.
+    """
+
+    CAMPOS = ['classes_', 'raizes', 'feature', 'threshold', 'esquerda', 'direita', 'valores']
+
+    def __init__(self, classes_, raizes, feature, threshold, esquerda, direita, valores,
+                 escala, profundidade):
+        self.classes_ = classes_
+        self.raizes = raizes
+        self.feature = feature
+        self.threshold = threshold
+        self.esquerda = esquerda
+        self.direita = direita
+        self.valores = valores
+        self.escala = int(escala)
+        self.profundidade = int(profundidade)
+
+    @classmethod
+    def de_modelo(cls, modelo, bits=8, arvores=None):
+        """Compacta um RandomForestClassifier treinado
+
+        `arvores` restringe a exportação a um subconjunto de índices (por
+        exemplo, o resultado de podar_arvores).
+        """
+        if bits not in (8, 16):
+            raise ValueError("bits deve ser 8 ou 16")
+
+        estimadores = modelo.estimators_
+        if arvores is not None:
+            estimadores = [estimadores[i] for i in arvores]
+        arvores = [estimador.tree_ for estimador in estimadores]
+
+        tamanhos = np.array([arvore.node_count for arvore in arvores])
+        raizes = np.concatenate([[0], np.cumsum(tamanhos)[:-1]])
+        tipo_no = _menor_inteiro(tamanhos.max() - 1)
+        tipo_valor = np.uint8 if bits == 8 else np.uint16
+        escala = np.iinfo(tipo_valor).max
+
+        esquerda = []
+        direita = []
+        valores = []
+        for arvore in arvores:
+            folha = arvore.children_left == -1
+            indices = np.arange(arvore.node_count)
+            esquerda.append(np.where(folha, indices, arvore.children_left))
+            direita.append(np.where(folha, indices, arvore.children_right))
+
+            valor = arvore.value[:, 0, :].astype(np.float64)
+            normalizador = valor.sum(axis=1, keepdims=True)
+            normalizador[normalizador == 0] = 1
+            # Só as folhas são lidas na predição; nós internos ficam zerados
+            quantizado = np.zeros(valor.shape, dtype=np.int64)
+            quantizado[folha] = _quantizar(valor[folha] / normalizador[folha], escala)
+            valores.append(quantizado)
+
+        feature = np.concatenate([arvore.feature for arvore in arvores])
+        feature = np.where(feature < 0, 0, feature)
+        threshold = np.concatenate([arvore.threshold for arvore in arvores])
+
+        return cls(
+            classes_=np.asarray(modelo.classes_),
+            raizes=raizes.astype(_menor_inteiro(raizes.max())),
+            feature=feature.astype(_menor_inteiro(feature.max())),
+            threshold=_threshold_float32(threshold),
+            esquerda=np.concatenate(esquerda).astype(tipo_no),
+            direita=np.concatenate(direita).astype(tipo_no),
+            valores=np.concatenate(valores).astype(tipo_valor),
+            escala=escala,
+            profundidade=max(arvore.max_depth for arvore in arvores)
+        )
+
+    @property
+    def n_estimators(self):
+        return len(self.raizes)
+
+    @property
+    def nbytes(self):
+        """Memória ocupada pelos arrays da floresta"""
+        return sum(getattr(self, campo).nbytes for campo in self.CAMPOS)
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        raizes = self.raizes.astype(np.int64)
+        nos = np.broadcast_to(raizes, (len(X), len(raizes))).copy()
+        linhas = np.arange(len(X))[:, None]
+
+        for _ in range(self.profundidade):
+            valores = X[linhas, self.feature[nos]]
+            filhos = np.where(valores <= self.threshold[nos], self.esquerda[nos], self.direita[nos])
+            nos = raizes + filhos
+
+        soma = self.valores[nos].sum(axis=1, dtype=np.int64)
+        return soma / (self.escala * len(raizes))
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def para_dict(self):
+        """Arrays e parâmetros da floresta, para gravar no artefato"""
+        dados = {campo: getattr(self, campo) for campo in self.CAMPOS}
+        dados['escala'] = self.escala
+        dados['profundidade'] = self.profundidade
+        return dados
+
+    @classmethod
+    def de_dict(cls, dados):
+        return cls(**dados)
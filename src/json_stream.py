@@ -0,0 +1,141 @@
+"""Leitura incremental de arrays de payloads JSON grandes.
+
+`iterar_array(origem, 'matches')` devolve, um por vez, os objetos do array
+`matches` do nível de cima do documento, sem montar o documento inteiro em
+memória: o texto é lido em blocos e cada elemento é decodificado com
+json.JSONDecoder.raw_decode assim que está completo no buffer. A origem pode
+ser o dicionário já decodificado, o texto JSON (str/bytes), o caminho de um
+arquivo (comprimido com gzip se terminar em .gz, como os corpos do cache de
+src/http_client.py), um arquivo aberto ou uma resposta do requests.
+"""
+import codecs
+import gzip
+import json
+import os
+
+TAMANHO_BLOCO = 1 << 16
+ESPACOS = ' \t\n\r'
+
+
+def blocos_texto(origem, tamanho_bloco=TAMANHO_BLOCO):
+    """Texto da origem em blocos de str"""
+    if isinstance(origem, bytes):
+        yield origem.decode('utf-8')
+        return
+    if isinstance(origem, str) and origem.lstrip()[:1] in ('{', '['):
+        yield origem
+        return
+
+    if isinstance(origem, (str, os.PathLike)):
+        abrir = gzip.open if os.fspath(origem).endswith('.gz') else open
+        with abrir(origem, 'rt', encoding='utf-8') as arquivo:
+            yield from blocos_texto(arquivo, tamanho_bloco)
+        return
+
+    if hasattr(origem, 'iter_content'):
+        # requests.Response (de preferência obtida com stream=True)
+        blocos = origem.iter_content(chunk_size=tamanho_bloco)
+    else:
+        blocos = iter(lambda: origem.read(tamanho_bloco), origem.read(0))
+
+    decodificador = codecs.getincrementaldecoder('utf-8')()
+    for bloco in blocos:
+        yield decodificador.decode(bloco) if isinstance(bloco, bytes) else bloco
+    final = decodificador.decode(b'', final=True)
+    if final:
+        yield final
+
+
+class _LeitorJSON:
+    """Buffer sobre os blocos de texto com leitura de valores por raw_decode"""
+
+    def __init__(self, blocos):
+        self.blocos = iter(blocos)
+        self.buffer = ''
+        self.posicao = 0
+        self.fim = False
+        self.decodificador = json.JSONDecoder()
+
+    def _ler_mais(self):
+        bloco = next(self.blocos, None)
+        if bloco is None:
+            self.fim = True
+            return False
+        # Descarta o que já foi consumido
+        self.buffer = self.buffer[self.posicao:] + bloco
+        self.posicao = 0
+        return True
+
+    def espiar(self):
+        """Próximo caractere que não é espaço ('' no fim do texto), sem consumir"""
+        while True:
+            while self.posicao < len(self.buffer) and self.buffer[self.posicao] in ESPACOS:
+                self.posicao += 1
+            if self.posicao < len(self.buffer):
+                return self.buffer[self.posicao]
+            if not self._ler_mais():
+                return ''
+
+    def consumir(self, esperado):
+        caractere = self.espiar()
+        if caractere != esperado:
+            raise ValueError(f"JSON inválido: esperado {esperado!r}, encontrado {caractere!r}")
+        self.posicao += 1
+
+    def valor(self):
+        """Decodifica o próximo valor, lendo mais blocos até ele estar completo"""
+        self.espiar()
+        while True:
+            try:
+                valor, fim = self.decodificador.raw_decode(self.buffer, self.posicao)
+            except json.JSONDecodeError:
+                if self._ler_mais():
+                    continue
+                raise
+            # Um número no fim do buffer pode continuar no próximo bloco
+            if fim == len(self.buffer) and not self.fim and self._ler_mais():
+                continue
+            self.posicao = fim
+            return valor
+
+
+def _elementos(leitor):
+    leitor.consumir('[')
+    if leitor.espiar() == ']':
+        leitor.posicao += 1
+        return
+    while True:
+        yield leitor.valor()
+        if leitor.espiar() == ',':
+            leitor.posicao += 1
+            continue
+        leitor.consumir(']')
+        return
+
+
+def iterar_array(origem, chave, tamanho_bloco=TAMANHO_BLOCO):
+    """Elementos do array `chave` do objeto JSON de nível mais alto
+
+    Os demais campos do objeto são decodificados e descartados. Se a chave
+    não existir, não devolve nada.
+    """
+    if isinstance(origem, dict):
+        yield from origem.get(chave) or []
+        return
+
+    leitor = _LeitorJSON(blocos_texto(origem, tamanho_bloco))
+    leitor.consumir('{')
+    if leitor.espiar() == '}':
+        return
+    while True:
+        nome = leitor.valor()
+        leitor.consumir(':')
+        if nome == chave and leitor.espiar() == '[':
+            yield from _elementos(leitor)
+            return
+        leitor.valor()
+        if leitor.espiar() == ',':
+            leitor.posicao += 1
+            continue
+        leitor.consumir('}')
+        return
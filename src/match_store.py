@@ -0,0 +1,344 @@
+"""Banco SQLite (opcional) com as partidas e a classificação.
+
+Espelha o armazenamento colunar (src/storage.py) em um arquivo SQLite para
+consultas pontuais sem varrer a tabela inteira: últimas partidas de um time
+antes de uma data e confronto direto entre dois times. Os índices em
+(time_casa, data), (time_fora, data) e no par de times sem ordem
+(time_a, time_b, data) fazem cada consulta custar O(log N + n) em número
+de partidas, independentemente de quantas temporadas e competições houver.
+"""
+import logging
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+from . import storage
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS partidas (
+    id INTEGER,
+    competicao INTEGER NOT NULL,
+    temporada INTEGER NOT NULL,
+    rodada INTEGER,
+    data TEXT NOT NULL,
+    status TEXT,
+    time_casa TEXT,
+    time_fora TEXT,
+    time_a TEXT,
+    time_b TEXT,
+    gols_casa INTEGER,
+    gols_fora INTEGER,
+    vencedor TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_partidas_casa ON partidas (time_casa, data);
+CREATE INDEX IF NOT EXISTS idx_partidas_fora ON partidas (time_fora, data);
+CREATE INDEX IF NOT EXISTS idx_partidas_par ON partidas (time_a, time_b, data);
+CREATE INDEX IF NOT EXISTS idx_partidas_temporada ON partidas (competicao, temporada);
+
+CREATE TABLE IF NOT EXISTS classificacao (
+    competicao INTEGER NOT NULL,
+    posicao INTEGER,
+    time TEXT NOT NULL,
+    pontos INTEGER,
+    jogos INTEGER,
+    vitorias INTEGER,
+    empates INTEGER,
+    derrotas INTEGER,
+    gols_pro INTEGER,
+    gols_contra INTEGER,
+    saldo_gols INTEGER,
+    PRIMARY KEY (competicao, time)
+);
+"""
+
+COLUNAS = [
+    'id', 'competicao', 'temporada', 'rodada', 'data', 'status', 'time_casa', 'time_fora',
+    'time_a', 'time_b', 'gols_casa', 'gols_fora', 'vencedor'
+]
+
+COLUNAS_CLASSIFICACAO = [
+    'posicao', 'time', 'pontos', 'jogos', 'vitorias', 'empates', 'derrotas',
+    'gols_pro', 'gols_contra', 'saldo_gols'
+]
+
+# Colunas devolvidas nas consultas (as de process_matches_data)
+COLUNAS_SELECAO = [
+    'id', 'rodada', 'data', 'status', 'time_casa', 'time_fora',
+    'gols_casa', 'gols_fora', 'vencedor', 'temporada'
+]
+SELECAO = ', '.join(COLUNAS_SELECAO)
+
+
+def _data_iso(valor):
+    """Data em texto ISO UTC, que ordena igual ao timestamp"""
+    data = pd.Timestamp(valor)
+    data = data.tz_localize('UTC') if data.tzinfo is None else data.tz_convert('UTC')
+    return data.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _inteiro(valor):
+    return None if pd.isna(valor) else int(valor)
+
+
+def _texto(valor):
+    return None if pd.isna(valor) else valor
+
+
+def _par(time_casa, time_fora):
+    """Times em ordem (time_a, time_b); sem um dos nomes, o par fica nulo"""
+    if pd.isna(time_casa) or pd.isna(time_fora):
+        return None, None
+    return min(time_casa, time_fora), max(time_casa, time_fora)
+
+
+class BrasileiraoMatchStore:
+    """Partidas e classificação em SQLite, com índices por time, data e confronto"""
+
+    def __init__(self, caminho='data/brasileirao.db', competicao=None):
+        self.caminho = caminho
+        self.competicao = competicao
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+        with self._conexao() as conexao:
+            conexao.executescript(ESQUEMA)
+            self._migrar_times_nulos(conexao)
+
+        os.makedirs('logs', exist_ok=True)
+        logging.basicConfig(
+            filename='logs/data_processing.log',
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s'
+        )
+
+    def _conexao(self):
+        """Uma conexão por thread; WAL deixa leituras correrem durante escritas"""
+        conexao = getattr(self._local, 'conexao', None)
+        if conexao is None:
+            conexao = sqlite3.connect(self.caminho, timeout=30)
+            conexao.execute('PRAGMA journal_mode=WAL')
+            conexao.execute('PRAGMA synchronous=NORMAL')
+            self._local.conexao = conexao
+        return conexao
+
+    @staticmethod
+    def _migrar_times_nulos(conexao):
+        """Bancos antigos declaravam os times NOT NULL; fases eliminatórias
+        trazem partidas com time indefinido, então a tabela é recriada"""
+        colunas = conexao.execute('PRAGMA table_info(partidas)').fetchall()
+        if not any(coluna[1] == 'time_casa' and coluna[3] for coluna in colunas):
+            return
+        conexao.execute('ALTER TABLE partidas RENAME TO partidas_antiga')
+        for indice in ('casa', 'fora', 'par', 'temporada'):
+            conexao.execute(f'DROP INDEX IF EXISTS idx_partidas_{indice}')
+        conexao.executescript(ESQUEMA)
+        colunas_lista = ', '.join(COLUNAS)
+        conexao.execute(f"INSERT INTO partidas ({colunas_lista}) SELECT {colunas_lista} FROM partidas_antiga")
+        conexao.execute('DROP TABLE partidas_antiga')
+        logging.info('Banco de partidas migrado: times agora aceitam nulos')
+
+    def _competicao(self, competicao):
+        if competicao is not None:
+            return competicao
+        if self.competicao is None:
+            self.competicao = storage.configuracao()['competicao']
+        return self.competicao
+
+    def _consultar(self, sql, parametros):
+        """Executa a consulta e devolve as partidas com data em timestamp e gols em Int8
+
+        Times e status ficam como texto: montar as categorias de
+        storage.tipar_partidas custaria mais que a própria consulta.
+        """
+        linhas = self._conexao().execute(sql, parametros).fetchall()
+        colunas = dict(zip(COLUNAS_SELECAO, map(list, zip(*linhas)))) if linhas else {
+            coluna: [] for coluna in COLUNAS_SELECAO
+        }
+        colunas['data'] = pd.to_datetime(colunas['data'], utc=True, format='%Y-%m-%dT%H:%M:%SZ')
+        colunas['gols_casa'] = pd.array(colunas['gols_casa'], dtype='Int8')
+        colunas['gols_fora'] = pd.array(colunas['gols_fora'], dtype='Int8')
+        return pd.DataFrame(colunas, columns=COLUNAS_SELECAO)
+
+    def vazio(self):
+        return self._conexao().execute('SELECT 1 FROM partidas LIMIT 1').fetchone() is None
+
+    def salvar_temporada(self, df, temporada, competicao=None):
+        """Substitui as partidas de uma temporada em uma única transação"""
+        competicao = self._competicao(competicao)
+        linhas = [
+            (
+                _inteiro(partida.id) if hasattr(partida, 'id') else None,
+                competicao,
+                int(temporada),
+                _inteiro(partida.rodada),
+                _data_iso(partida.data),
+                _texto(partida.status),
+                _texto(partida.time_casa),
+                _texto(partida.time_fora),
+                *_par(partida.time_casa, partida.time_fora),
+                _inteiro(partida.gols_casa),
+                _inteiro(partida.gols_fora),
+                _texto(partida.vencedor)
+            )
+            for partida in df.itertuples(index=False)
+        ]
+
+        with self._conexao() as conexao:
+            conexao.execute(
+                'DELETE FROM partidas WHERE competicao = ? AND temporada = ?',
+                (competicao, int(temporada))
+            )
+            conexao.executemany(
+                f"INSERT INTO partidas ({', '.join(COLUNAS)}) VALUES ({', '.join('?' * len(COLUNAS))})",
+                linhas
+            )
+        return len(linhas)
+
+    def salvar_partidas(self, df, competicao=None):
+        """Grava cada temporada de `df`"""
+        return sum(
+            self.salvar_temporada(partidas, temporada, competicao)
+            for temporada, partidas in df.groupby('temporada', observed=True)
+        )
+
+    def ultimas_partidas(self, time, n=5, antes_de=None, competicao=None, apenas_finalizadas=True):
+        """As n partidas mais recentes do time com data anterior a `antes_de`
+
+        Cada metade da união percorre seu índice (time_casa ou time_fora,
+        data) de trás para frente e para em n linhas. Retorna as partidas da
+        mais recente para a mais antiga.
+        """
+        try:
+            filtro = 'competicao = ? AND data < ?'
+            if apenas_finalizadas:
+                filtro += " AND status = 'FINISHED'"
+            limite = '9999-12-31T23:59:59Z' if antes_de is None else _data_iso(antes_de)
+            competicao = self._competicao(competicao)
+
+            sql = f"""
+                SELECT * FROM (
+                    SELECT {SELECAO} FROM partidas INDEXED BY idx_partidas_casa
+                    WHERE time_casa = ? AND {filtro} ORDER BY data DESC LIMIT ?
+                )
+                UNION ALL
+                SELECT * FROM (
+                    SELECT {SELECAO} FROM partidas INDEXED BY idx_partidas_fora
+                    WHERE time_fora = ? AND {filtro} ORDER BY data DESC LIMIT ?
+                )
+                ORDER BY data DESC LIMIT ?
+            """
+            return self._consultar(sql, (
+                time, competicao, limite, n,
+                time, competicao, limite, n,
+                n
+            ))
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao consultar partidas de {time}: {str(e)}")
+            return None
+
+    def confronto_direto(self, time_a, time_b, n=None, antes_de=None, competicao=None,
+                         apenas_finalizadas=True):
+        """Partidas entre os dois times (nos dois mandos), da mais recente para a mais antiga"""
+        try:
+            menor, maior = min(time_a, time_b), max(time_a, time_b)
+            limite = '9999-12-31T23:59:59Z' if antes_de is None else _data_iso(antes_de)
+            sql = (
+                f"SELECT {SELECAO} FROM partidas INDEXED BY idx_partidas_par "
+                "WHERE time_a = ? AND time_b = ? AND data < ? AND competicao = ?"
+            )
+            if apenas_finalizadas:
+                sql += " AND status = 'FINISHED'"
+            sql += ' ORDER BY data DESC'
+            parametros = [menor, maior, limite, self._competicao(competicao)]
+            if n is not None:
+                sql += ' LIMIT ?'
+                parametros.append(n)
+            return self._consultar(sql, parametros)
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao consultar confronto {time_a} x {time_b}: {str(e)}")
+            return None
+
+    def partidas_time(self, time, competicao=None, temporadas=None):
+        """Todas as partidas do time (como mandante ou visitante), em ordem de data"""
+        try:
+            filtro = 'competicao = ?'
+            parametros = [self._competicao(competicao)]
+            if temporadas:
+                filtro += f" AND temporada IN ({', '.join('?' * len(temporadas))})"
+                parametros += [int(t) for t in temporadas]
+
+            sql = f"""
+                SELECT {SELECAO} FROM partidas INDEXED BY idx_partidas_casa WHERE time_casa = ? AND {filtro}
+                UNION ALL
+                SELECT {SELECAO} FROM partidas INDEXED BY idx_partidas_fora WHERE time_fora = ? AND {filtro}
+                ORDER BY data
+            """
+            return self._consultar(sql, [time, *parametros, time, *parametros])
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao consultar partidas de {time}: {str(e)}")
+            return None
+
+    def salvar_classificacao(self, df, competicao=None):
+        """Substitui a classificação da competição"""
+        competicao = self._competicao(competicao)
+        linhas = [
+            (competicao, *(int(v) if c != 'time' else v for c, v in zip(COLUNAS_CLASSIFICACAO, linha)))
+            for linha in df[COLUNAS_CLASSIFICACAO].itertuples(index=False)
+        ]
+        with self._conexao() as conexao:
+            conexao.execute('DELETE FROM classificacao WHERE competicao = ?', (competicao,))
+            conexao.executemany(
+                f"INSERT INTO classificacao (competicao, {', '.join(COLUNAS_CLASSIFICACAO)}) "
+                f"VALUES ({', '.join('?' * (len(COLUNAS_CLASSIFICACAO) + 1))})",
+                linhas
+            )
+        return len(linhas)
+
+    def carregar_classificacao(self, competicao=None):
+        """Classificação salva da competição, ou None"""
+        try:
+            linhas = self._conexao().execute(
+                f"SELECT {', '.join(COLUNAS_CLASSIFICACAO)} FROM classificacao "
+                "WHERE competicao = ? ORDER BY posicao",
+                (self._competicao(competicao),)
+            ).fetchall()
+            return pd.DataFrame(linhas, columns=COLUNAS_CLASSIFICACAO) if linhas else None
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao carregar classificação do banco: {str(e)}")
+            return None
+
+    def fechar(self):
+        conexao = getattr(self._local, 'conexao', None)
+        if conexao is not None:
+            conexao.close()
+            self._local.conexao = None
+
+
+_bancos = {}
+_lock_bancos = threading.Lock()
+
+
+def banco_configurado():
+    """BrasileiraoMatchStore de `storage.sqlite` no config.yaml, ou None se desativado
+
+    Na primeira abertura de um banco vazio, copia as partidas e a
+    classificação já gravadas no armazenamento colunar.
+    """
+    configuracao = storage.configuracao()
+    caminho = configuracao.get('sqlite')
+    if not caminho:
+        return None
+    with _lock_bancos:
+        if caminho not in _bancos:
+            banco = BrasileiraoMatchStore(caminho, configuracao['competicao'])
+            if banco.vazio():
+                df = storage.carregar_partidas(configuracao['competicao'])
+                if df is not None:
+                    banco.salvar_partidas(df)
+                classificacao = storage.carregar_classificacao()
+                if classificacao is not None:
+                    banco.salvar_classificacao(classificacao)
+            _bancos[caminho] = banco
+        return _bancos[caminho]
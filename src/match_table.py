@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+# Resultado na mesma codificação do target (0 = vitória fora, 1 = empate,
+# 2 = vitória casa); -1 para partidas sem vencedor definido
+RESULTADOS = {'AWAY_TEAM': 0, 'DRAW': 1, 'HOME_TEAM': 2}
+SEM_RESULTADO = -1
+
+# Pontos do mandante e do visitante por resultado (índice -1 = sem resultado)
+PONTOS_CASA = np.array([0, 1, 3, -1], dtype=np.int8)
+PONTOS_FORA = np.array([3, 1, 0, -1], dtype=np.int8)
+
+
+def codificar_resultados(vencedor):
+    """Converte a coluna `vencedor` (HOME_TEAM/DRAW/AWAY_TEAM) para int8"""
+    # Compara só os valores distintos; nulos recebem o código -1 do factorize
+    codigos, valores = pd.factorize(np.asarray(vencedor, dtype=object))
+    tabela = np.array([RESULTADOS.get(valor, SEM_RESULTADO) for valor in valores] + [SEM_RESULTADO],
+                      dtype=np.int8)
+    return tabela[codigos]
+
+
+def pontos_do_time(resultado, mandante):
+    """Pontos do time em cada partida (3/1/0; -1 sem resultado)
+
+    `resultado` vem de codificar_resultados/MatchTable.resultado e
+    `mandante` indica se o time jogou em casa.
+    """
+    return np.where(mandante, PONTOS_CASA[resultado], PONTOS_FORA[resultado])
+
+
+class MatchTable:
+    """Partidas em arrays NumPy contíguos com times codificados como inteiros.
+
+    Os times recebem códigos int16 na ordem alfabética (a mesma de
+    BrasileiraoStandings.times), gols ficam em int8 (-1 quando a partida
+    ainda não tem placar), o resultado em int8 na codificação do target e
+    a data em int64 (ns desde a época, UTC). `linhas_time[codigo]` guarda,
+    em ordem de data, as linhas das partidas de cada time e
+    `linhas_confronto[(menor, maior)]` as partidas entre dois times em
+    qualquer mando, então filtros por time ou confronto são consultas a
+    índices prontos, sem comparar nomes nem varrer a tabela. As linhas
+    seguem a ordem de `df`.
+    """
+
+    def __init__(self, df):
+        n = len(df)
+        codigos, times = pd.factorize(
+            np.concatenate([df['time_casa'].to_numpy(dtype=object), df['time_fora'].to_numpy(dtype=object)]),
+            sort=True
+        )
+        self.times = np.asarray(times, dtype=object)
+        self._indice_time = {time: i for i, time in enumerate(self.times)}
+        n_times = len(self.times)
+
+        codigos = codigos.astype(np.int16)
+        self.casa = codigos[:n].copy()
+        self.fora = codigos[n:].copy()
+
+        self.gols_casa = pd.to_numeric(df['gols_casa']).fillna(-1).to_numpy(dtype=np.int8)
+        self.gols_fora = pd.to_numeric(df['gols_fora']).fillna(-1).to_numpy(dtype=np.int8)
+        self.resultado = codificar_resultados(df['vencedor'])
+        datas = df['data']
+        if not isinstance(datas.dtype, pd.DatetimeTZDtype):
+            datas = pd.to_datetime(datas, utc=True)
+        self.data = pd.DatetimeIndex(datas).tz_convert('UTC').as_unit('ns').asi8.copy()
+        self.finalizada = (df['status'] == 'FINISHED').to_numpy()
+
+        if 'temporada' in df.columns:
+            self.temporada = df['temporada'].to_numpy(dtype=np.int16)
+        else:
+            self.temporada = np.zeros(len(df), dtype=np.int16)
+
+        # Linhas de cada time ordenadas por data: ordena (time, data) uma vez
+        # e corta nos limites de cada time
+        linhas = np.arange(n, dtype=np.int32)
+        todos_times = np.concatenate([self.casa, self.fora])
+        todas_linhas = np.concatenate([linhas, linhas])
+        ordem = np.lexsort((np.concatenate([self.data, self.data]), todos_times))
+        limites = np.searchsorted(todos_times[ordem], np.arange(n_times + 1))
+        ordenadas = todas_linhas[ordem]
+        self.linhas_time = [
+            ordenadas[limites[codigo]:limites[codigo + 1]] for codigo in range(n_times)
+        ]
+
+        # Confrontos: chave do par sem ordem (menor * n_times + maior), mesma técnica
+        menor = np.minimum(self.casa, self.fora).astype(np.int64)
+        maior = np.maximum(self.casa, self.fora).astype(np.int64)
+        pares = menor * n_times + maior
+        ordem = np.lexsort((self.data, pares))
+        chaves, inicios = np.unique(pares[ordem], return_index=True)
+        fins = np.append(inicios[1:], n)
+        self.linhas_confronto = {
+            divmod(int(chave), n_times): ordem[inicio:fim].astype(np.int32)
+            for chave, inicio, fim in zip(chaves, inicios, fins)
+        }
+
+    def __len__(self):
+        return len(self.data)
+
+    def codigo(self, time):
+        """Código do time, ou -1 se ele não aparece nas partidas"""
+        return self._indice_time.get(time, -1)
+
+    def codificar(self, times):
+        """Códigos int16 de uma sequência de nomes (-1 para desconhecidos)"""
+        return np.array([self._indice_time.get(time, -1) for time in times], dtype=np.int16)
+
+    def partidas_time(self, time, apenas_finalizadas=False):
+        """Linhas das partidas do time em ordem de data"""
+        codigo = self.codigo(time)
+        if codigo < 0:
+            return np.array([], dtype=np.int32)
+        linhas = self.linhas_time[codigo]
+        return linhas[self.finalizada[linhas]] if apenas_finalizadas else linhas
+
+    def confronto(self, time_a, time_b, apenas_finalizadas=False):
+        """Linhas das partidas entre os dois times (nos dois mandos) em ordem de data"""
+        a, b = self.codigo(time_a), self.codigo(time_b)
+        linhas = self.linhas_confronto.get((min(a, b), max(a, b)), np.array([], dtype=np.int32))
+        return linhas[self.finalizada[linhas]] if apenas_finalizadas else linhas
+
+    def mandante(self, linhas, time):
+        """Máscara das linhas em que o time jogou em casa"""
+        return self.casa[linhas] == self.codigo(time)
+
+    def pontos(self, linhas, time):
+        """Pontos do time nas linhas indicadas (3/1/0; -1 sem resultado)"""
+        return pontos_do_time(self.resultado[linhas], self.mandante(linhas, time))
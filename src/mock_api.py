@@ -0,0 +1,350 @@
+"""Servidor local no lugar do football-data.org, para testar o coletor sem rede.
+
+Uso:
+    python -m src.mock_api [--porta 8080] [--latencia 0.2] [--limite-minuto 10] [--taxa-erro 0.05]
+
+Atende /v4/competitions/{id}/matches e /v4/competitions/{id}/standings (com
+ou sem o prefixo /v4) com o mesmo formato da API. As respostas vêm de
+arquivos gravados em <gravados>/<competição>/<temporada>/matches.json e
+standings.json quando existem; caso contrário, de uma liga sintética
+(utils.gerar_liga) gerada por competição e temporada. Os filtros season,
+status, dateFrom e dateTo são aplicados como na API.
+
+Latência, limite de requisições por minuto (429 com Retry-After e os
+cabeçalhos X-Requests-Available-Minute/X-RequestCounter-Reset), erros 5xx
+aleatórios e o tamanho das respostas são configuráveis na seção `mock_api`
+do config/config.yaml ou pela linha de comando. Para apontar o coletor para
+o servidor, use `api.base_url: "http://127.0.0.1:8080/v4"` ou a variável de
+ambiente FOOTBALL_API_URL.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .standings import BrasileiraoStandings
+from .utils import carregar_config, gerar_liga
+
+ROTA = re.compile(r'^(?:/v4)?/competitions/(\w+)/(matches|standings)/?$')
+STATUS_ERRO = (500, 502, 503, 504)
+
+
+def _partidas_api(df, competicao, temporada, preenchimento=0):
+    """Partidas de gerar_liga no formato de /competitions/{id}/matches"""
+    ids_times = {}
+    partidas = []
+    for partida in df.itertuples(index=False):
+        finalizada = partida.status == 'FINISHED'
+        gols_casa = int(partida.gols_casa) if finalizada else None
+        gols_fora = int(partida.gols_fora) if finalizada else None
+        time_casa = ids_times.setdefault(partida.time_casa, len(ids_times) + 1)
+        time_fora = ids_times.setdefault(partida.time_fora, len(ids_times) + 1)
+        registro = {
+            'area': {'id': 2032, 'name': 'Brazil', 'code': 'BRA'},
+            'competition': {'id': competicao, 'name': 'Campeonato Brasileiro Série A'},
+            'season': {
+                'id': temporada,
+                'startDate': f"{temporada}-04-15",
+                'endDate': f"{temporada}-12-31",
+                'currentMatchday': int(df['rodada'].max())
+            },
+            'id': int(competicao) * 1_000_000 + int(partida.id),
+            'utcDate': partida.data.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'status': partida.status,
+            'matchday': int(partida.rodada),
+            'stage': 'REGULAR_SEASON',
+            'lastUpdated': partida.data.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'homeTeam': {'id': time_casa, 'name': partida.time_casa},
+            'awayTeam': {'id': time_fora, 'name': partida.time_fora},
+            'score': {
+                'winner': partida.vencedor if finalizada else None,
+                'duration': 'REGULAR',
+                'fullTime': {'home': gols_casa, 'away': gols_fora},
+                'halfTime': {'home': None, 'away': None}
+            },
+            'referees': []
+        }
+        if preenchimento:
+            # Simula os campos extras (odds, escalações...) de respostas maiores
+            registro['extra'] = 'x' * preenchimento
+        partidas.append(registro)
+    return partidas
+
+
+def _classificacao_api(df, competicao, temporada):
+    """Classificação final de gerar_liga no formato de /competitions/{id}/standings"""
+    tabela = BrasileiraoStandings(df).tabela()
+    linhas = [] if tabela is None else [
+        {
+            'position': int(linha.posicao),
+            'team': {'id': int(linha.posicao), 'name': linha.time},
+            'playedGames': int(linha.jogos),
+            'won': int(linha.vitorias),
+            'draw': int(linha.empates),
+            'lost': int(linha.derrotas),
+            'points': int(linha.pontos),
+            'goalsFor': int(linha.gols_pro),
+            'goalsAgainst': int(linha.gols_contra),
+            'goalDifference': int(linha.saldo_gols)
+        }
+        for linha in tabela.itertuples(index=False)
+    ]
+    return {
+        'filters': {'season': str(temporada)},
+        'competition': {'id': competicao},
+        'season': {'id': temporada, 'startDate': f"{temporada}-04-15", 'endDate': f"{temporada}-12-31"},
+        'standings': [{'stage': 'REGULAR_SEASON', 'type': 'TOTAL', 'group': None, 'table': linhas}]
+    }
+
+
+def _filtrar_partidas(partidas, params):
+    """Aplica os filtros status, dateFrom e dateTo da API"""
+    status = params.get('status')
+    if status:
+        permitidos = set(status.split(','))
+        partidas = [p for p in partidas if p['status'] in permitidos]
+    if params.get('dateFrom'):
+        partidas = [p for p in partidas if p['utcDate'][:10] >= params['dateFrom']]
+    if params.get('dateTo'):
+        partidas = [p for p in partidas if p['utcDate'][:10] <= params['dateTo']]
+    return partidas
+
+
+class ServidorFootballData:
+    """ThreadingHTTPServer que responde como o football-data.org
+
+    `estatisticas` conta requisições e respostas por status, para comparar
+    com o que o coletor registrou em testes de carga.
+    """
+
+    def __init__(self, host='127.0.0.1', porta=0, latencia=0.0, variacao_latencia=0.0,
+                 limite_minuto=0, taxa_erro=0.0, n_times=20, partidas_agendadas=0,
+                 preenchimento=0, temporada_padrao=2023, gravados=None, semente=42):
+        self.latencia = latencia
+        self.variacao_latencia = variacao_latencia
+        self.limite_minuto = limite_minuto
+        self.taxa_erro = taxa_erro
+        self.n_times = n_times
+        self.partidas_agendadas = partidas_agendadas
+        self.preenchimento = preenchimento
+        self.temporada_padrao = temporada_padrao
+        self.gravados = gravados
+        self.semente = semente
+
+        self._rng = random.Random(semente)
+        self._lock = threading.Lock()
+        self._payloads = {}
+        self._janela = (0.0, 0)  # (início da janela de um minuto, requisições nela)
+        self.estatisticas = {'requisicoes': 0, 'respostas': {}}
+
+        self.httpd = ThreadingHTTPServer((host, porta), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, porta = self.httpd.server_address[:2]
+        return f"http://{host}:{porta}/v4"
+
+    def iniciar(self):
+        """Atende em uma thread em segundo plano; retorna a base_url"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def parar(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, *exc):
+        self.parar()
+
+    def _dados(self, competicao, temporada):
+        """Partidas e classificação da temporada (gravadas ou sintéticas), em cache"""
+        chave = (competicao, temporada)
+        with self._lock:
+            if chave in self._payloads:
+                return self._payloads[chave]
+
+        dados = None
+        if self.gravados:
+            diretorio = os.path.join(self.gravados, str(competicao), str(temporada))
+            if os.path.exists(os.path.join(diretorio, 'matches.json')):
+                with open(os.path.join(diretorio, 'matches.json'), encoding='utf-8') as arquivo:
+                    partidas = json.load(arquivo).get('matches', [])
+                classificacao = None
+                if os.path.exists(os.path.join(diretorio, 'standings.json')):
+                    with open(os.path.join(diretorio, 'standings.json'), encoding='utf-8') as arquivo:
+                        classificacao = json.load(arquivo)
+                dados = (partidas, classificacao)
+
+        if dados is None:
+            codigo = int(competicao) if str(competicao).isdigit() else 0
+            df = gerar_liga(
+                n_times=self.n_times, temporada_inicial=temporada,
+                semente=(self.semente, codigo, temporada),
+                partidas_agendadas=self.partidas_agendadas
+            )
+            dados = (
+                _partidas_api(df, codigo, temporada, self.preenchimento),
+                _classificacao_api(df, codigo, temporada)
+            )
+
+        with self._lock:
+            return self._payloads.setdefault(chave, dados)
+
+    def resposta(self, caminho, params):
+        """(status, cabeçalhos, corpo) para uma requisição GET, com as falhas simuladas"""
+        with self._lock:
+            self.estatisticas['requisicoes'] += 1
+            agora = time.monotonic()
+            inicio, contagem = self._janela
+            if agora - inicio >= 60:
+                inicio, contagem = agora, 0
+            contagem += 1
+            self._janela = (inicio, contagem)
+            erro = self._rng.random() < self.taxa_erro
+            status_erro = self._rng.choice(STATUS_ERRO)
+            espera = self.latencia + self._rng.uniform(0, self.variacao_latencia)
+
+        if espera > 0:
+            time.sleep(espera)
+
+        cabecalhos = {}
+        if self.limite_minuto:
+            reinicio = max(1, int(round(60 - (time.monotonic() - inicio))))
+            cabecalhos['X-Requests-Available-Minute'] = str(max(0, self.limite_minuto - contagem))
+            cabecalhos['X-RequestCounter-Reset'] = str(reinicio)
+            if contagem > self.limite_minuto:
+                cabecalhos['Retry-After'] = str(reinicio)
+                return 429, cabecalhos, {
+                    'message': f"You reached your request limit. Wait {reinicio} seconds.",
+                    'errorCode': 429
+                }
+
+        if erro:
+            return status_erro, cabecalhos, {'message': 'Erro simulado', 'errorCode': status_erro}
+
+        rota = ROTA.match(caminho)
+        if rota is None:
+            return 404, cabecalhos, {'message': 'The resource you are looking for does not exist.', 'errorCode': 404}
+
+        competicao, recurso = rota.groups()
+        temporada = params.get('season')
+        temporada = int(temporada) if temporada and temporada.isdigit() else self.temporada_padrao
+        partidas, classificacao = self._dados(competicao, temporada)
+
+        if recurso == 'standings':
+            if classificacao is None:
+                return 404, cabecalhos, {'message': 'Classificação não gravada', 'errorCode': 404}
+            return 200, cabecalhos, classificacao
+
+        partidas = _filtrar_partidas(partidas, params)
+        return 200, cabecalhos, {
+            'filters': {chave: valor for chave, valor in params.items()},
+            'resultSet': {'count': len(partidas)},
+            'competition': {'id': int(competicao) if competicao.isdigit() else competicao},
+            'matches': partidas
+        }
+
+    def registrar(self, status):
+        with self._lock:
+            respostas = self.estatisticas['respostas']
+            respostas[status] = respostas.get(status, 0) + 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, como a sessão do ClienteAPI espera
+
+    def do_GET(self):
+        mock = self.server.mock
+        url = urlsplit(self.path)
+        params = {chave: valores[-1] for chave, valores in parse_qs(url.query).items()}
+        status, cabecalhos, dados = mock.resposta(url.path, params)
+
+        corpo = json.dumps(dados, ensure_ascii=False).encode('utf-8')
+        if status == 200:
+            etag = '"' + hashlib.sha256(corpo).hexdigest()[:32] + '"'
+            cabecalhos['ETag'] = etag
+            if self.headers.get('If-None-Match') == etag:
+                status, corpo = 304, b''
+
+        mock.registrar(status)
+        self.send_response(status)
+        for nome, valor in cabecalhos.items():
+            self.send_header(nome, valor)
+        if status != 304:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.send_header('Date', datetime.now(timezone.utc).strftime('%a, %d %b %Y %H:%M:%S GMT'))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        logging.info(f"mock_api {self.address_string()} - {formato % args}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor local no lugar do football-data.org')
+    parser.add_argument('--config', default='config/config.yaml')
+    parser.add_argument('--host', default=None)
+    parser.add_argument('--porta', type=int, default=None)
+    parser.add_argument('--latencia', type=float, default=None, help='Atraso fixo de cada resposta (s)')
+    parser.add_argument('--variacao-latencia', type=float, default=None, help='Atraso aleatório extra (s)')
+    parser.add_argument('--limite-minuto', type=int, default=None, help='Requisições por minuto (0 = sem limite)')
+    parser.add_argument('--taxa-erro', type=float, default=None, help='Fração de respostas 5xx')
+    parser.add_argument('--times', type=int, default=None, help='Times por temporada nas ligas sintéticas')
+    parser.add_argument('--preenchimento', type=int, default=None,
+                        help='Bytes extras por partida, para respostas maiores')
+    parser.add_argument('--gravados', default=None, help='Diretório com payloads gravados')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    config = carregar_config(args.config)
+    config_mock = config.get('mock_api', {})
+
+    def opcao(nome, padrao):
+        valor = getattr(args, nome)
+        return valor if valor is not None else config_mock.get(nome, padrao)
+
+    servidor = ServidorFootballData(
+        host=opcao('host', '127.0.0.1'),
+        porta=opcao('porta', 8080),
+        latencia=opcao('latencia', 0.0),
+        variacao_latencia=opcao('variacao_latencia', 0.0),
+        limite_minuto=opcao('limite_minuto', 0),
+        taxa_erro=opcao('taxa_erro', 0.0),
+        n_times=opcao('times', 20),
+        partidas_agendadas=config_mock.get('partidas_agendadas', 0),
+        preenchimento=opcao('preenchimento', 0),
+        temporada_padrao=config.get('api', {}).get('temporada', 2023),
+        gravados=opcao('gravados', None)
+    )
+    print(f"Servindo em {servidor.base_url} (Ctrl+C para parar)")
+    try:
+        servidor.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.httpd.server_close()
+        print(f"Requisições: {servidor.estatisticas['requisicoes']}, "
+              f"respostas por status: {servidor.estatisticas['respostas']}")
+
+
+if __name__ == '__main__':
+    main()
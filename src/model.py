@@ -1,15 +1,103 @@
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.metrics import accuracy_score, classification_report
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import accuracy_score, classification_report, log_loss
 from sklearn.preprocessing import StandardScaler
+from sklearn.base import clone
 import numpy as np
+import pandas as pd
+import sklearn
 import joblib
+from joblib import Parallel, delayed
+import hashlib
 import logging
 import os
+import pickle
+import threading
+from datetime import datetime
+
+from . import storage
+from .inference import FlorestaCompacta, FlorestaVetorizada, podar_arvores
+from .utils import carregar_perfil
+
+# Versão do formato do artefato salvo por salvar_modelo
+VERSAO_ARTEFATO = 2
+
+
+def _assinatura_arquivo(caminho):
+    """Identifica a versão de um arquivo pelo tamanho e data de modificação"""
+    if not os.path.exists(caminho):
+        return None
+    info = os.stat(caminho)
+    return f"{info.st_size}-{info.st_mtime_ns}"
+
+
+class MatrizProbabilidades:
+    """Probabilidades pré-calculadas para todos os confrontos mandante x visitante.
+
+    `matriz` tem formato (n_times, n_times - 1, 3): a segunda dimensão lista
+    os adversários sem o próprio mandante e a terceira segue as classes do
+    modelo (0 = vitória fora, 1 = empate, 2 = vitória casa).
+    """
+
+    def __init__(self, times, matriz, assinatura):
+        self.times = list(times)
+        self.matriz = matriz
+        self.assinatura = assinatura
+        self._indice = {time: i for i, time in enumerate(self.times)}
+
+    def probabilidades(self, time_casa, time_fora):
+        """Probabilidades do confronto, na ordem de predict_proba, ou None"""
+        i = self._indice.get(time_casa)
+        j = self._indice.get(time_fora)
+        if i is None or j is None or i == j:
+            return None
+
+        probabilidades = self.matriz[i, j if j < i else j - 1]
+        if np.isnan(probabilidades).any():
+            return None
+        return probabilidades
+
+    def salvar(self, caminho):
+        # Grava em arquivo temporário e renomeia para não expor escrita parcial
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        temporario = f"{caminho}.{os.getpid()}.tmp.npz"
+        np.savez(
+            temporario,
+            times=np.array(self.times, dtype=str),
+            matriz=self.matriz,
+            assinatura=np.array(self.assinatura)
+        )
+        os.replace(temporario, caminho)
+
+    @classmethod
+    def carregar(cls, caminho):
+        with np.load(caminho) as dados:
+            return cls(dados['times'].tolist(), dados['matriz'], str(dados['assinatura']))
+
+
+def _avaliar_janela(modelo, X_treino, y_treino, X_teste, y_teste):
+    """Treina um clone do modelo em uma janela e calcula as métricas de teste"""
+    modelo = clone(modelo).fit(X_treino, y_treino)
+
+    probabilidades = np.zeros((len(y_teste), 3))
+    probabilidades[:, modelo.classes_] = modelo.predict_proba(X_teste)
+    alvo = np.eye(3)[y_teste]
+
+    return {
+        'accuracy': float(accuracy_score(y_teste, probabilidades.argmax(axis=1))),
+        'log_loss': float(log_loss(y_teste, probabilidades, labels=[0, 1, 2])),
+        'brier': float(np.mean(np.sum((probabilidades - alvo) ** 2, axis=1)))
+    }
 
 
 class BrasileiraoPredictor:
-    def __init__(self):
+    # Lotes até este tamanho usam a FlorestaVetorizada em vez do sklearn
+    LIMITE_LOTE_VETORIZADO = 256
+
+    def __init__(self, perfil=None, params=None):
+        # Estimador serializado do artefato, desserializado só quando usado
+        self._estimador_serializado = None
+
         # Usando RandomForestClassifier com configurações otimizadas
         self.model = RandomForestClassifier(
             n_estimators=500,  # Mais árvores
@@ -26,6 +114,24 @@ class BrasileiraoPredictor:
             random_state=42
         )
 
+        # Seção model.params do config.yaml; o perfil prevalece sobre ela
+        if params:
+            self.model.set_params(**params)
+
+        # Parâmetros ajustados por src/tuning.py
+        if perfil:
+            self.model.set_params(**carregar_perfil(perfil))
+
+        # Componentes do artefato: scaler e features vêm do processador
+        self.scaler = None
+        self.features = None
+        self.metadados = {}
+        self.assinatura_artefato = None
+
+        self._matriz = None
+        self._lock_matriz = threading.Lock()
+        self._floresta = None
+
         os.makedirs('logs', exist_ok=True)
         logging.basicConfig(
             filename='logs/model.log',
@@ -33,18 +139,107 @@ class BrasileiraoPredictor:
             format='%(asctime)s - %(levelname)s - %(message)s'
         )
 
-    def treinar(self, X, y):
-        """Treina o modelo"""
+    @property
+    def model(self):
+        """Estimador; o de um artefato carregado é desserializado no primeiro acesso"""
+        if self._modelo is None and self._estimador_serializado is not None:
+            self._modelo = pickle.loads(self._estimador_serializado)
+            self._estimador_serializado = None
+        return self._modelo
+
+    @model.setter
+    def model(self, modelo):
+        self._modelo = modelo
+        self._estimador_serializado = None
+
+    @property
+    def compacto(self):
+        """Se o modelo carregado veio de exportar_compacto (só serve previsões)"""
+        return isinstance(self._modelo, FlorestaCompacta)
+
+    @property
+    def classes_(self):
+        """Classes do modelo sem desserializar o estimador"""
+        if self._modelo is None and self._floresta is not None:
+            return self._floresta[2].classes_
+        return self.model.classes_
+
+    def avaliar_walk_forward(self, X, y, datas, rodadas=None, n_janelas=5, n_jobs=-1):
+        """Avaliação temporal em janelas expansivas por rodada
+
+        As rodadas (ou, sem elas, as datas) são ordenadas no tempo e divididas
+        em n_janelas + 1 blocos. Cada janela testa um bloco com um modelo
+        treinado apenas nas partidas anteriores ao início desse bloco. As
+        janelas rodam em paralelo com até n_jobs processos, cada floresta com
+        um único job, e retornam accuracy, log loss e Brier.
+        """
+        datas = pd.to_datetime(pd.Series(np.asarray(datas)), utc=True).reset_index(drop=True)
+        chaves = pd.Series(np.asarray(rodadas if rodadas is not None else datas))
+
+        # Rodadas na ordem em que começaram
+        inicio_rodada = datas.groupby(chaves).min().sort_values()
+        blocos = np.array_split(np.array(inicio_rodada.index.tolist(), dtype=object), n_janelas + 1)[1:]
+
+        janelas = []
+        tarefas = []
+        modelo = clone(self.model).set_params(n_jobs=1)
+        for numero, bloco in enumerate(blocos, start=1):
+            if len(bloco) == 0:
+                continue
+            teste = chaves.isin(bloco).to_numpy()
+            treino = (datas < datas[teste].min()).to_numpy()
+            if treino.sum() < 10 or len(np.unique(y[treino])) < 2:
+                continue
+
+            janelas.append({
+                'janela': numero,
+                'rodada_inicio': bloco[0],
+                'rodada_fim': bloco[-1],
+                'n_treino': int(treino.sum()),
+                'n_teste': int(teste.sum())
+            })
+            tarefas.append(delayed(_avaliar_janela)(modelo, X[treino], y[treino], X[teste], y[teste]))
+
+        metricas = Parallel(n_jobs=n_jobs)(tarefas)
+        for janela, resultado in zip(janelas, metricas):
+            janela.update(resultado)
+
+        resumo = {'janelas': janelas}
+        for chave in ['accuracy', 'log_loss', 'brier']:
+            valores = [janela[chave] for janela in janelas]
+            resumo[chave] = float(np.mean(valores)) if valores else None
+            resumo[f'{chave}_std'] = float(np.std(valores)) if valores else None
+
+        return resumo
+
+    def treinar(self, X, y, datas=None, rodadas=None, n_jobs=-1):
+        """Treina o modelo
+
+        O teste final usa os 20% de partidas mais recentes e a validação é
+        walk-forward por rodada (avaliar_walk_forward). Sem `datas`, assume
+        que X está em ordem cronológica e usa a posição de cada linha.
+        """
         try:
             if X is None or y is None or len(X) < 10:
                 return {'error': 'Dados insuficientes para treino'}
 
-            # Dividir dados com estratificação
+            # Validação walk-forward (modelos próprios por janela); sem
+            # nenhuma janela válida, o modelo atual não é tocado
+            ultima_data = None
+            if datas is None:
+                datas = pd.Timestamp(0) + pd.to_timedelta(np.arange(len(X)), unit='s')
+            else:
+                ultima_data = str(pd.to_datetime(pd.Series(np.asarray(datas)), utc=True).max())
+            walk_forward = self.avaliar_walk_forward(X, y, datas, rodadas, n_jobs=n_jobs)
+
+            if walk_forward['accuracy'] is None:
+                return {'error': 'Dados insuficientes para validação walk-forward'}
+
+            # Dividir dados respeitando a ordem temporal
             X_train, X_test, y_train, y_test = train_test_split(
                 X, y,
                 test_size=0.2,
-                random_state=42,
-                stratify=y
+                shuffle=False
             )
 
             # Treinar modelo
@@ -54,36 +249,54 @@ class BrasileiraoPredictor:
             y_pred = self.model.predict(X_test)
             test_accuracy = accuracy_score(y_test, y_pred)
 
-            # Validação cruzada para estabilidade
-            cv_scores = []
-            for i in range(5):  # 5 iterações com diferentes seeds
-                cv_score = cross_val_score(
-                    self.model, X, y,
-                    cv=5,
-                    scoring='accuracy',
-                    n_jobs=-1
-                )
-                cv_scores.extend(cv_score)
-
-            cv_mean = np.mean(cv_scores)
-            cv_std = np.std(cv_scores)
+            cv_mean = walk_forward['accuracy']
+            cv_std = walk_forward['accuracy_std']
 
             # Relatório detalhado
             report = classification_report(
                 y_test,
                 y_pred,
-                target_names=['Vitória Fora', 'Empate', 'Vitória Casa']
+                labels=[0, 1, 2],
+                target_names=['Vitória Fora', 'Empate', 'Vitória Casa'],
+                zero_division=0
             )
 
+            hash_dados = hashlib.sha256(
+                np.ascontiguousarray(X).tobytes() + np.ascontiguousarray(y).tobytes()
+            ).hexdigest()
+
+            self.metadados = {
+                'hash_dados': hash_dados,
+                'n_amostras': int(len(X)),
+                'ultima_data': ultima_data,
+                'linhagem': [{
+                    'tipo': 'completo',
+                    'data': datetime.now().isoformat(),
+                    'ultima_data': ultima_data,
+                    'n_amostras': int(len(X)),
+                    'n_arvores': len(self.model.estimators_),
+                    'hash_dados': hash_dados
+                }],
+                'metricas': {
+                    'test_score': float(test_accuracy),
+                    'cv_mean': cv_mean,
+                    'cv_std': cv_std,
+                    'log_loss': walk_forward['log_loss'],
+                    'brier': walk_forward['brier']
+                }
+            }
+
             # Log dos resultados
             logging.info(f"Acurácia: {test_accuracy:.4f}")
-            logging.info(f"CV média: {cv_mean:.4f} (+/- {cv_std:.4f})")
+            logging.info(f"Walk-forward: accuracy {cv_mean} (+/- {cv_std}), "
+                         f"log loss {walk_forward['log_loss']}, Brier {walk_forward['brier']}")
             logging.info(f"Relatório:\n{report}")
 
             return {
                 'test_score': test_accuracy,
                 'cv_mean': cv_mean,
                 'cv_std': cv_std,
+                'walk_forward': walk_forward,
                 'classification_report': report
             }
 
@@ -91,42 +304,505 @@ class BrasileiraoPredictor:
             logging.error(f"Erro no treino: {str(e)}")
             return {'error': str(e)}
 
+    def _motivo_refit_completo(self, n_novas, n_total, arvores_novas, max_arvores,
+                               limite_novas, max_incrementos):
+        """Retorna o motivo para refazer o treino do zero, ou None"""
+        if not hasattr(self.model, 'estimators_'):
+            return 'modelo ainda não treinado'
+        if self.scaler is None or not self.metadados.get('ultima_data'):
+            return 'artefato sem scaler ou sem data do último treino'
+        if n_novas > limite_novas * n_total:
+            return f'mais de {limite_novas:.0%} das partidas são novas'
+        if len(self.model.estimators_) + arvores_novas > max_arvores:
+            return f'floresta passaria de {max_arvores} árvores'
+
+        linhagem = self.metadados.get('linhagem', [])
+        incrementos = 0
+        for etapa in reversed(linhagem):
+            if etapa['tipo'] != 'incremental':
+                break
+            incrementos += 1
+        if incrementos >= max_incrementos:
+            return f'{incrementos} retreinos incrementais seguidos'
+
+        return None
+
+    def retreinar(self, X, y, datas, rodadas=None, arvores_novas=50, max_arvores=1000,
+                  limite_novas=0.25, max_incrementos=10, n_jobs=-1):
+        """Retreino incremental após novas partidas finalizadas
+
+        X deve ter sido normalizado com o scaler do artefato carregado
+        (preparar_dados_treino(df, scaler=self.scaler)). As partidas
+        posteriores à última data do artefato são consideradas novas e a
+        floresta ganha `arvores_novas` árvores (warm start) ajustadas em
+        todo o histórico. O treino completo (treinar) é usado quando não há
+        artefato utilizável, quando as novidades passam de `limite_novas`
+        do total, quando a floresta passaria de `max_arvores` ou após
+        `max_incrementos` retreinos incrementais seguidos.
+        """
+        if self.compacto:
+            return {'error': 'Artefato compacto não suporta retreino; faça um treino completo'}
+
+        try:
+            datas = pd.to_datetime(pd.Series(np.asarray(datas)), utc=True)
+            ultima_data = self.metadados.get('ultima_data')
+            novas = (
+                (datas > pd.Timestamp(ultima_data)).to_numpy()
+                if ultima_data else np.ones(len(y), dtype=bool)
+            )
+            n_novas = int(novas.sum())
+
+            if n_novas == 0 and ultima_data and hasattr(self.model, 'estimators_'):
+                return {'modo': 'sem_novidades', 'n_novas': 0,
+                        'n_arvores': len(self.model.estimators_)}
+
+            motivo = self._motivo_refit_completo(
+                n_novas, len(y), arvores_novas, max_arvores, limite_novas, max_incrementos
+            )
+            if motivo is not None:
+                logging.info(f"Retreino completo: {motivo}")
+                linhagem_anterior = self.metadados.get('linhagem', [])
+
+                # Volta ao tamanho de floresta do último treino completo
+                completos = [etapa for etapa in linhagem_anterior if etapa['tipo'] == 'completo']
+                if completos:
+                    self.model.set_params(n_estimators=completos[-1]['n_arvores'])
+                self.model.set_params(warm_start=False, random_state=42)
+
+                resultado = self.treinar(X, y, datas, rodadas, n_jobs=n_jobs)
+                if 'error' not in resultado:
+                    self.metadados['linhagem'] = linhagem_anterior + self.metadados['linhagem']
+                    resultado.update({'modo': 'completo', 'motivo': motivo, 'n_novas': n_novas})
+                return resultado
+
+            # Acurácia do modelo atual nas partidas novas, antes de incorporá-las
+            accuracy_novas = float(accuracy_score(y[novas], self.model.predict(X[novas])))
+
+            linhagem = list(self.metadados.get('linhagem', []))
+            n_arvores = len(self.model.estimators_) + arvores_novas
+            self.model.set_params(
+                warm_start=True,
+                n_estimators=n_arvores,
+                random_state=42 + len(linhagem),  # sementes novas para as árvores adicionadas
+                n_jobs=n_jobs
+            )
+            self.model.fit(X, y)
+            self.model.set_params(warm_start=False)
+
+            ultima_data = str(datas.max())
+            hash_dados = hashlib.sha256(
+                np.ascontiguousarray(X).tobytes() + np.ascontiguousarray(y).tobytes()
+            ).hexdigest()
+            linhagem.append({
+                'tipo': 'incremental',
+                'data': datetime.now().isoformat(),
+                'ultima_data': ultima_data,
+                'n_amostras': int(len(X)),
+                'n_novas': n_novas,
+                'n_arvores': n_arvores,
+                'hash_dados': hash_dados
+            })
+            self.metadados.update({
+                'hash_dados': hash_dados,
+                'n_amostras': int(len(X)),
+                'ultima_data': ultima_data,
+                'linhagem': linhagem
+            })
+            self.metadados.setdefault('metricas', {})['accuracy_novas'] = accuracy_novas
+
+            logging.info(f"Retreino incremental: {n_novas} partidas novas, {n_arvores} árvores, "
+                         f"acurácia nas novas {accuracy_novas:.4f}")
+
+            return {
+                'modo': 'incremental',
+                'n_novas': n_novas,
+                'n_arvores': n_arvores,
+                'accuracy_novas': accuracy_novas
+            }
+
+        except Exception as e:
+            logging.error(f"Erro no retreino: {str(e)}")
+            return {'error': str(e)}
+
     def prever(self, X):
         """Faz previsões"""
         try:
+            if self._modelo is None and self._floresta is not None:
+                return self.classes_[np.argmax(self._predict_proba(X), axis=1)]
             return self.model.predict(X)
         except Exception as e:
             logging.error(f"Erro na previsão: {str(e)}")
             return None
 
+    def _floresta_vetorizada(self):
+        """FlorestaVetorizada do modelo atual, reconstruída quando as árvores mudam
+
+        A floresta gravada no artefato vale enquanto o estimador não for
+        desserializado e, depois disso, enquanto as árvores forem as mesmas.
+        """
+        floresta = self._floresta
+        if self._modelo is None:
+            return floresta[2] if floresta is not None else None
+        if not isinstance(self._modelo, RandomForestClassifier):
+            return None
+        estimadores = getattr(self._modelo, 'estimators_', None)
+        if estimadores is None:
+            return None
+
+        if floresta is not None and floresta[0] is None and floresta[1] == len(estimadores):
+            floresta = (estimadores, len(estimadores), floresta[2])
+            self._floresta = floresta
+        if floresta is None or floresta[0] is not estimadores or floresta[1] != len(estimadores):
+            floresta = (estimadores, len(estimadores), FlorestaVetorizada.de_modelo(self._modelo))
+            self._floresta = floresta
+        return floresta[2]
+
+    def _predict_proba(self, X):
+        """predict_proba com o caminho vetorizado para lotes pequenos
+
+        Abaixo de LIMITE_LOTE_VETORIZADO linhas o custo do predict_proba do
+        sklearn é dominado pela criação do pool de threads e pela validação;
+        a FlorestaVetorizada devolve as mesmas probabilidades (dentro da
+        tolerância de ponto flutuante) sem esse custo.
+        """
+        if len(X) <= self.LIMITE_LOTE_VETORIZADO:
+            floresta = self._floresta_vetorizada()
+            if floresta is not None:
+                return floresta.predict_proba(X)
+        elif self._modelo is None and self._floresta is not None:
+            # Artefato carregado e estimador ainda serializado: lotes grandes
+            # seguem pela floresta em blocos em vez de desserializá-lo
+            floresta = self._floresta[2]
+            return np.concatenate([
+                floresta.predict_proba(X[inicio:inicio + self.LIMITE_LOTE_VETORIZADO])
+                for inicio in range(0, len(X), self.LIMITE_LOTE_VETORIZADO)
+            ])
+        return self.model.predict_proba(X)
+
     def prever_probabilidades(self, X):
         """Retorna probabilidades das previsões"""
         try:
-            return self.model.predict_proba(X)
+            return self._predict_proba(X)
         except Exception as e:
             logging.error(f"Erro no cálculo de probabilidades: {str(e)}")
             return None
 
-    def salvar_modelo(self, caminho='models/brasileirao_predictor.joblib'):
-        """Salva o modelo treinado"""
+    def prever_partidas(self, processor, df, partidas=None):
+        """Probabilidades de várias partidas com uma única chamada a predict_proba
+
+        Sem `partidas`, prevê todos os jogos SCHEDULED/TIMED de `df`. Retorna
+        as partidas com as colunas prob_casa, prob_empate e prob_fora.
+        """
+        try:
+            X, partidas = processor.preparar_dados_predicao_lote(df, partidas, scaler=self.scaler)
+            if X is None:
+                return None
+
+            probabilidades = self._predict_proba(X)
+            classes = list(self.classes_)
+
+            resultado = partidas.copy()
+            resultado['prob_casa'] = probabilidades[:, classes.index(2)]
+            resultado['prob_empate'] = probabilidades[:, classes.index(1)]
+            resultado['prob_fora'] = probabilidades[:, classes.index(0)]
+            return resultado
+        except Exception as e:
+            logging.error(f"Erro na previsão em lote: {str(e)}")
+            return None
+
+    def calcular_matriz_probabilidades(self, processor, df):
+        """Calcula as probabilidades de todos os confrontos entre os times atuais"""
+        atuais = df
+        if 'temporada' in df.columns and not df.empty:
+            atuais = df[df['temporada'] == df['temporada'].max()]
+        times = sorted(set(atuais['time_casa']) | set(atuais['time_fora']))
+        n_times = len(times)
+
+        pares = [(casa, fora) for casa in times for fora in times if casa != fora]
+        previsoes = self.prever_partidas(processor, df, pares)
+
+        matriz = np.full((n_times, max(n_times - 1, 0), 3), np.nan)
+        if previsoes is not None and not previsoes.empty:
+            indice = {time: i for i, time in enumerate(times)}
+            i = previsoes['time_casa'].map(indice).to_numpy()
+            j = previsoes['time_fora'].map(indice).to_numpy()
+            j = np.where(j < i, j, j - 1)
+            matriz[i, j, 0] = previsoes['prob_fora'].to_numpy()
+            matriz[i, j, 1] = previsoes['prob_empate'].to_numpy()
+            matriz[i, j, 2] = previsoes['prob_casa'].to_numpy()
+
+        return times, matriz
+
+    def obter_matriz_probabilidades(self, processor, df,
+                                    caminho_dados=None,
+                                    caminho_modelo='models/brasileirao_predictor.joblib'):
+        """Matriz de probabilidades pronta para consulta
+
+        A matriz fica salva ao lado do modelo e é reconstruída quando os
+        arquivos de partidas (`caminho_dados` ou, por padrão, as partições do
+        armazenamento) ou o artefato do modelo em memória mudam. Se nenhum
+        artefato foi carregado ainda, carrega o de `caminho_modelo`.
+        """
+        if self.assinatura_artefato is None and not self.carregar_modelo(caminho_modelo):
+            return None
+
+        dados = _assinatura_arquivo(caminho_dados) if caminho_dados else storage.assinatura_partidas()
+        assinatura = f"{dados}|{self.assinatura_artefato}"
+        if self._matriz is not None and self._matriz.assinatura == assinatura:
+            return self._matriz
+
+        caminho_matriz = os.path.splitext(caminho_modelo)[0] + '_matriz.npz'
+
+        with self._lock_matriz:
+            if self._matriz is not None and self._matriz.assinatura == assinatura:
+                return self._matriz
+
+            try:
+                if os.path.exists(caminho_matriz):
+                    matriz = MatrizProbabilidades.carregar(caminho_matriz)
+                    if matriz.assinatura == assinatura:
+                        self._matriz = matriz
+                        return matriz
+
+                times, valores = self.calcular_matriz_probabilidades(processor, df)
+                matriz = MatrizProbabilidades(times, valores, assinatura)
+                matriz.salvar(caminho_matriz)
+                logging.info(f"Matriz de probabilidades salva em: {caminho_matriz}")
+
+                self._matriz = matriz
+                return matriz
+            except Exception as e:
+                logging.error(f"Erro ao obter matriz de probabilidades: {str(e)}")
+                return None
+
+    def salvar_modelo(self, caminho='models/brasileirao_predictor.joblib', scaler=None, features=None):
+        """Salva o artefato do modelo
+
+        O arquivo reúne o estimador, o scaler ajustado, a lista de features e
+        os metadados do treino (hash dos dados e métricas), de modo que outro
+        processo consiga prever sem retreinar. É gravado sem compressão para
+        permitir carregamento com mmap_mode.
+
+        As previsões são servidas pela FlorestaVetorizada, gravada como arrays
+        NumPy simples. O estimador do sklearn vai serializado em um array de
+        bytes e só é desserializado para retreinar: a árvore do sklearn copia
+        seus arrays ao ser desserializada, então não os compartilharia.
+        """
         try:
+            if scaler is not None:
+                self.scaler = scaler
+            if features is not None:
+                self.features = list(features)
+
+            modelo = self.model
+            artefato = {
+                'versao': VERSAO_ARTEFATO,
+                'estimador': np.frombuffer(
+                    pickle.dumps(modelo, protocol=pickle.HIGHEST_PROTOCOL), dtype=np.uint8
+                ),
+                'floresta': (
+                    self._floresta_vetorizada().para_dict()
+                    if hasattr(modelo, 'estimators_') else None
+                ),
+                'scaler': self.scaler,
+                'features': self.features,
+                'metadados': {
+                    **self.metadados,
+                    'criado_em': datetime.now().isoformat(),
+                    'sklearn': sklearn.__version__
+                }
+            }
+
             os.makedirs(os.path.dirname(caminho), exist_ok=True)
-            joblib.dump(self.model, caminho)
+            temporario = f"{caminho}.{os.getpid()}.tmp"
+            joblib.dump(artefato, temporario)
+            os.replace(temporario, caminho)
+            self.metadados = artefato['metadados']
+            self.assinatura_artefato = _assinatura_arquivo(caminho)
             logging.info(f"Modelo salvo em: {caminho}")
             return True
         except Exception as e:
             logging.error(f"Erro ao salvar modelo: {str(e)}")
             return False
 
-    def carregar_modelo(self, caminho='models/brasileirao_predictor.joblib'):
-        """Carrega um modelo salvo"""
+    def exportar_compacto(self, caminho='models/brasileirao_predictor_compacto.joblib',
+                          X_validacao=None, y_validacao=None, bits=8, tolerancia_poda=None,
+                          min_arvores=50, X_poda=None, y_poda=None):
+        """Exporta o modelo em forma compacta (FlorestaCompacta)
+
+        Com `tolerancia_poda`, remove as árvores cuja retirada não aumenta o
+        log loss em (X_poda, y_poda) além da tolerância, mantendo pelo menos
+        `min_arvores`. Sem dados de poda próprios, a metade mais antiga de
+        (X_validacao, y_validacao), em ordem cronológica, é usada na poda e
+        só a mais recente entra no relatório, para que as diferenças de
+        acurácia e log loss sejam medidas em partidas que a poda não viu. O
+        relatório da compactação (redução de tamanho e, havendo dados de
+        validação, essas diferenças) é gravado nos metadados e retornado.
+        """
+        try:
+            arvores = None
+            if tolerancia_poda is not None:
+                if X_poda is None or y_poda is None:
+                    if X_validacao is None or y_validacao is None or len(X_validacao) < 2:
+                        return {'error': 'Poda requer dados de validação'}
+                    meio = len(X_validacao) // 2
+                    X_poda, y_poda = X_validacao[:meio], y_validacao[:meio]
+                    X_validacao, y_validacao = X_validacao[meio:], y_validacao[meio:]
+                arvores = podar_arvores(
+                    FlorestaVetorizada.de_modelo(self.model), X_poda, y_poda, tolerancia_poda, min_arvores
+                )
+
+            compacta = FlorestaCompacta.de_modelo(self.model, bits=bits, arvores=arvores)
+
+            bytes_memoria_original = sum(
+                estimador.tree_.__getstate__()['nodes'].nbytes + estimador.tree_.value.nbytes
+                for estimador in self.model.estimators_
+            )
+            relatorio = {
+                'bits': bits,
+                'tolerancia_poda': tolerancia_poda,
+                'arvores_originais': len(self.model.estimators_),
+                'arvores_mantidas': compacta.n_estimators,
+                'bytes_original': len(pickle.dumps(self.model, protocol=pickle.HIGHEST_PROTOCOL)),
+                'bytes_memoria_original': int(bytes_memoria_original),
+                'bytes_memoria_compacta': int(compacta.nbytes),
+                'amostras_poda': int(len(y_poda)) if arvores is not None else 0
+            }
+
+            if X_validacao is not None and y_validacao is not None:
+                classes = list(self.model.classes_)
+                y_indices = np.array([classes.index(classe) for classe in y_validacao])
+                original = self.model.predict_proba(X_validacao)
+                reduzida = compacta.predict_proba(X_validacao)
+                relatorio.update({
+                    'amostras_validacao': int(len(y_validacao)),
+                    'accuracy_original': float(np.mean(np.argmax(original, axis=1) == y_indices)),
+                    'accuracy_compacta': float(np.mean(np.argmax(reduzida, axis=1) == y_indices)),
+                    'log_loss_original': float(log_loss(y_validacao, original, labels=classes)),
+                    'log_loss_compacta': float(log_loss(y_validacao, reduzida, labels=classes))
+                })
+                relatorio['delta_accuracy'] = relatorio['accuracy_compacta'] - relatorio['accuracy_original']
+                relatorio['delta_log_loss'] = relatorio['log_loss_compacta'] - relatorio['log_loss_original']
+
+            artefato = {
+                'versao': VERSAO_ARTEFATO,
+                'formato': 'compacto',
+                'floresta': compacta.para_dict(),
+                'scaler': self.scaler,
+                'features': self.features,
+                'metadados': {
+                    **self.metadados,
+                    'criado_em': datetime.now().isoformat(),
+                    'sklearn': sklearn.__version__
+                }
+            }
+
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            temporario = f"{caminho}.{os.getpid()}.tmp"
+            # Tamanho final só é conhecido depois de gravar
+            joblib.dump(artefato, temporario)
+            relatorio['bytes_compacto'] = os.path.getsize(temporario)
+            relatorio['reducao'] = 1 - relatorio['bytes_compacto'] / relatorio['bytes_original']
+            artefato['metadados']['compactacao'] = relatorio
+            joblib.dump(artefato, temporario)
+            os.replace(temporario, caminho)
+
+            logging.info(f"Modelo compacto salvo em: {caminho} ({relatorio})")
+            return relatorio
+
+        except Exception as e:
+            logging.error(f"Erro ao exportar modelo compacto: {str(e)}")
+            return {'error': str(e)}
+
+    def carregar_modelo(self, caminho='models/brasileirao_predictor.joblib', mmap_mode='r'):
+        """Carrega um modelo salvo
+
+        Com mmap_mode='r' os arrays da floresta (vetorizada ou compacta) são
+        mapeados do disco e servem as previsões direto do mapeamento, de modo
+        que processos que carregam o mesmo arquivo compartilham essas páginas.
+        O estimador do sklearn só é desserializado (em memória própria) quando
+        usado, por exemplo para retreinar. Artefatos antigos, que contêm o
+        estimador em si, continuam sendo aceitos, assim como os compactos de
+        exportar_compacto, que servem previsões mas não podem ser retreinados.
+        """
         try:
             if os.path.exists(caminho):
-                self.model = joblib.load(caminho)
+                assinatura = _assinatura_arquivo(caminho)
+                artefato = joblib.load(caminho, mmap_mode=mmap_mode)
+                if isinstance(artefato, dict) and artefato.get('formato') == 'compacto':
+                    self.model = FlorestaCompacta.de_dict(artefato['floresta'])
+                    self.scaler = artefato.get('scaler')
+                    self.features = artefato.get('features')
+                    self.metadados = artefato.get('metadados', {})
+                    relatorio = self.metadados.get('compactacao', {})
+                    logging.info(
+                        f"Modelo compacto: {relatorio.get('arvores_mantidas')} árvores, "
+                        f"redução de {relatorio.get('reducao', 0):.1%}, "
+                        f"delta de acurácia {relatorio.get('delta_accuracy')}"
+                    )
+                elif isinstance(artefato, dict) and 'estimador' in artefato:
+                    self.model = None
+                    self._estimador_serializado = artefato['estimador']
+                    self.scaler = artefato.get('scaler')
+                    self.features = artefato.get('features')
+                    self.metadados = artefato.get('metadados', {})
+                elif isinstance(artefato, dict) and 'modelo' in artefato:
+                    self.model = artefato['modelo']
+                    self.scaler = artefato.get('scaler')
+                    self.features = artefato.get('features')
+                    self.metadados = artefato.get('metadados', {})
+                else:
+                    self.model = artefato
+                self._floresta = None
+                if isinstance(artefato, dict) and 'estimador' in artefato and artefato.get('floresta'):
+                    floresta = FlorestaVetorizada.de_dict(artefato['floresta'])
+                    self._floresta = (None, floresta.n_estimators, floresta)
+                self.assinatura_artefato = assinatura
+                self._matriz = None
                 logging.info(f"Modelo carregado de: {caminho}")
                 return True
             logging.error(f"Arquivo de modelo não encontrado: {caminho}")
             return False
         except Exception as e:
             logging.error(f"Erro ao carregar modelo: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+
+
+class ModeloCompartilhado:
+    """Mantém um único BrasileiraoPredictor carregado por processo.
+
+    A cada obter() compara tamanho e data de modificação do artefato; quando
+    o arquivo muda, um novo preditor é carregado por completo e só então
+    substitui o anterior. Quem já obteve o preditor antigo continua usando
+    o mesmo objeto até o fim da previsão.
+    """
+
+    def __init__(self, caminho='models/brasileirao_predictor.joblib'):
+        self.caminho = caminho
+        self._estado = (None, None)  # (assinatura, preditor), trocados juntos
+        self._lock = threading.Lock()
+
+    def obter(self):
+        """Retorna o preditor atual, recarregando-o se o artefato mudou"""
+        assinatura = _assinatura_arquivo(self.caminho)
+        atual, preditor = self._estado
+        if assinatura == atual:
+            return preditor
+
+        with self._lock:
+            atual, preditor = self._estado
+            if assinatura == atual:
+                return preditor
+
+            if assinatura is None:
+                self._estado = (None, None)
+                return None
+
+            novo = BrasileiraoPredictor()
+            if not novo.carregar_modelo(self.caminho):
+                # Mantém o modelo anterior se o novo arquivo não pôde ser lido
+                return preditor
+
+            self._estado = (novo.assinatura_artefato, novo)
+            logging.info(f"Modelo recarregado de: {self.caminho}")
+            return novo
@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+import logging
+import os
+
+from .standings import BrasileiraoStandings
+
+
+def _simular_lote(base, casa, fora, cdf, largura, n_simulacoes, semente):
+    """Simula `n_simulacoes` temporadas e conta as posições finais
+
+    `cdf` tem uma linha por partida restante com a distribuição acumulada
+    dos placares (largura = max_gols + 1 colunas por time). Retorna a
+    matriz (times x posições) com o número de vezes que cada time terminou
+    em cada posição.
+    """
+    rng = np.random.default_rng(semente)
+    n_partidas = len(cdf)
+    n_times = len(base['pontos'])
+
+    # Placar de cada partida por busca na sua cdf; os sorteios de uma
+    # partida ficam contíguos (partidas x simulações)
+    sorteio = rng.random((n_partidas, n_simulacoes))
+    celula = np.empty((n_partidas, n_simulacoes), dtype=np.int64)
+    for partida in range(n_partidas):
+        celula[partida] = np.searchsorted(cdf[partida], sorteio[partida], side='right')
+    celula = celula.T
+    gols_casa = (celula // largura).astype(np.float32)
+    gols_fora = (celula % largura).astype(np.float32)
+
+    vitoria_casa = (gols_casa > gols_fora).astype(np.float32)
+    vitoria_fora = (gols_casa < gols_fora).astype(np.float32)
+    empate = 1 - vitoria_casa - vitoria_fora
+
+    # Partidas x times: soma por time como produto de matrizes
+    partidas = np.arange(n_partidas)
+    mandante = np.zeros((n_partidas, n_times), dtype=np.float32)
+    mandante[partidas, casa] = 1
+    visitante = np.zeros((n_partidas, n_times), dtype=np.float32)
+    visitante[partidas, fora] = 1
+
+    def somar(valor_casa, valor_fora):
+        return valor_casa @ mandante + valor_fora @ visitante
+
+    pontos = base['pontos'] + somar(3 * vitoria_casa + empate, 3 * vitoria_fora + empate)
+    vitorias = base['vitorias'] + somar(vitoria_casa, vitoria_fora)
+    saldo = base['saldo_gols'] + somar(gols_casa - gols_fora, gols_fora - gols_casa)
+    gols_pro = base['gols_pro'] + somar(gols_casa, gols_fora)
+
+    # Desempate: pontos, vitórias, saldo, gols pró e, por fim, sorteio
+    chave = (
+        ((pontos.astype(np.int64) * 64 + vitorias.astype(np.int64)) * 1024
+         + np.clip(saldo.astype(np.int64) + 512, 0, 1023)) * 512
+        + np.clip(gols_pro.astype(np.int64), 0, 511)
+    ) * 2 ** 20 + rng.integers(0, 2 ** 20, size=pontos.shape)
+    ordem = np.argsort(-chave, axis=1)
+
+    posicoes = np.empty_like(ordem)
+    np.put_along_axis(posicoes, ordem, np.arange(n_times)[None, :], axis=1)
+    indice = np.arange(n_times)[None, :] * n_times + posicoes
+    return np.bincount(indice.ravel(), minlength=n_times * n_times).reshape(n_times, n_times)
+
+
+class BrasileiraoSimulador:
+    """Simulação Monte Carlo do restante da temporada atual.
+
+    Parte da classificação atual (partidas FINISHED da temporada mais
+    recente) e sorteia o placar de cada partida restante a partir de uma
+    fonte de probabilidades: BrasileiraoGoalsModel (grade de placares) ou
+    BrasileiraoPredictor (vitória/empate/derrota; o placar sorteado é 1x0,
+    0x0 ou 0x1, então saldo e gols pró variam só pelo resultado). As
+    temporadas são simuladas em lotes NumPy distribuídos em processos.
+    """
+
+    # Zonas da tabela (posições, base 1; negativas contam a partir do fim)
+    ZONAS = {
+        'titulo': (1, 1),
+        'libertadores': (1, 6),
+        'sul_americana': (7, 12),
+        'rebaixamento': (-4, -1)
+    }
+
+    def __init__(self, df):
+        atual = df
+        if 'temporada' in df.columns and not df.empty:
+            atual = df[df['temporada'] == df['temporada'].max()]
+        self.df = df
+        self.partidas_atuais = atual
+
+        classificacao = BrasileiraoStandings(atual)
+        self.times = classificacao.times
+        self._indice_time = {time: i for i, time in enumerate(self.times)}
+
+        self.base = {}
+        for chave in ('pontos', 'vitorias', 'saldo_gols', 'gols_pro'):
+            valores = getattr(classificacao, chave)
+            self.base[chave] = (
+                valores[-1].astype(np.float64) if len(valores) else np.zeros(len(self.times))
+            )
+
+        self.restantes = atual[atual['status'] != 'FINISHED'].reset_index(drop=True)
+        self.distribuicao = None
+
+        os.makedirs('logs', exist_ok=True)
+        logging.basicConfig(
+            filename='logs/model.log',
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s'
+        )
+
+    def _frequencias_resultados(self):
+        """Frequência de (vitória fora, empate, vitória casa) nas partidas finalizadas"""
+        finalizadas = self.df[self.df['status'] == 'FINISHED']
+        if finalizadas.empty:
+            return np.array([1 / 3, 1 / 3, 1 / 3])
+        contagem = finalizadas['vencedor'].value_counts()
+        frequencias = np.array([
+            contagem.get('AWAY_TEAM', 0), contagem.get('DRAW', 0), contagem.get('HOME_TEAM', 0)
+        ], dtype=np.float64)
+        return frequencias / frequencias.sum()
+
+    def distribuicao_placares(self, fonte, processor=None):
+        """Probabilidades de placar das partidas restantes: (cdf, largura)
+
+        Com um modelo de gols usa a grade completa; com o preditor, coloca
+        as probabilidades de vitória/empate/derrota nos placares 1x0, 0x0 e
+        0x1. Partidas que a fonte não consegue prever recebem a frequência
+        histórica de cada resultado.
+        """
+        partidas = self.restantes[['time_casa', 'time_fora']]
+
+        if hasattr(fonte, 'prever_placares'):
+            grade = fonte.prever_placares(partidas)
+            largura = grade.shape[1]
+            probabilidades = grade.reshape(len(partidas), largura * largura)
+        else:
+            largura = 2
+            resultados = np.tile(self._frequencias_resultados(), (len(partidas), 1))
+            previsoes = fonte.prever_partidas(processor, self.df, partidas)
+            if previsoes is not None and not previsoes.empty:
+                chave = list(zip(partidas['time_casa'], partidas['time_fora']))
+                previstas = {
+                    (casa, fora): (p_fora, p_empate, p_casa)
+                    for casa, fora, p_fora, p_empate, p_casa in zip(
+                        previsoes['time_casa'], previsoes['time_fora'],
+                        previsoes['prob_fora'], previsoes['prob_empate'], previsoes['prob_casa']
+                    )
+                }
+                for i, par in enumerate(chave):
+                    if par in previstas:
+                        resultados[i] = previstas[par]
+
+            # Grade 2x2 (gols casa x gols fora): 0x0, 0x1, 1x0
+            probabilidades = np.zeros((len(partidas), 4))
+            probabilidades[:, 0] = resultados[:, 1]
+            probabilidades[:, 1] = resultados[:, 0]
+            probabilidades[:, 2] = resultados[:, 2]
+
+        cdf = np.cumsum(probabilidades / probabilidades.sum(axis=1, keepdims=True), axis=1)
+        cdf[:, -1] = 1.0
+        return cdf, largura
+
+    def simular(self, fonte, processor=None, n_simulacoes=100_000, tamanho_lote=10_000,
+                n_jobs=-1, semente=42):
+        """Simula o restante da temporada e retorna as chances por time
+
+        Retorna um DataFrame com posição média e probabilidade de cada zona
+        (título, Libertadores, Sul-Americana, rebaixamento). A distribuição
+        completa de posições (times x posições) fica em self.distribuicao.
+        """
+        try:
+            cdf, largura = self.distribuicao_placares(fonte, processor)
+            casa = self.restantes['time_casa'].map(self._indice_time).to_numpy()
+            fora = self.restantes['time_fora'].map(self._indice_time).to_numpy()
+
+            lotes = [tamanho_lote] * (n_simulacoes // tamanho_lote)
+            if n_simulacoes % tamanho_lote:
+                lotes.append(n_simulacoes % tamanho_lote)
+            sementes = np.random.SeedSequence(semente).spawn(len(lotes))
+
+            contagens = Parallel(n_jobs=n_jobs)(
+                delayed(_simular_lote)(self.base, casa, fora, cdf, largura, n, s)
+                for n, s in zip(lotes, sementes)
+            )
+            self.distribuicao = sum(contagens) / n_simulacoes
+
+            resultado = pd.DataFrame({
+                'time': self.times,
+                'pontos': self.base['pontos'].astype(np.int64),
+                'posicao_media': self.distribuicao @ np.arange(1, len(self.times) + 1)
+            })
+            n_times = len(self.times)
+            for zona, (inicio, fim) in self.ZONAS.items():
+                if inicio < 0:
+                    inicio, fim = n_times + inicio + 1, n_times + fim + 1
+                resultado[zona] = self.distribuicao[:, inicio - 1:fim].sum(axis=1)
+
+            logging.info(
+                f"Simulação concluída: {n_simulacoes} temporadas, "
+                f"{len(self.restantes)} partidas restantes"
+            )
+            return resultado.sort_values('posicao_media').reset_index(drop=True)
+
+        except Exception as e:
+            logging.error(f"Erro na simulação da temporada: {str(e)}")
+            return None
@@ -0,0 +1,218 @@
+import pandas as pd
+import numpy as np
+
+
+def _para_ns(datas):
+    """Converte datas (strings, Timestamps ou Series) para inteiros em ns UTC"""
+    return pd.DatetimeIndex(pd.to_datetime(datas, utc=True)).as_unit('ns').asi8
+
+
+class BrasileiraoStandings:
+    """Classificação ponto a ponto derivada dos resultados das partidas.
+
+    A tabela é recalculada após cada horário de jogo e guardada em arrays
+    densos (horários x times). Cada consulta por (time, data) devolve a
+    classificação com os jogos estritamente anteriores à data. Entre duas
+    temporadas vale a tabela final da temporada anterior.
+    """
+
+    COLUNAS = [
+        'posicao', 'time', 'pontos', 'jogos', 'vitorias', 'empates',
+        'derrotas', 'gols_pro', 'gols_contra', 'saldo_gols'
+    ]
+
+    def __init__(self, df):
+        if 'temporada' in df.columns:
+            temporadas = df['temporada'].to_numpy()
+        else:
+            temporadas = np.zeros(len(df), dtype=np.int64)
+
+        time_casa = df['time_casa'].to_numpy()
+        time_fora = df['time_fora'].to_numpy()
+
+        # Partidas ainda sem time definido (nome nulo) não entram na tabela
+        self.times = np.array(
+            sorted(time for time in set(time_casa) | set(time_fora) if isinstance(time, str)), dtype=object
+        )
+        self._indice_time = {time: i for i, time in enumerate(self.times)}
+        n_times = len(self.times)
+
+        idx_casa = np.array([self._indice_time.get(t, -1) for t in time_casa], dtype=np.int64)
+        idx_fora = np.array([self._indice_time.get(t, -1) for t in time_fora], dtype=np.int64)
+
+        finalizada = (df['status'] == 'FINISHED').to_numpy()
+        datas = _para_ns(df['data'][finalizada])
+
+        # Um snapshot por horário de jogo distinto
+        self.datas, snapshot = np.unique(datas, return_inverse=True)
+        n_snapshots = len(self.datas)
+
+        casa = idx_casa[finalizada]
+        fora = idx_fora[finalizada]
+        gols_casa = df['gols_casa'].to_numpy()[finalizada].astype(np.int64)
+        gols_fora = df['gols_fora'].to_numpy()[finalizada].astype(np.int64)
+        vencedor = df['vencedor'].to_numpy()[finalizada]
+
+        self.temporadas = np.zeros(n_snapshots, dtype=temporadas.dtype)
+        self.temporadas[snapshot] = temporadas[finalizada]
+
+        def acumular(valores_casa, valores_fora):
+            incremento = np.zeros((n_snapshots, n_times), dtype=np.int64)
+            np.add.at(incremento, (snapshot, casa), valores_casa)
+            np.add.at(incremento, (snapshot, fora), valores_fora)
+            return incremento
+
+        vitoria_casa = (vencedor == 'HOME_TEAM').astype(np.int64)
+        vitoria_fora = (vencedor == 'AWAY_TEAM').astype(np.int64)
+        empate = (vencedor == 'DRAW').astype(np.int64)
+
+        incrementos = {
+            'jogos': acumular(1, 1),
+            'vitorias': acumular(vitoria_casa, vitoria_fora),
+            'empates': acumular(empate, empate),
+            'derrotas': acumular(vitoria_fora, vitoria_casa),
+            'gols_pro': acumular(gols_casa, gols_fora),
+            'gols_contra': acumular(gols_fora, gols_casa)
+        }
+
+        # Soma acumulada reiniciada a cada temporada
+        inicio = np.r_[True, self.temporadas[1:] != self.temporadas[:-1]] if n_snapshots else np.array([], dtype=bool)
+        bloco = np.cumsum(inicio) - 1
+        primeiro = np.flatnonzero(inicio)
+
+        acumulados = {}
+        for chave, incremento in incrementos.items():
+            total = np.cumsum(incremento, axis=0)
+            base = np.vstack([np.zeros((1, n_times), dtype=np.int64), total])[primeiro][bloco]
+            acumulados[chave] = (total - base).astype(np.int16)
+
+        self.jogos = acumulados['jogos']
+        self.vitorias = acumulados['vitorias']
+        self.empates = acumulados['empates']
+        self.derrotas = acumulados['derrotas']
+        self.gols_pro = acumulados['gols_pro']
+        self.gols_contra = acumulados['gols_contra']
+        self.pontos = (self.vitorias * 3 + self.empates).astype(np.int16)
+        self.saldo_gols = (self.gols_pro - self.gols_contra).astype(np.int16)
+
+        # Só entram na tabela os times que já jogaram na temporada até o snapshot
+        self.participa = self.jogos > 0
+
+        # Critérios de desempate: pontos, vitórias, saldo, gols pró e nome
+        chaves = np.stack([
+            np.broadcast_to(np.arange(n_times), (n_snapshots, n_times)),
+            -self.gols_pro.astype(np.int64),
+            -self.saldo_gols.astype(np.int64),
+            -self.vitorias.astype(np.int64),
+            -self.pontos.astype(np.int64),
+            ~self.participa
+        ])
+        ordem = np.lexsort(chaves, axis=-1)
+
+        self.posicoes = np.zeros((n_snapshots, n_times), dtype=np.int16)
+        np.put_along_axis(
+            self.posicoes, ordem,
+            np.broadcast_to(np.arange(1, n_times + 1, dtype=np.int16), (n_snapshots, n_times)),
+            axis=1
+        )
+        self.posicoes[~self.participa] = 0
+
+    @staticmethod
+    def posicoes_finais(tabela):
+        """Posições na tabela mais recente, sem montar os snapshots
+
+        `tabela` é uma MatchTable; retorna um array int16 indexado pelo
+        código do time, com 0 para quem não jogou na temporada da última
+        partida finalizada. Equivale a posicao(time) sem data, com os mesmos
+        critérios de desempate, mas acumula só essa temporada.
+        """
+        n_times = len(tabela.times)
+        posicoes = np.zeros(n_times, dtype=np.int16)
+        finalizadas = np.flatnonzero(tabela.finalizada)
+        if len(finalizadas) == 0:
+            return posicoes
+
+        datas = tabela.data[finalizadas]
+        ultima = finalizadas[np.flatnonzero(datas == datas.max())[-1]]
+        linhas = finalizadas[tabela.temporada[finalizadas] == tabela.temporada[ultima]]
+
+        casa = tabela.casa[linhas]
+        fora = tabela.fora[linhas]
+        gols_casa = tabela.gols_casa[linhas].astype(np.int64)
+        gols_fora = tabela.gols_fora[linhas].astype(np.int64)
+        resultado = tabela.resultado[linhas]
+
+        def somar(valores_casa, valores_fora):
+            return (np.bincount(casa, weights=valores_casa, minlength=n_times)
+                    + np.bincount(fora, weights=valores_fora, minlength=n_times)).astype(np.int64)
+
+        uns = np.ones(len(linhas))
+        vitoria_casa = (resultado == 2).astype(np.int64)
+        vitoria_fora = (resultado == 0).astype(np.int64)
+        empate = (resultado == 1).astype(np.int64)
+
+        jogos = somar(uns, uns)
+        vitorias = somar(vitoria_casa, vitoria_fora)
+        empates = somar(empate, empate)
+        gols_pro = somar(gols_casa, gols_fora)
+        gols_contra = somar(gols_fora, gols_casa)
+        pontos = vitorias * 3 + empates
+        participa = jogos > 0
+
+        # Mesmos critérios de desempate do construtor
+        ordem = np.lexsort((
+            np.arange(n_times), -gols_pro, -(gols_pro - gols_contra), -vitorias, -pontos, ~participa
+        ))
+        posicoes[ordem] = np.arange(1, n_times + 1)
+        posicoes[~participa] = 0
+        return posicoes
+
+    def _snapshot(self, data=None):
+        """Índice do último snapshot estritamente anterior à data (-1 se nenhum)"""
+        if data is None:
+            return len(self.datas) - 1
+        return int(self.snapshots([data])[0])
+
+    def snapshots(self, datas):
+        """Versão vetorizada de _snapshot para uma sequência de datas"""
+        return np.searchsorted(self.datas, _para_ns(datas), side='left') - 1
+
+    def posicao(self, time, data=None, snapshot=None):
+        """Posição do time antes da data informada (ou na tabela mais recente)
+
+        `snapshot` permite reaproveitar um índice já obtido por snapshots().
+        """
+        if snapshot is None:
+            snapshot = self._snapshot(data)
+        indice = self._indice_time.get(time)
+        if indice is None:
+            return None
+        return self.posicao_codigo(indice, snapshot)
+
+    def posicao_codigo(self, indice, snapshot):
+        """Posição pelo índice do time em self.times (o código de MatchTable)"""
+        if snapshot < 0 or not self.participa[snapshot, indice]:
+            return None
+        return int(self.posicoes[snapshot, indice])
+
+    def tabela(self, data=None):
+        """Tabela de classificação no formato de data/classificacao.csv"""
+        snapshot = self._snapshot(data)
+        if snapshot < 0:
+            return None
+
+        membros = self.participa[snapshot]
+        tabela = pd.DataFrame({
+            'posicao': self.posicoes[snapshot, membros].astype(np.int64),
+            'time': self.times[membros],
+            'pontos': self.pontos[snapshot, membros].astype(np.int64),
+            'jogos': self.jogos[snapshot, membros].astype(np.int64),
+            'vitorias': self.vitorias[snapshot, membros].astype(np.int64),
+            'empates': self.empates[snapshot, membros].astype(np.int64),
+            'derrotas': self.derrotas[snapshot, membros].astype(np.int64),
+            'gols_pro': self.gols_pro[snapshot, membros].astype(np.int64),
+            'gols_contra': self.gols_contra[snapshot, membros].astype(np.int64),
+            'saldo_gols': self.saldo_gols[snapshot, membros].astype(np.int64)
+        })
+
+        return tabela.sort_values('posicao').reset_index(drop=True)[self.COLUNAS]
@@ -0,0 +1,251 @@
+"""Armazenamento colunar e tipado das partidas e da classificação.
+
+As partidas ficam em uma partição por temporada,
+data/partidas/<competição>/<temporada>.<formato>, com times e status como
+categorias, gols em int8, rodada/temporada em int16 e a data como timestamp
+UTC. O formato padrão é Parquet, que exige o pyarrow (dependência
+opcional); sem ele, as partições são gravadas em CSV e tipadas na leitura.
+Toda escrita vai para um arquivo temporário renomeado atomicamente, então
+quem está lendo nunca vê um arquivo pela metade. Com `storage.sqlite`
+configurado, as escritas também são espelhadas no banco de
+src/match_store.py.
+"""
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import match_store
+from .utils import carregar_config
+
+try:
+    import pyarrow  # noqa: F401
+    FORMATO_PADRAO = 'parquet'
+except ImportError:
+    FORMATO_PADRAO = 'csv'
+
+# Se o aviso de formato sem pyarrow já foi registrado neste processo
+_aviso_formato = False
+
+DIRETORIO_PARTIDAS = 'data/partidas'
+CAMINHO_CLASSIFICACAO = 'data/classificacao'
+
+# Exportações CSV legadas (notebooks e ferramentas externas)
+CSV_PARTIDAS = 'data/brasileirao_matches.csv'
+CSV_CLASSIFICACAO = 'data/classificacao.csv'
+
+COLUNAS_PARTIDAS = [
+    'id', 'rodada', 'data', 'status', 'time_casa', 'time_fora',
+    'gols_casa', 'gols_fora', 'vencedor', 'temporada'
+]
+
+EXTENSOES = {'parquet': '.parquet', 'feather': '.feather', 'csv': '.csv'}
+
+
+def configuracao():
+    """Seção `storage` do config.yaml, com competição e formato resolvidos"""
+    try:
+        config = carregar_config()
+    except FileNotFoundError:
+        config = {}
+    global _aviso_formato
+    storage = dict(config.get('storage') or {})
+    formato = storage.get('formato') or FORMATO_PADRAO
+    if formato != 'csv' and FORMATO_PADRAO == 'csv':
+        if not _aviso_formato:
+            logging.warning(f"storage.formato '{formato}' exige o pyarrow, que não está instalado; usando CSV")
+            _aviso_formato = True
+        formato = 'csv'
+    storage['formato'] = formato
+    storage.setdefault('exportar_csv', False)
+    storage.setdefault('sqlite', None)
+    storage['competicao'] = config.get('api', {}).get('competition_id', 2013)
+    return storage
+
+
+def tipar_partidas(df):
+    """Converte as colunas das partidas para os tipos compactos do armazenamento"""
+    df = df.copy()
+    if 'id' not in df.columns:
+        df['id'] = pd.NA
+
+    times = sorted(set(df['time_casa'].dropna()) | set(df['time_fora'].dropna()))
+    categoria_times = pd.CategoricalDtype(times)
+
+    df['id'] = pd.to_numeric(df['id']).astype('Int64')
+    df['rodada'] = pd.to_numeric(df['rodada']).astype(np.int16)
+    df['data'] = pd.to_datetime(df['data'], utc=True).dt.as_unit('ns')
+    df['status'] = df['status'].astype('category')
+    df['time_casa'] = df['time_casa'].astype(categoria_times)
+    df['time_fora'] = df['time_fora'].astype(categoria_times)
+    df['gols_casa'] = pd.to_numeric(df['gols_casa']).astype('Int8')
+    df['gols_fora'] = pd.to_numeric(df['gols_fora']).astype('Int8')
+    df['vencedor'] = df['vencedor'].astype('category')
+    df['temporada'] = pd.to_numeric(df['temporada']).astype(np.int16)
+
+    colunas = COLUNAS_PARTIDAS + [c for c in df.columns if c not in COLUNAS_PARTIDAS]
+    return df[colunas]
+
+
+def tipar_classificacao(df):
+    """Classificação com time categórico e contagens em int16"""
+    df = df.copy()
+    for coluna in df.columns:
+        if coluna != 'time':
+            df[coluna] = pd.to_numeric(df[coluna]).astype(np.int16)
+    df['time'] = df['time'].astype('category')
+    return df
+
+
+def _caminho(base, formato):
+    return f"{base}{EXTENSOES[formato]}"
+
+
+def _gravar(df, caminho, formato):
+    """Escrita atômica: arquivo temporário no mesmo diretório e os.replace"""
+    os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    if formato == 'parquet':
+        df.to_parquet(temporario, index=False)
+    elif formato == 'feather':
+        df.reset_index(drop=True).to_feather(temporario)
+    else:
+        df.to_csv(temporario, index=False)
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def _ler(caminho):
+    if caminho.endswith('.parquet'):
+        return pd.read_parquet(caminho)
+    if caminho.endswith('.feather'):
+        return pd.read_feather(caminho)
+    return pd.read_csv(caminho)
+
+
+def _arquivo_existente(base):
+    """Arquivo de `base` em qualquer formato legível (colunares primeiro)"""
+    for formato in ('parquet', 'feather', 'csv'):
+        if formato != 'csv' and FORMATO_PADRAO == 'csv':
+            continue
+        caminho = _caminho(base, formato)
+        if os.path.exists(caminho):
+            return caminho
+    return None
+
+
+def exportar_csv(df, caminho):
+    """Exporta um DataFrame para CSV com escrita atômica"""
+    return _gravar(df, caminho, 'csv')
+
+
+def salvar_temporada(df, temporada, competicao=None, formato=None, diretorio=DIRETORIO_PARTIDAS):
+    """Grava a partição de uma temporada"""
+    storage = configuracao()
+    competicao = competicao or storage['competicao']
+    formato = formato or storage['formato']
+
+    base = os.path.join(diretorio, str(competicao), str(int(temporada)))
+    caminho = _gravar(tipar_partidas(df), _caminho(base, formato), formato)
+
+    # Remove a mesma temporada gravada em outro formato
+    for outro in EXTENSOES:
+        if outro != formato and os.path.exists(_caminho(base, outro)):
+            os.remove(_caminho(base, outro))
+
+    banco = match_store.banco_configurado()
+    if banco is not None:
+        banco.salvar_temporada(df, temporada, competicao)
+    return caminho
+
+
+def salvar_partidas(df, competicao=None, formato=None, diretorio=DIRETORIO_PARTIDAS):
+    """Grava cada temporada de `df` na sua partição"""
+    return [
+        salvar_temporada(partidas, temporada, competicao, formato, diretorio)
+        for temporada, partidas in df.groupby('temporada', observed=True)
+    ]
+
+
+def temporadas_salvas(competicao=None, diretorio=DIRETORIO_PARTIDAS):
+    """Temporadas com partição gravada para a competição"""
+    competicao = competicao or configuracao()['competicao']
+    pasta = os.path.join(diretorio, str(competicao))
+    if not os.path.isdir(pasta):
+        return []
+    return sorted({
+        int(nome.split('.')[0]) for nome in os.listdir(pasta)
+        if nome.split('.')[0].isdigit() and os.path.splitext(nome)[1] in EXTENSOES.values()
+    })
+
+
+def carregar_partidas(competicao=None, temporadas=None, diretorio=DIRETORIO_PARTIDAS):
+    """Partidas tipadas da competição (todas as temporadas ou as indicadas)
+
+    Sem partições gravadas, lê e tipa o CSV legado data/brasileirao_matches.csv.
+    Retorna None se não houver dados.
+    """
+    competicao = competicao or configuracao()['competicao']
+    temporadas = temporadas or temporadas_salvas(competicao, diretorio)
+
+    arquivos = [
+        _arquivo_existente(os.path.join(diretorio, str(competicao), str(temporada)))
+        for temporada in temporadas
+    ]
+    arquivos = [arquivo for arquivo in arquivos if arquivo]
+
+    if arquivos:
+        df = pd.concat([_ler(arquivo) for arquivo in arquivos], ignore_index=True)
+    elif os.path.exists(CSV_PARTIDAS):
+        df = pd.read_csv(CSV_PARTIDAS)
+    else:
+        return None
+
+    # As categorias de cada partição são unificadas ao tipar o conjunto
+    df = tipar_partidas(df)
+    return df.sort_values(['temporada', 'rodada', 'data']).reset_index(drop=True)
+
+
+def salvar_classificacao(df, formato=None, caminho=CAMINHO_CLASSIFICACAO):
+    """Grava a tabela de classificação (e o CSV, se exportar_csv estiver ativo)"""
+    storage = configuracao()
+    formato = formato or storage['formato']
+    arquivo = _gravar(tipar_classificacao(df), _caminho(caminho, formato), formato)
+    if storage['exportar_csv'] and formato != 'csv':
+        exportar_csv(df, CSV_CLASSIFICACAO)
+
+    banco = match_store.banco_configurado()
+    if banco is not None:
+        banco.salvar_classificacao(df)
+    return arquivo
+
+
+def carregar_classificacao(caminho=CAMINHO_CLASSIFICACAO):
+    """Tabela de classificação salva, ou None"""
+    arquivo = _arquivo_existente(caminho)
+    if arquivo is None:
+        return None
+    return tipar_classificacao(_ler(arquivo))
+
+
+def existem_partidas(competicao=None):
+    return bool(temporadas_salvas(competicao)) or os.path.exists(CSV_PARTIDAS)
+
+
+def assinatura_partidas(competicao=None, diretorio=DIRETORIO_PARTIDAS):
+    """Tamanho e data de modificação dos arquivos de partidas (muda a cada escrita)"""
+    competicao = competicao or configuracao()['competicao']
+    pasta = os.path.join(diretorio, str(competicao))
+    arquivos = sorted(
+        os.path.join(pasta, nome) for nome in os.listdir(pasta)
+        if os.path.splitext(nome)[1] in EXTENSOES.values()
+    ) if os.path.isdir(pasta) else []
+    if not arquivos and os.path.exists(CSV_PARTIDAS):
+        arquivos = [CSV_PARTIDAS]
+
+    partes = []
+    for arquivo in arquivos:
+        estado = os.stat(arquivo)
+        partes.append(f"{os.path.basename(arquivo)}:{estado.st_size}-{estado.st_mtime_ns}")
+    return ';'.join(partes) or None
@@ -0,0 +1,106 @@
+"""Busca de hiperparâmetros do BrasileiraoPredictor por successive halving.
+
+Uso:
+    python -m src.tuning [--perfil NOME] [--n-jobs N]
+
+O espaço de busca e o orçamento vêm de `model.tuning` em config/config.yaml.
+O melhor conjunto é gravado em config/perfis/<perfil>.yaml e pode ser
+carregado com BrasileiraoPredictor(perfil=<perfil>).
+"""
+import argparse
+import logging
+from datetime import datetime
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingRandomSearchCV, TimeSeriesSplit
+
+from .data_processor import BrasileiraoDataProcessor
+from .storage import carregar_partidas
+from .model import BrasileiraoPredictor
+from .utils import carregar_config, salvar_perfil
+
+
+def buscar_hiperparametros(X, y, config_tuning, n_jobs=None, params=None):
+    """Executa o successive halving e retorna o objeto de busca ajustado
+
+    O recurso (n_estimators ou n_samples) cresce por `fator` a cada rodada
+    enquanto só os melhores candidatos seguem. As avaliações usam divisões
+    temporais e são distribuídas em um pool de processos. `params` (seção
+    model.params) são os valores fixos dos parâmetros fora do espaço de busca.
+    """
+    recurso = config_tuning.get('recurso', 'n_estimators')
+    estimador = clone(BrasileiraoPredictor(params=params).model).set_params(n_jobs=1)
+
+    parametros = {}
+    if recurso == 'n_estimators':
+        parametros['min_resources'] = config_tuning.get('min_recursos', 50)
+        parametros['max_resources'] = config_tuning.get('max_recursos', 500)
+        estimador.set_params(n_estimators=parametros['max_resources'])
+
+    busca = HalvingRandomSearchCV(
+        estimador,
+        config_tuning['espaco'],
+        n_candidates=config_tuning.get('n_candidatos', 'exhaust'),
+        resource=recurso,
+        factor=config_tuning.get('fator', 3),
+        cv=TimeSeriesSplit(n_splits=config_tuning.get('n_splits', 4)),
+        scoring='neg_log_loss',
+        refit=False,
+        n_jobs=n_jobs if n_jobs is not None else config_tuning.get('n_jobs', -1),
+        random_state=42,
+        **parametros
+    )
+    busca.fit(X, y)
+    return busca
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ajuste de hiperparâmetros por successive halving')
+    parser.add_argument('--config', default='config/config.yaml')
+    parser.add_argument('--perfil', default=None, help='Nome do perfil gravado')
+    parser.add_argument('--n-jobs', type=int, default=None, help='Processos usados na busca')
+    args = parser.parse_args()
+
+    config = carregar_config(args.config)
+    config_tuning = config['model']['tuning']
+    perfil = args.perfil or config_tuning.get('perfil', 'ajustado')
+
+    df = carregar_partidas()
+    if df is None:
+        print('Nenhuma partida encontrada; rode a coleta de dados primeiro')
+        return
+
+    X, y = BrasileiraoDataProcessor().preparar_dados_treino(df)
+    if X is None:
+        print('Dados insuficientes para a busca')
+        return
+
+    inicio = datetime.now()
+    busca = buscar_hiperparametros(X, y, config_tuning, args.n_jobs, config['model'].get('params'))
+    duracao = (datetime.now() - inicio).total_seconds()
+
+    melhores = {
+        chave: (valor.item() if isinstance(valor, np.generic) else valor)
+        for chave, valor in busca.best_params_.items()
+    }
+    if config_tuning.get('recurso', 'n_estimators') == 'n_estimators':
+        melhores['n_estimators'] = int(busca.n_resources_[-1])
+
+    caminho = salvar_perfil(perfil, melhores, {
+        'log_loss': float(-busca.best_score_),
+        'n_amostras': int(len(X)),
+        'iteracoes': int(busca.n_iterations_),
+        'candidatos': [int(n) for n in busca.n_candidates_],
+        'duracao_s': round(duracao, 1),
+        'criado_em': inicio.isoformat()
+    })
+
+    logging.info(f"Perfil {perfil} salvo em {caminho}: {melhores}")
+    print(f"Melhores parâmetros ({-busca.best_score_:.4f} log loss): {melhores}")
+    print(f"Perfil salvo em {caminho}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+import os
+
+import numpy as np
+import pandas as pd
+import yaml
+
+
+def carregar_config(caminho='config/config.yaml'):
+    """Lê o arquivo de configuração do projeto"""
+    with open(caminho, encoding='utf-8') as arquivo:
+        return yaml.safe_load(arquivo) or {}
+
+
+def caminho_perfil(nome, diretorio='config/perfis'):
+    """Caminho do arquivo de um perfil de hiperparâmetros"""
+    return os.path.join(diretorio, f"{nome}.yaml")
+
+
+def carregar_perfil(nome, diretorio='config/perfis'):
+    """Lê os parâmetros do modelo salvos em um perfil"""
+    with open(caminho_perfil(nome, diretorio), encoding='utf-8') as arquivo:
+        return (yaml.safe_load(arquivo) or {}).get('params', {})
+
+
+def salvar_perfil(nome, params, metadados=None, diretorio='config/perfis'):
+    """Grava um perfil de hiperparâmetros que o BrasileiraoPredictor pode carregar"""
+    os.makedirs(diretorio, exist_ok=True)
+    caminho = caminho_perfil(nome, diretorio)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        yaml.safe_dump({'params': params, **(metadados or {})}, arquivo,
+                       allow_unicode=True, sort_keys=False)
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def _rodadas_turno_returno(n_times):
+    """Confrontos de um campeonato de pontos corridos (método do círculo)
+
+    Retorna um array (rodadas x jogos x 2) com os índices (casa, fora); o
+    returno repete o turno com os mandos invertidos.
+    """
+    times = list(range(n_times))
+    turno = []
+    for rodada in range(n_times - 1):
+        jogos = [(times[i], times[n_times - 1 - i]) for i in range(n_times // 2)]
+        if rodada % 2:
+            jogos = [(fora, casa) for casa, fora in jogos]
+        turno.append(jogos)
+        times = [times[0], times[-1]] + times[1:-1]
+    turno = np.array(turno, dtype=np.int64)
+    return np.concatenate([turno, turno[:, :, ::-1]])
+
+
+def gerar_liga(n_times=20, temporadas=1, temporada_inicial=2015, semente=42,
+               media_gols_casa=1.4, media_gols_fora=1.05, variacao_forca=0.2,
+               partidas_agendadas=0):
+    """Liga sintética determinística no formato de data/brasileirao_matches.csv
+
+    Cada temporada é um turno e returno entre `n_times` times (número par),
+    com um jogo por semana por time. Os gols são Poisson com média
+    media_gols_casa/media_gols_fora ajustada pelas forças de ataque e defesa
+    de cada time, sorteadas com desvio `variacao_forca` e que variam um pouco
+    de uma temporada para a outra; `variacao_forca=0` dá a mesma
+    distribuição de resultados para todos os confrontos. As últimas
+    `partidas_agendadas` partidas ficam SCHEDULED, sem placar. A mesma
+    `semente` gera sempre as mesmas partidas.
+    """
+    if n_times < 2 or n_times % 2:
+        raise ValueError('n_times deve ser par e maior que 1')
+
+    rng = np.random.default_rng(semente)
+    nomes = np.array([f"Time {i + 1:02d}" for i in range(n_times)], dtype=object)
+    rodadas = _rodadas_turno_returno(n_times)
+    n_rodadas, jogos_rodada, _ = rodadas.shape
+
+    ataque = rng.normal(0, variacao_forca, n_times)
+    defesa = rng.normal(0, variacao_forca, n_times)
+
+    temporadas_df = []
+    for indice in range(temporadas):
+        temporada = temporada_inicial + indice
+        if indice:
+            ataque = 0.8 * ataque + rng.normal(0, variacao_forca * 0.6, n_times)
+            defesa = 0.8 * defesa + rng.normal(0, variacao_forca * 0.6, n_times)
+
+        # Tabela diferente a cada temporada: sorteia quem ocupa cada posição
+        ordem = rng.permutation(n_times)
+        casa = ordem[rodadas[:, :, 0]].ravel()
+        fora = ordem[rodadas[:, :, 1]].ravel()
+        rodada = np.repeat(np.arange(1, n_rodadas + 1), jogos_rodada)
+
+        gols_casa = rng.poisson(media_gols_casa * np.exp(ataque[casa] - defesa[fora]))
+        gols_fora = rng.poisson(media_gols_fora * np.exp(ataque[fora] - defesa[casa]))
+
+        inicio = pd.Timestamp(f"{temporada}-04-15", tz='UTC')
+        deslocamento = (
+            pd.to_timedelta((rodada - 1) * 7 + rng.integers(0, 3, len(rodada)), unit='D')
+            + pd.to_timedelta(rng.integers(16, 23, len(rodada)), unit='h')
+        )
+
+        temporadas_df.append(pd.DataFrame({
+            'rodada': rodada,
+            'data': inicio + deslocamento,
+            'status': 'FINISHED',
+            'time_casa': nomes[casa],
+            'time_fora': nomes[fora],
+            'gols_casa': gols_casa.astype(np.float64),
+            'gols_fora': gols_fora.astype(np.float64),
+            'vencedor': np.where(
+                gols_casa > gols_fora, 'HOME_TEAM', np.where(gols_casa < gols_fora, 'AWAY_TEAM', 'DRAW')
+            ).astype(object),
+            'temporada': temporada
+        }))
+
+    df = pd.concat(temporadas_df, ignore_index=True)
+    df = df.sort_values(['temporada', 'rodada', 'data'], kind='stable').reset_index(drop=True)
+    df.insert(0, 'id', np.arange(1, len(df) + 1))
+
+    if partidas_agendadas:
+        agendadas = df.index[-partidas_agendadas:]
+        df.loc[agendadas, 'status'] = 'SCHEDULED'
+        df.loc[agendadas, ['gols_casa', 'gols_fora']] = np.nan
+        df.loc[agendadas, 'vencedor'] = None
+
+    return df
@@ -13,7 +13,15 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from src.data_collector import BrasileiraoDataCollector
 from src.data_processor import BrasileiraoDataProcessor
-from src.model import BrasileiraoPredictor
+from src.agregacoes import desempenho_time, estatisticas_campeonato, jogos_do_time
+from src.goals_model import BrasileiraoGoalsModel
+from src.match_store import banco_configurado
+from src.match_table import MatchTable
+from src.model import BrasileiraoPredictor, ModeloCompartilhado
+from src.simulation import BrasileiraoSimulador
+from src.standings import BrasileiraoStandings
+from src import storage
+from src.utils import carregar_config
 
 # Configuração da página
 st.set_page_config(
@@ -81,27 +89,63 @@ if 'model_trained' not in st.session_state:
 # Funções de cache
 @st.cache_resource
 def load_resources():
-    return BrasileiraoDataCollector(), BrasileiraoDataProcessor(), BrasileiraoPredictor()
+    config_modelo = carregar_config().get('model', {})
+    processor = BrasileiraoDataProcessor(banco=banco_configurado())
+    predictor = BrasileiraoPredictor(perfil=config_modelo.get('perfil'), params=config_modelo.get('params'))
+    return BrasileiraoDataCollector(), processor, predictor
+
+
+@st.cache_resource
+def load_model_holder():
+    # Um modelo por processo, recarregado quando o artefato muda
+    return ModeloCompartilhado('models/brasileirao_predictor.joblib')
 
 
 @st.cache_data
 def load_data():
-    if os.path.exists('data/brasileirao_matches.csv'):
-        df = pd.read_csv('data/brasileirao_matches.csv')
-        df['data'] = pd.to_datetime(df['data'])
-        return df
-    return None
+    # Partidas tipadas (times categóricos, gols int8, data como timestamp)
+    return storage.carregar_partidas()
+
+
+@st.cache_resource
+def load_goals_model(df):
+    # Modelo de gols ajustado uma vez por versão dos dados (milissegundos)
+    config_gols = carregar_config().get('model', {}).get('gols', {})
+    modelo = BrasileiraoGoalsModel(**config_gols)
+    resultado = modelo.treinar(df)
+    return None if 'error' in resultado else modelo
+
+
+@st.cache_resource
+def load_match_table(versao):
+    # Times como códigos int16, resultados int8 e índices por time e por
+    # confronto, construídos uma vez por versão dos arquivos de partidas
+    return MatchTable(load_data())
+
+
+def match_table():
+    return load_match_table(storage.assinatura_partidas())
 
 
 @st.cache_data
 def load_standings():
-    if os.path.exists('data/classificacao.csv'):
-        return pd.read_csv('data/classificacao.csv')
-    return None
+    # Classificação derivada das partidas; a salva fica como alternativa
+    df = load_data()
+    if df is not None:
+        standings = BrasileiraoStandings(df).tabela()
+        if standings is not None:
+            return standings
+    return storage.carregar_classificacao()
 
 
 # Carregar recursos
 collector, processor, predictor = load_resources()
+modelo_compartilhado = load_model_holder()
+
+# O artefato traz o scaler ajustado, então não é preciso retreinar
+modelo_atual = modelo_compartilhado.obter()
+if modelo_atual is not None and modelo_atual.scaler is not None:
+    st.session_state.model_trained = True
 
 # Título principal
 st.title("⚽ Análise e Previsão do Brasileirão 2024")
@@ -113,7 +157,7 @@ with st.sidebar:
 
     # Status
     st.markdown("#### 📊 Status do Sistema")
-    data_exists = os.path.exists('data/brasileirao_matches.csv')
+    data_exists = storage.existem_partidas()
     model_exists = os.path.exists('models/brasileirao_predictor.joblib')
 
     status_color = "success-status" if data_exists else "error-status"
@@ -137,10 +181,14 @@ with st.sidebar:
     if st.button("📥 Atualizar Dados"):
         with st.spinner("Coletando dados do campeonato..."):
             try:
-                df = collector.update_data()
-                if df is not None:
+                # Sincronização incremental (carga completa na primeira vez)
+                alteradas = collector.sync_data()
+                if alteradas is not None:
                     st.session_state.data_loaded = True
-                    st.success("✅ Dados atualizados com sucesso!")
+                    if not alteradas.empty:
+                        load_data.clear()
+                        load_standings.clear()
+                    st.success(f"✅ Dados atualizados: {len(alteradas)} partidas novas ou alteradas")
                     st.rerun()
                 else:
                     st.error("❌ Erro ao atualizar dados")
@@ -148,7 +196,7 @@ with st.sidebar:
                 st.error(f"❌ Erro: {str(e)}")
 
     if st.button("🤖 Treinar Modelo"):
-        if not os.path.exists('data/brasileirao_matches.csv'):
+        if not storage.existem_partidas():
             st.error("❌ Atualize os dados primeiro!")
         else:
             with st.spinner("Treinando modelo..."):
@@ -157,11 +205,18 @@ with st.sidebar:
                     if df is not None:
                         X, y = processor.preparar_dados_treino(df)
                         if X is not None and y is not None and len(X) > 0:
-                            results = predictor.treinar(X, y)
+                            results = predictor.treinar(
+                                X, y,
+                                datas=processor.partidas_treino['data'],
+                                rodadas=processor.partidas_treino['rodada_global']
+                            )
                             if 'error' in results:
                                 st.error(f"❌ Erro: {results['error']}")
                             else:
-                                predictor.salvar_modelo()
+                                predictor.salvar_modelo(
+                                    scaler=processor.scaler,
+                                    features=processor.features
+                                )
                                 st.session_state.model_trained = True
 
                                 st.success("✅ Modelo treinado com sucesso!")
@@ -173,8 +228,15 @@ with st.sidebar:
                                 with col2:
                                     st.metric("CV Score", f"{results['cv_mean']:.1%}")
 
+                                col1, col2 = st.columns(2)
+                                with col1:
+                                    st.metric("Log Loss", f"{results['walk_forward']['log_loss']:.3f}")
+                                with col2:
+                                    st.metric("Brier", f"{results['walk_forward']['brier']:.3f}")
+
                                 with st.expander("📊 Relatório Detalhado"):
                                     st.text(results['classification_report'])
+                                    st.dataframe(pd.DataFrame(results['walk_forward']['janelas']))
                         else:
                             st.error("❌ Dados insuficientes")
                     else:
@@ -182,6 +244,44 @@ with st.sidebar:
                 except Exception as e:
                     st.error(f"❌ Erro: {str(e)}")
 
+    # Artefatos compactos só servem previsões
+    artefato_compacto = modelo_atual is not None and modelo_atual.compacto
+    if st.button("⚡ Retreino Incremental", disabled=artefato_compacto,
+                 help="Indisponível para modelos compactos; use o treino completo" if artefato_compacto else None):
+        if not storage.existem_partidas():
+            st.error("❌ Atualize os dados primeiro!")
+        else:
+            with st.spinner("Retreinando modelo..."):
+                try:
+                    df = load_data()
+                    # Parte do artefato atual; sem ele, retreinar faz o treino completo
+                    predictor.carregar_modelo()
+                    X, y = processor.preparar_dados_treino(df, scaler=predictor.scaler)
+                    if X is not None and y is not None and len(X) > 0:
+                        results = predictor.retreinar(
+                            X, y,
+                            datas=processor.partidas_treino['data'],
+                            rodadas=processor.partidas_treino['rodada_global']
+                        )
+                        if 'error' in results:
+                            st.error(f"❌ Erro: {results['error']}")
+                        elif results['modo'] == 'sem_novidades':
+                            st.info("Nenhuma partida nova desde o último treino")
+                        else:
+                            predictor.salvar_modelo(
+                                scaler=predictor.scaler if predictor.scaler is not None else processor.scaler,
+                                features=processor.features
+                            )
+                            st.session_state.model_trained = True
+                            st.success(
+                                f"✅ Retreino {results['modo']}: {results['n_novas']} partidas novas"
+                                + (f" ({results['motivo']})" if results.get('motivo') else "")
+                            )
+                    else:
+                        st.error("❌ Dados insuficientes")
+                except Exception as e:
+                    st.error(f"❌ Erro: {str(e)}")
+
     st.markdown("---")
     st.caption("Desenvolvido para análise do Brasileirão 2024")
 
@@ -317,6 +417,30 @@ with tab1:
         with col4:
             melhor_defesa = standings.loc[standings['gols_contra'].idxmin()]
             st.metric("Melhor Defesa", f"{melhor_defesa['time']} ({melhor_defesa['gols_contra']})")
+
+        # Chances de cada zona pela simulação do restante da temporada
+        st.markdown("### 🎲 Simulação da Temporada")
+        if st.button("🎲 Simular Restante da Temporada", use_container_width=True):
+            df = load_data()
+            modelo_gols = load_goals_model(df) if df is not None else None
+            if modelo_gols is not None:
+                with st.spinner("Simulando temporadas..."):
+                    chances = BrasileiraoSimulador(df).simular(modelo_gols)
+                if chances is not None:
+                    st.dataframe(
+                        chances.style.format({
+                            'posicao_media': '{:.1f}',
+                            'titulo': '{:.1%}',
+                            'libertadores': '{:.1%}',
+                            'sul_americana': '{:.1%}',
+                            'rebaixamento': '{:.1%}'
+                        }),
+                        use_container_width=True
+                    )
+                else:
+                    st.error("❌ Erro na simulação da temporada")
+            else:
+                st.error("❌ Dados insuficientes para simular a temporada")
     else:
         st.error("❌ Dados da classificação não encontrados. Clique em 'Atualizar Dados'.")
 
@@ -354,10 +478,19 @@ with tab2:
 
                 if st.button("🎲 Fazer Previsão", use_container_width=True):
                     try:
-                        X = processor.preparar_dados_predicao(df, time_casa, time_fora)
-                        if X is not None:
-                            predictor.carregar_modelo()
-                            probabilidades = predictor.prever_probabilidades(X)[0]
+                        # Consulta à matriz pré-calculada de todos os confrontos
+                        modelo = modelo_compartilhado.obter()
+                        matriz = modelo.obter_matriz_probabilidades(processor, df) if modelo is not None else None
+                        probabilidades = (
+                            matriz.probabilidades(time_casa, time_fora) if matriz is not None else None
+                        )
+                        if probabilidades is None and modelo is not None:
+                            # A matriz cobre só os times da última temporada; os
+                            # demais confrontos são previstos na hora
+                            previsao = modelo.prever_partidas(processor, df, [(time_casa, time_fora)])
+                            if previsao is not None and not previsao.empty:
+                                probabilidades = previsao[['prob_fora', 'prob_empate', 'prob_casa']].to_numpy()[0]
+                        if probabilidades is not None:
 
                             # Container para resultados
                             st.markdown("""
@@ -426,26 +559,39 @@ with tab2:
 
                             st.plotly_chart(fig, use_container_width=True)
 
+                            # Placares do modelo de gols (Dixon-Coles)
+                            modelo_gols = load_goals_model(df)
+                            if modelo_gols is not None:
+                                st.markdown("### ⚽ Placares Mais Prováveis")
+                                placares = modelo_gols.placares_provaveis(time_casa, time_fora)
+                                colunas_placar = st.columns(len(placares))
+                                for coluna, (gols_casa, gols_fora, prob) in zip(colunas_placar, placares):
+                                    coluna.metric(f"{gols_casa} x {gols_fora}", f"{prob:.1%}")
+
                             # Histórico Recente
                             st.markdown("### 📊 Forma Recente")
                             col1, col2 = st.columns(2)
 
                             with col1:
-                                forma_casa = processor.obter_forma_recente(df, time_casa)
+                                forma_casa = processor.obter_forma_recente(df, time_casa, tabela=match_table())
                                 st.markdown(f"**{time_casa}**")
                                 st.markdown(f"<h3>{''.join(forma_casa)}</h3>", unsafe_allow_html=True)
 
                             with col2:
-                                forma_fora = processor.obter_forma_recente(df, time_fora)
+                                forma_fora = processor.obter_forma_recente(df, time_fora, tabela=match_table())
                                 st.markdown(f"**{time_fora}**")
                                 st.markdown(f"<h3>{''.join(forma_fora)}</h3>", unsafe_allow_html=True)
 
                             # Confrontos diretos
                             st.markdown("### 🤝 Confrontos Diretos")
-                            confrontos = df[
-                                ((df['time_casa'] == time_casa) & (df['time_fora'] == time_fora)) |
-                                ((df['time_casa'] == time_fora) & (df['time_fora'] == time_casa))
-                                ].sort_values('data', ascending=False)
+                            confrontos = None
+                            if processor.banco is not None:
+                                confrontos = processor.banco.confronto_direto(
+                                    time_casa, time_fora, n=5, apenas_finalizadas=False
+                                )
+                            if confrontos is None:
+                                # Índice de confrontos da MatchTable (mais recentes primeiro)
+                                confrontos = df.iloc[match_table().confronto(time_casa, time_fora)[::-1]]
 
                             if not confrontos.empty:
                                 for _, jogo in confrontos.head(5).iterrows():
@@ -471,6 +617,27 @@ with tab2:
                             st.error("❌ Dados insuficientes para previsão")
                     except Exception as e:
                         st.error(f"❌ Erro ao fazer previsão: {str(e)}")
+
+            # Previsão em lote dos jogos ainda não disputados
+            st.markdown("### 📅 Próximos Jogos")
+            if st.button("📋 Prever Jogos Restantes", use_container_width=True):
+                try:
+                    modelo = modelo_compartilhado.obter()
+                    previsoes = modelo.prever_partidas(processor, df) if modelo is not None else None
+                    if previsoes is not None and not previsoes.empty:
+                        colunas = [c for c in ['rodada', 'data', 'time_casa', 'time_fora'] if c in previsoes.columns]
+                        st.dataframe(
+                            previsoes[colunas + ['prob_casa', 'prob_empate', 'prob_fora']].style.format({
+                                'prob_casa': '{:.1%}',
+                                'prob_empate': '{:.1%}',
+                                'prob_fora': '{:.1%}'
+                            }),
+                            use_container_width=True
+                        )
+                    else:
+                        st.info("Nenhum jogo restante com dados suficientes para previsão")
+                except Exception as e:
+                    st.error(f"❌ Erro ao prever jogos restantes: {str(e)}")
         else:
             st.error("❌ Dados não encontrados")
 
@@ -481,12 +648,14 @@ with tab3:
     df = load_data()
     if df is not None:
         try:
+            estatisticas = estatisticas_campeonato(df, match_table())
+
             # Estatísticas gerais em cards
             st.markdown("### 📊 Visão Geral")
             col1, col2, col3, col4 = st.columns(4)
 
             with col1:
-                total_jogos = len(df[df['status'] == 'FINISHED'])
+                total_jogos = estatisticas['total_jogos']
                 st.markdown(
                     f"""
                     <div class="metric-card" style="text-align: center;">
@@ -498,7 +667,7 @@ with tab3:
                 )
 
             with col2:
-                media_gols = (df['gols_casa'].mean() + df['gols_fora'].mean()) / 2
+                media_gols = estatisticas['media_gols']
                 st.markdown(
                     f"""
                     <div class="metric-card" style="text-align: center;">
@@ -510,8 +679,7 @@ with tab3:
                 )
 
             with col3:
-                vitorias_casa = len(df[df['vencedor'] == 'HOME_TEAM'])
-                aproveitamento_casa = vitorias_casa / total_jogos * 100
+                aproveitamento_casa = estatisticas['vitorias_casa']
                 st.markdown(
                     f"""
                     <div class="metric-card" style="text-align: center;">
@@ -523,8 +691,7 @@ with tab3:
                 )
 
             with col4:
-                empates = len(df[df['vencedor'] == 'DRAW'])
-                taxa_empates = empates / total_jogos * 100
+                taxa_empates = estatisticas['empates']
                 st.markdown(
                     f"""
                     <div class="metric-card" style="text-align: center;">
@@ -541,12 +708,7 @@ with tab3:
 
             with col1:
                 # Gráfico de gols por rodada
-                gols_rodada = df.groupby('rodada').agg({
-                    'gols_casa': 'sum',
-                    'gols_fora': 'sum'
-                }).reset_index()
-
-                gols_rodada['total_gols'] = gols_rodada['gols_casa'] + gols_rodada['gols_fora']
+                gols_rodada = estatisticas['gols_rodada']
 
                 fig = go.Figure()
                 fig.add_trace(go.Scatter(
@@ -576,13 +738,7 @@ with tab3:
 
             with col2:
                 # Distribuição de resultados
-                resultados = df['vencedor'].value_counts()
-                labels = {
-                    'HOME_TEAM': 'Vitória Casa',
-                    'AWAY_TEAM': 'Vitória Fora',
-                    'DRAW': 'Empate'
-                }
-                resultados.index = resultados.index.map(labels)
+                resultados = estatisticas['resultados']
 
                 fig = go.Figure(data=[go.Pie(
                     labels=resultados.index,
@@ -604,12 +760,8 @@ with tab3:
             # Artilharia por time
             st.markdown("### ⚽ Artilharia por Time")
 
-            gols_times = pd.DataFrame()
-            gols_pro = df.groupby('time_casa')['gols_casa'].sum() + \
-                       df.groupby('time_fora')['gols_fora'].sum()
-
-            gols_contra = df.groupby('time_casa')['gols_fora'].sum() + \
-                          df.groupby('time_fora')['gols_casa'].sum()
+            gols_pro = estatisticas['gols_pro']
+            gols_contra = estatisticas['gols_contra']
 
             fig = go.Figure()
             fig.add_trace(go.Bar(
@@ -667,31 +819,20 @@ with tab4:
         )
 
         try:
-            # Filtrar jogos do time
-            jogos_time = df[
-                (df['time_casa'] == time_selecionado) |
-                (df['time_fora'] == time_selecionado)
-                ].copy()
+            # Jogos do time (pelos índices do banco, se configurado) com resultado e gols
+            jogos_time, mandante, pontos = jogos_do_time(
+                df, match_table(), time_selecionado, banco=processor.banco
+            )
+            desempenho = desempenho_time(mandante, pontos)
 
             if not jogos_time.empty:
-                # Adicionar coluna de resultado
-                jogos_time['resultado'] = jogos_time.apply(
-                    lambda x: 'Vitória' if (
-                            (x['time_casa'] == time_selecionado and x['vencedor'] == 'HOME_TEAM') or
-                            (x['time_fora'] == time_selecionado and x['vencedor'] == 'AWAY_TEAM')
-                    ) else 'Derrota' if (
-                            (x['time_casa'] == time_selecionado and x['vencedor'] == 'AWAY_TEAM') or
-                            (x['time_fora'] == time_selecionado and x['vencedor'] == 'HOME_TEAM')
-                    ) else 'Empate',
-                    axis=1
-                )
 
                 # Métricas principais
                 st.markdown("### 📊 Desempenho Geral")
                 col1, col2, col3, col4 = st.columns(4)
 
                 with col1:
-                    vitorias = len(jogos_time[jogos_time['resultado'] == 'Vitória'])
+                    vitorias = desempenho['vitorias']
                     st.markdown(
                         f"""
                         <div class="metric-card" style="text-align: center;">
@@ -703,7 +844,7 @@ with tab4:
                     )
 
                 with col2:
-                    empates = len(jogos_time[jogos_time['resultado'] == 'Empate'])
+                    empates = desempenho['empates']
                     st.markdown(
                         f"""
                         <div class="metric-card" style="text-align: center;">
@@ -715,7 +856,7 @@ with tab4:
                     )
 
                 with col3:
-                    derrotas = len(jogos_time[jogos_time['resultado'] == 'Derrota'])
+                    derrotas = desempenho['derrotas']
                     st.markdown(
                         f"""
                         <div class="metric-card" style="text-align: center;">
@@ -727,7 +868,7 @@ with tab4:
                     )
 
                 with col4:
-                    aproveitamento = (vitorias * 3 + empates) / (len(jogos_time) * 3) * 100
+                    aproveitamento = desempenho['aproveitamento']
                     st.markdown(
                         f"""
                         <div class="metric-card" style="text-align: center;">
@@ -763,17 +904,10 @@ with tab4:
 
                 with col2:
                     # Gráfico de desempenho casa vs fora
-                    jogos_casa = jogos_time[jogos_time['time_casa'] == time_selecionado]
-                    jogos_fora = jogos_time[jogos_time['time_fora'] == time_selecionado]
-
-                    vit_casa = len(jogos_casa[jogos_casa['vencedor'] == 'HOME_TEAM'])
-                    vit_fora = len(jogos_fora[jogos_fora['vencedor'] == 'AWAY_TEAM'])
-
-                    emp_casa = len(jogos_casa[jogos_casa['vencedor'] == 'DRAW'])
-                    emp_fora = len(jogos_fora[jogos_fora['vencedor'] == 'DRAW'])
-
-                    der_casa = len(jogos_casa[jogos_casa['vencedor'] == 'AWAY_TEAM'])
-                    der_fora = len(jogos_fora[jogos_fora['vencedor'] == 'HOME_TEAM'])
+                    casa, fora = desempenho['casa'], desempenho['fora']
+                    vit_casa, vit_fora = casa['vitorias'], fora['vitorias']
+                    emp_casa, emp_fora = casa['empates'], fora['empates']
+                    der_casa, der_fora = casa['derrotas'], fora['derrotas']
 
                     fig = go.Figure(data=[
                         go.Bar(name='Vitórias', x=['Casa', 'Fora'], y=[vit_casa, vit_fora], marker_color='#2ECC71'),
@@ -825,18 +959,6 @@ with tab4:
                 # Tendências de gols
                 st.markdown("### 📈 Tendências de Gols")
 
-                # Preparar dados para o gráfico
-                jogos_time['gols_marcados'] = jogos_time.apply(
-                    lambda x: x['gols_casa'] if x['time_casa'] == time_selecionado
-                    else x['gols_fora'],
-                    axis=1
-                )
-                jogos_time['gols_sofridos'] = jogos_time.apply(
-                    lambda x: x['gols_fora'] if x['time_casa'] == time_selecionado
-                    else x['gols_casa'],
-                    axis=1
-                )
-
                 fig = go.Figure()
 
                 fig.add_trace(go.Scatter(
@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+
+from src.agregacoes import desempenho_time, estatisticas_campeonato, jogos_do_time
+from src.match_table import MatchTable
+from src.utils import gerar_liga
+
+
+def test_estatisticas_campeonato_igual_pandas():
+    df = gerar_liga(n_times=8, temporadas=2, semente=3, partidas_agendadas=4)
+    estatisticas = estatisticas_campeonato(df, MatchTable(df))
+
+    finalizadas = df[df['status'] == 'FINISHED']
+    assert estatisticas['total_jogos'] == len(finalizadas)
+    assert estatisticas['vitorias_casa'] == pytest.approx((finalizadas['vencedor'] == 'HOME_TEAM').mean() * 100)
+    assert estatisticas['empates'] == pytest.approx((finalizadas['vencedor'] == 'DRAW').mean() * 100)
+    assert estatisticas['gols_rodada']['total_gols'].sum() == df['gols_casa'].sum() + df['gols_fora'].sum()
+    assert estatisticas['resultados']['Vitória Casa'] == (df['vencedor'] == 'HOME_TEAM').sum()
+
+    for time in ('Time 01', 'Time 05'):
+        casa, fora = df[df['time_casa'] == time], df[df['time_fora'] == time]
+        assert estatisticas['gols_pro'][time] == casa['gols_casa'].sum() + fora['gols_fora'].sum()
+        assert estatisticas['gols_contra'][time] == casa['gols_fora'].sum() + fora['gols_casa'].sum()
+
+
+def test_jogos_do_time_igual_filtro_por_nome():
+    df = gerar_liga(n_times=6, temporadas=2, semente=4, partidas_agendadas=3)
+    time = sorted(df['time_casa'].unique())[2]
+    jogos, mandante, pontos = jogos_do_time(df, MatchTable(df), time)
+
+    esperado = df[(df['time_casa'] == time) | (df['time_fora'] == time)].sort_values('data', kind='stable')
+    assert sorted(jogos.index) == sorted(esperado.index)
+
+    for (_, jogo), em_casa in zip(jogos.iterrows(), mandante):
+        assert em_casa == (jogo['time_casa'] == time)
+        lado, outro = ('casa', 'fora') if em_casa else ('fora', 'casa')
+        assert jogo[['gols_marcados', 'gols_sofridos']].tolist() == \
+            pytest.approx(jogo[[f'gols_{lado}', f'gols_{outro}']].tolist(), nan_ok=True)
+        if pd.isna(jogo['vencedor']):
+            assert jogo['resultado'] == 'Empate'
+        else:
+            venceu = jogo['vencedor'] == ('HOME_TEAM' if em_casa else 'AWAY_TEAM')
+            perdeu = jogo['vencedor'] == ('AWAY_TEAM' if em_casa else 'HOME_TEAM')
+            assert jogo['resultado'] == ('Vitória' if venceu else 'Derrota' if perdeu else 'Empate')
+
+    desempenho = desempenho_time(mandante, pontos)
+    contagem = jogos['resultado'].value_counts()
+    assert desempenho['vitorias'] == contagem.get('Vitória', 0)
+    assert desempenho['empates'] == contagem.get('Empate', 0)
+    assert desempenho['derrotas'] == contagem.get('Derrota', 0)
+    assert desempenho['casa']['vitorias'] + desempenho['fora']['vitorias'] == desempenho['vitorias']
@@ -0,0 +1,40 @@
+import pandas as pd
+
+from src.data_collector import BrasileiraoDataCollector
+from src.standings import BrasileiraoStandings
+
+
+def _partida(id_partida, casa, fora, status='FINISHED', placar=(1, 0), vencedor='HOME_TEAM'):
+    return {
+        'id': id_partida,
+        'matchday': 1,
+        'utcDate': f"2024-04-{10 + id_partida:02d}T19:00:00Z",
+        'status': status,
+        'season': {'startDate': '2024-04-01'},
+        'homeTeam': {'name': casa},
+        'awayTeam': {'name': fora},
+        'score': {'winner': vencedor, 'fullTime': {'home': placar[0], 'away': placar[1]}}
+    }
+
+
+def test_process_matches_data_aceita_time_nulo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    collector = BrasileiraoDataCollector()
+    payload = {'matches': [
+        _partida(1, 'Flamengo', 'Palmeiras'),
+        _partida(2, None, 'Flamengo', status='TIMED', placar=(None, None), vencedor=None),
+        _partida(3, 'Palmeiras', 'Santos', status=None, placar=(0, 0), vencedor='DRAW')
+    ]}
+
+    df = collector.process_matches_data(payload).sort_values('id').reset_index(drop=True)
+
+    assert len(df) == 3
+    assert pd.isna(df.loc[1, 'time_casa'])
+    assert df.loc[1, 'time_fora'] == 'Flamengo'
+    assert pd.isna(df.loc[2, 'status'])
+    assert pd.isna(df.loc[1, 'gols_casa'])
+    assert set(df['time_casa'].cat.categories) == {'Flamengo', 'Palmeiras', 'Santos'}
+
+    # Partida sem time definido não quebra a classificação derivada
+    tabela = BrasileiraoStandings(df).tabela()
+    assert list(tabela['time']) == ['Flamengo', 'Palmeiras']
@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from src.data_processor import BrasileiraoDataProcessor, EstadoTimes
+from src.utils import gerar_liga
+
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'logs').mkdir()
+    return BrasileiraoDataProcessor()
+
+
+def _estatisticas_forca_bruta(partidas, time):
+    """Estatísticas de `time` recalculadas do zero a partir da lista de partidas"""
+    jogos = [p for p in partidas if time in (p[0], p[1])]
+    if len(jogos) < 3:
+        return None
+
+    def pontos(partida):
+        casa, _, _, _, resultado = partida
+        if resultado == 1:
+            return 1
+        venceu_casa = resultado == 2
+        venceu_fora = resultado == 0
+        return 3 if (venceu_casa and casa == time) or (venceu_fora and casa != time) else 0
+
+    em_casa = [p for p in jogos if p[0] == time]
+    fora = [p for p in jogos if p[1] == time]
+    recentes = [pontos(p) for p in reversed(jogos[-5:])]
+    pesos = [1.0, 0.8, 0.6, 0.4, 0.2][:len(recentes)]
+
+    if em_casa:
+        gols_pro = sum(p[2] for p in em_casa) / len(em_casa) / 2
+        gols_contra = sum(p[3] for p in em_casa) / len(em_casa) / 2
+    else:
+        gols_pro = sum(p[3] for p in fora) / len(fora) / 2
+        gols_contra = sum(p[2] for p in fora) / len(fora) / 2
+
+    return {
+        'media_gols_pro': gols_pro,
+        'media_gols_contra': gols_contra,
+        'forma_recente': sum(p * w for p, w in zip(recentes, pesos)) / sum(pesos),
+        'vitorias_casa': sum(pontos(p) == 3 for p in em_casa),
+        'vitorias_fora': sum(pontos(p) == 3 for p in fora),
+        'jogos_casa': len(em_casa),
+        'jogos_fora': len(fora),
+        'aproveitamento_casa': sum(pontos(p) for p in em_casa) / (3 * len(em_casa)) if em_casa else 0,
+        'aproveitamento_fora': sum(pontos(p) for p in fora) / (3 * len(fora)) if fora else 0
+    }
+
+
+def test_estado_times_igual_recalculo_forca_bruta():
+    rng = np.random.default_rng(3)
+    times = ['A', 'B', 'C', 'D', 'E']
+    estado = EstadoTimes()
+    partidas = []
+
+    for _ in range(60):
+        casa, fora = rng.choice(times, size=2, replace=False)
+        gols_casa, gols_fora = (int(g) for g in rng.integers(0, 4, size=2))
+        # -1: partida finalizada sem vencedor informado (zero ponto para os dois)
+        resultado = -1 if rng.random() < 0.05 else (2 if gols_casa > gols_fora else 0 if gols_casa < gols_fora else 1)
+        partida = (casa, fora, gols_casa, gols_fora, resultado)
+        estado.atualizar(*partida)
+        partidas.append(partida)
+
+        for time in times:
+            esperado = _estatisticas_forca_bruta(partidas, time)
+            obtido = estado.estatisticas(time)
+            if esperado is None:
+                assert obtido is None
+                continue
+            for chave, valor in esperado.items():
+                assert obtido[chave] == pytest.approx(valor), (time, chave)
+
+
+def test_preparar_dados_treino_incremental_igual_referencia(processor):
+    df = gerar_liga(n_times=8, temporadas=2, semente=7, partidas_agendadas=4)
+
+    X_incremental, y_incremental = processor.preparar_dados_treino(df, incremental=True)
+    partidas_incremental = processor.partidas_treino
+    X_referencia, y_referencia = BrasileiraoDataProcessor().preparar_dados_treino(df, incremental=False)
+
+    assert X_incremental.shape == X_referencia.shape
+    assert np.allclose(X_incremental, X_referencia)
+    assert np.array_equal(y_incremental, y_referencia)
+    assert len(partidas_incremental) == len(X_incremental)
+
+
+def test_calcular_estatisticas_times_igual_forca_bruta(processor):
+    df = gerar_liga(n_times=6, temporadas=1, semente=11, partidas_agendadas=3)
+    finalizadas = df[df['status'] == 'FINISHED'].sort_values('data', kind='stable')
+    codigos = {'HOME_TEAM': 2, 'DRAW': 1, 'AWAY_TEAM': 0}
+    partidas = [
+        (p.time_casa, p.time_fora, int(p.gols_casa), int(p.gols_fora), codigos.get(p.vencedor, -1))
+        for p in finalizadas.itertuples()
+    ]
+
+    stats = processor.calcular_estatisticas_times(df)
+    times = sorted(set(df['time_casa']) | set(df['time_fora']))
+    assert sorted(stats.index) == times
+
+    for time in times:
+        esperado = _estatisticas_forca_bruta(partidas, time)
+        for chave, valor in esperado.items():
+            assert stats.loc[time, chave] == pytest.approx(valor), (time, chave)
+        assert processor.calcular_estatisticas_time(df, time) == {
+            chave: pytest.approx(valor) for chave, valor in stats.loc[time].items()
+        }
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from src.goals_model import BrasileiraoGoalsModel
+from src.utils import gerar_liga
+
+
+@pytest.fixture
+def modelo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return BrasileiraoGoalsModel()
+
+
+def test_grade_de_placares_e_uma_distribuicao(modelo):
+    df = gerar_liga(n_times=8, temporadas=1, semente=2)
+    resultado = modelo.treinar(df)
+    assert 'error' not in resultado
+
+    grade = modelo.prever_placares(df[['time_casa', 'time_fora']].head(10))
+    assert grade.shape == (10, 11, 11)
+    assert (grade >= 0).all()
+    assert np.allclose(grade.sum(axis=(1, 2)), 1)
+    assert np.allclose(modelo.prever_probabilidades([('Time 01', 'Time 02')]).sum(axis=1), 1)
+
+
+def test_tau_negativo_nao_gera_probabilidade_negativa(modelo):
+    # lambda * mu * rho > 1: a correção de 0x0 seria negativa sem o corte
+    modelo.times = np.array(['A', 'B'], dtype=object)
+    modelo._indice_time = {'A': 0, 'B': 1}
+    modelo.ataque = np.array([1.5, 1.5])
+    modelo.defesa = np.array([0.0, 0.0])
+    modelo.vantagem_casa = 0.0
+    modelo.rho = 0.2
+
+    grade = modelo.prever_placares([('A', 'B')])[0]
+    assert grade[0, 0] == 0
+    assert (grade >= 0).all()
+    assert grade.sum() == pytest.approx(1)
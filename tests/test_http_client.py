@@ -0,0 +1,45 @@
+import gzip
+import json
+
+from src.http_client import CacheRespostas, ClienteAPI
+from src.json_stream import iterar_array
+from src.mock_api import ServidorFootballData
+
+
+def test_corpo_da_resposta_vai_em_stream_para_o_cache(tmp_path):
+    with ServidorFootballData(n_times=6, partidas_agendadas=2) as servidor:
+        cache = CacheRespostas(str(tmp_path / 'cache'), ttl=0)
+        cliente = ClienteAPI(servidor.base_url, cache=cache)
+        caminho = '/competitions/BSA/matches'
+
+        origem, alterado = cliente.get_json_cache(caminho, params={'season': 2023}, decodificar=False)
+        assert alterado
+        assert str(origem).endswith('.gz')
+        partidas = list(iterar_array(origem, 'matches'))
+        assert len(partidas) == 30
+
+        # A entrada guarda só os metadados; o corpo fica no arquivo próprio
+        chave = cache.chave(f"{servidor.base_url}{caminho}", {'season': 2023})
+        entrada = cache.ler(chave)
+        assert 'corpo' not in entrada and entrada['etag']
+        with gzip.open(origem, 'rt', encoding='utf-8') as arquivo:
+            assert json.load(arquivo)['matches'] == partidas
+
+        # TTL vencido: requisição condicional, 304 e o mesmo corpo do disco
+        dados, alterado = cliente.get_json_cache(caminho, params={'season': 2023})
+        assert not alterado
+        assert dados['matches'] == partidas
+        assert servidor.estatisticas['respostas'].get(304) == 1
+        cliente.fechar()
+
+
+def test_sem_cache_devolve_a_resposta_em_stream(tmp_path):
+    with ServidorFootballData(n_times=4) as servidor:
+        cliente = ClienteAPI(servidor.base_url)
+        resposta, alterado = cliente.get_json_cache(
+            '/competitions/BSA/matches', params={'season': 2023}, decodificar=False
+        )
+        assert alterado
+        assert hasattr(resposta, 'iter_content')
+        assert len(list(iterar_array(resposta, 'matches'))) == 12
+        cliente.fechar()
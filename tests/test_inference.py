@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.inference import FlorestaVetorizada, benchmark_inferencia
+
+
+def test_floresta_vetorizada_igual_predict_proba():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 11))
+    y = rng.integers(0, 3, size=300)
+    modelo = RandomForestClassifier(n_estimators=50, max_depth=8, random_state=0).fit(X, y)
+
+    X_teste = rng.normal(size=(200, 11))
+    # A ordem de soma difere da do sklearn: iguais dentro da tolerância
+    assert np.allclose(FlorestaVetorizada.de_modelo(modelo).predict_proba(X_teste), modelo.predict_proba(X_teste))
+
+
+def test_benchmark_inferencia_recusa_floresta_divergente(monkeypatch):
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(100, 5))
+    y = rng.integers(0, 3, size=100)
+    modelo = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+
+    resultado = benchmark_inferencia(modelo, X, repeticoes=5)
+    assert set(resultado['vetorizada']) == {'media_ms', 'p50_ms', 'p95_ms', 'p99_ms'}
+    assert resultado['diferenca_maxima'] < 1e-9
+
+    monkeypatch.setattr(FlorestaVetorizada, 'predict_proba', lambda self, X: np.zeros((len(X), 3)))
+    with pytest.raises(ValueError):
+        benchmark_inferencia(modelo, X, repeticoes=5)
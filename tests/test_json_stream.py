@@ -0,0 +1,39 @@
+import io
+import json
+
+import pytest
+
+from src.json_stream import iterar_array
+
+PAYLOAD = {
+    'filters': {'season': '2024', 'lista': [1, [2, {'x': None}]]},
+    'resultSet': {'count': 3, 'first': '2024-04-13', 'played': 2.5e1},
+    'matches': [
+        {'id': 1, 'homeTeam': {'name': 'São Paulo'}, 'score': {'fullTime': {'home': 10, 'away': -1.25}}},
+        {'id': 22, 'homeTeam': {'name': 'Grêmio "B"'}, 'odds': {'msg': 'a\\bç☃'}, 'ok': True},
+        {'id': 333, 'homeTeam': None, 'score': {'fullTime': {'home': None, 'away': 1e3}}, 'ok': False}
+    ],
+    'depois': 'ignorado'
+}
+
+
+@pytest.mark.parametrize('tamanho_bloco', [1, 2, 3, 5, 7, 16, 1 << 16])
+def test_iterar_array_com_blocos_partidos(tamanho_bloco):
+    texto = json.dumps(PAYLOAD, ensure_ascii=False, indent=1)
+
+    # Bytes partidos no meio de caracteres UTF-8, números, strings e escapes
+    binario = list(iterar_array(io.BytesIO(texto.encode('utf-8')), 'matches', tamanho_bloco))
+    assert binario == PAYLOAD['matches']
+
+    assert list(iterar_array(io.StringIO(texto), 'matches', tamanho_bloco)) == PAYLOAD['matches']
+    assert list(iterar_array(io.StringIO(texto), 'ausente', tamanho_bloco)) == []
+
+
+def test_iterar_array_origens(tmp_path):
+    texto = json.dumps(PAYLOAD)
+    caminho = tmp_path / 'payload.json'
+    caminho.write_text(texto, encoding='utf-8')
+
+    for origem in (PAYLOAD, texto, texto.encode('utf-8'), str(caminho), caminho):
+        assert list(iterar_array(origem, 'matches')) == PAYLOAD['matches']
+    assert list(iterar_array('{"matches": []}', 'matches')) == []
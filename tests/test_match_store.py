@@ -0,0 +1,62 @@
+import sqlite3
+
+import pandas as pd
+
+from src.data_collector import BrasileiraoDataCollector
+from src.match_store import BrasileiraoMatchStore
+from tests.test_data_collector import _partida
+
+
+def _temporada_com_time_nulo():
+    collector = BrasileiraoDataCollector()
+    return collector.process_matches_data({'matches': [
+        _partida(1, 'Flamengo', 'Palmeiras'),
+        _partida(2, None, 'Flamengo', status='TIMED', placar=(None, None), vencedor=None),
+        _partida(3, 'Palmeiras', 'Flamengo', placar=(0, 0), vencedor='DRAW')
+    ]})
+
+
+def test_salvar_temporada_com_time_nulo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = BrasileiraoMatchStore(str(tmp_path / 'partidas.db'), competicao='BSA')
+
+    assert store.salvar_temporada(_temporada_com_time_nulo(), 2024) == 3
+
+    linhas = store._conexao().execute(
+        'SELECT id, time_casa, time_fora, time_a, time_b FROM partidas ORDER BY id'
+    ).fetchall()
+    assert linhas[1] == (2, None, 'Flamengo', None, None)
+    assert linhas[2][3:] == ('Flamengo', 'Palmeiras')
+
+    confronto = store.confronto_direto('Palmeiras', 'Flamengo')
+    assert list(confronto['id']) == [3, 1]
+    assert list(store.partidas_time('Flamengo')['id'].sort_values()) == [1, 2, 3]
+    store.fechar()
+
+
+def test_banco_antigo_migra_times_not_null(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    caminho = str(tmp_path / 'antigo.db')
+    conexao = sqlite3.connect(caminho)
+    conexao.execute("""
+        CREATE TABLE partidas (
+            id INTEGER, competicao TEXT NOT NULL, temporada INTEGER NOT NULL, rodada INTEGER,
+            data TEXT NOT NULL, status TEXT, time_casa TEXT NOT NULL, time_fora TEXT NOT NULL,
+            time_a TEXT NOT NULL, time_b TEXT NOT NULL, gols_casa INTEGER, gols_fora INTEGER,
+            vencedor TEXT
+        )
+    """)
+    conexao.execute(
+        "INSERT INTO partidas VALUES (9, 'BSA', 2023, 1, '2023-05-01T19:00:00Z', 'FINISHED', "
+        "'Santos', 'Flamengo', 'Flamengo', 'Santos', 2, 1, 'HOME_TEAM')"
+    )
+    conexao.commit()
+    conexao.close()
+
+    store = BrasileiraoMatchStore(caminho, competicao='BSA')
+    store.salvar_temporada(_temporada_com_time_nulo(), 2024)
+
+    partidas = store.partidas_time('Flamengo')
+    assert sorted(partidas['id']) == [1, 2, 3, 9]
+    assert pd.isna(partidas.set_index('id').loc[2, 'time_casa'])
+    store.fechar()
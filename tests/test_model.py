@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+from src.model import BrasileiraoPredictor
+from src.utils import salvar_perfil
+
+
+def _dados(n=300, semente=0):
+    rng = np.random.default_rng(semente)
+    return rng.normal(size=(n, 11)), rng.integers(0, 3, size=n)
+
+
+def _preditor(X, y, arvores=40):
+    preditor = BrasileiraoPredictor()
+    preditor.model.set_params(n_estimators=arvores, n_jobs=1)
+    preditor.model.fit(X, y)
+    return preditor
+
+
+def test_artefato_serve_previsoes_da_floresta_mapeada(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    X, y = _dados()
+    original = _preditor(X, y)
+    esperadas = original.model.predict_proba(X)
+    assert original.salvar_modelo(str(tmp_path / 'models' / 'modelo.joblib'))
+
+    carregado = BrasileiraoPredictor()
+    assert carregado.carregar_modelo(str(tmp_path / 'models' / 'modelo.joblib'))
+
+    # Lotes pequenos e grandes saem da floresta mapeada, sem desserializar o estimador
+    assert isinstance(carregado._floresta_vetorizada().valores, np.memmap)
+    assert np.allclose(carregado.prever_probabilidades(X[:1]), esperadas[:1])
+    assert np.allclose(carregado.prever_probabilidades(X), esperadas)
+    assert list(carregado.prever(X)) == list(original.model.predict(X))
+    assert carregado._modelo is None
+
+    # O estimador ainda está lá para quem precisar dele
+    assert len(carregado.model.estimators_) == 40
+    assert np.allclose(carregado.prever_probabilidades(X[:5]), esperadas[:5])
+
+
+def _datas(n):
+    return pd.date_range('2020-01-01', periods=n, freq='D', tz='UTC')
+
+
+def _preditor_treinado(X, y, datas, arvores=20):
+    preditor = BrasileiraoPredictor()
+    preditor.model.set_params(n_estimators=arvores, n_jobs=1)
+    preditor.scaler = StandardScaler().fit(X)
+    assert 'error' not in preditor.treinar(X, y, datas, n_jobs=1)
+    return preditor
+
+
+def test_retreinar_incremental_acrescenta_arvores(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    X, y = _dados(400)
+    datas = _datas(400)
+    preditor = _preditor_treinado(X[:360], y[:360], datas[:360])
+
+    resultado = preditor.retreinar(X, y, datas, arvores_novas=10, n_jobs=1)
+    assert resultado['modo'] == 'incremental'
+    assert resultado['n_novas'] == 40
+    assert len(preditor.model.estimators_) == 30
+    assert [etapa['tipo'] for etapa in preditor.metadados['linhagem']] == ['completo', 'incremental']
+    assert preditor.metadados['ultima_data'] == str(datas[-1])
+
+    assert preditor.retreinar(X, y, datas, n_jobs=1)['modo'] == 'sem_novidades'
+
+
+def test_retreinar_volta_ao_treino_completo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    X, y = _dados(600)
+    datas = _datas(600)
+
+    # Novidades acima de limite_novas: refaz do zero com o tamanho do último treino completo
+    preditor = _preditor_treinado(X[:360], y[:360], datas[:360])
+    resultado = preditor.retreinar(X, y, datas, arvores_novas=10, n_jobs=1)
+    assert resultado['modo'] == 'completo'
+    assert '25%' in resultado['motivo']
+    assert len(preditor.model.estimators_) == 20
+
+    # Incrementos seguidos além de max_incrementos
+    preditor = _preditor_treinado(X[:500], y[:500], datas[:500])
+    assert preditor.retreinar(X[:550], y[:550], datas[:550], arvores_novas=10, max_incrementos=1,
+                              n_jobs=1)['modo'] == 'incremental'
+    resultado = preditor.retreinar(X, y, datas, arvores_novas=10, max_incrementos=1, n_jobs=1)
+    assert resultado['modo'] == 'completo'
+    assert 'incrementais' in resultado['motivo']
+    assert len(preditor.model.estimators_) == 20
+    assert [etapa['tipo'] for etapa in preditor.metadados['linhagem']] == ['completo', 'incremental', 'completo']
+
+    # Floresta que passaria de max_arvores
+    preditor = _preditor_treinado(X[:500], y[:500], datas[:500])
+    resultado = preditor.retreinar(X[:550], y[:550], datas[:550], arvores_novas=10, max_arvores=25, n_jobs=1)
+    assert resultado['modo'] == 'completo'
+    assert 'árvores' in resultado['motivo']
+
+
+def test_exportar_compacto_poda_fora_da_validacao(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    X, y = _dados(600)
+    # Rótulo ligado às features para que a acurácia signifique algo
+    y = np.where(X[:, 0] + X[:, 1] > 0.5, 2, np.where(X[:, 0] + X[:, 1] < -0.5, 0, 1))
+    preditor = _preditor(X[:400], y[:400], arvores=60)
+    caminho = str(tmp_path / 'models' / 'compacto.joblib')
+
+    relatorio = preditor.exportar_compacto(caminho, X[400:], y[400:], tolerancia_poda=0.01, min_arvores=20)
+    assert 'error' not in relatorio
+    assert relatorio['amostras_poda'] == 100
+    assert relatorio['amostras_validacao'] == 100
+    assert 20 <= relatorio['arvores_mantidas'] < 60
+    assert relatorio['bytes_compacto'] < relatorio['bytes_original']
+    assert relatorio['bytes_memoria_compacta'] < relatorio['bytes_memoria_original']
+    assert abs(relatorio['delta_accuracy']) <= 0.05
+
+    carregado = BrasileiraoPredictor()
+    assert carregado.carregar_modelo(caminho)
+    assert carregado.compacto
+    assert np.mean(carregado.prever(X[500:]) == y[500:]) == pytest.approx(relatorio['accuracy_compacta'])
+
+
+def test_floresta_compacta_sem_poda_preserva_previsoes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    X, y = _dados(400)
+    preditor = _preditor(X, y)
+
+    relatorio = preditor.exportar_compacto(str(tmp_path / 'models' / 'compacto.joblib'), X, y, bits=16)
+    assert relatorio['arvores_mantidas'] == 40
+    # Thresholds em float32 não mudam decisões; só a quantização das folhas perde precisão
+    assert relatorio['delta_accuracy'] == 0
+    assert abs(relatorio['delta_log_loss']) < 1e-3
+    assert relatorio['reducao'] > 0
+
+
+def test_perfil_prevalece_sobre_params_do_config(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    salvar_perfil('teste', {'max_depth': 6})
+
+    preditor = BrasileiraoPredictor(perfil='teste', params={'max_depth': 12, 'min_samples_leaf': 3})
+    assert preditor.model.max_depth == 6
+    assert preditor.model.min_samples_leaf == 3
+    assert BrasileiraoPredictor(params={'n_estimators': 10}).model.n_estimators == 10
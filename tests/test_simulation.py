@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from src.simulation import BrasileiraoSimulador
+from src.standings import BrasileiraoStandings
+from src.utils import gerar_liga
+
+
+class _MandanteVenceUmAZero:
+    """Fonte determinística: toda partida restante termina 1x0 para o mandante"""
+
+    def prever_placares(self, partidas):
+        grade = np.zeros((len(partidas), 3, 3))
+        grade[:, 1, 0] = 1
+        return grade
+
+
+@pytest.fixture
+def liga(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return gerar_liga(n_times=6, temporadas=1, semente=13, partidas_agendadas=3)
+
+
+def test_base_da_simulacao_e_a_classificacao_atual(liga):
+    simulador = BrasileiraoSimulador(liga)
+    tabela = BrasileiraoStandings(liga).tabela().set_index('time')
+
+    assert list(simulador.times) == sorted(tabela.index)
+    for time, pontos in zip(simulador.times, simulador.base['pontos']):
+        assert pontos == tabela.loc[time, 'pontos']
+    assert len(simulador.restantes) == 3
+
+
+def test_simulacao_deterministica_bate_com_a_classificacao_final(liga):
+    simulador = BrasileiraoSimulador(liga)
+    resultado = simulador.simular(_MandanteVenceUmAZero(), n_simulacoes=200, tamanho_lote=100, n_jobs=1)
+    assert resultado is not None
+    assert np.allclose(simulador.distribuicao.sum(axis=1), 1)
+
+    final = liga.copy()
+    agendadas = final['status'] == 'SCHEDULED'
+    final.loc[agendadas, ['gols_casa', 'gols_fora']] = [1.0, 0.0]
+    final.loc[agendadas, 'vencedor'] = 'HOME_TEAM'
+    final.loc[agendadas, 'status'] = 'FINISHED'
+    tabela = BrasileiraoStandings(final).tabela()
+
+    # Sem empate em todos os critérios, a posição sorteada é sempre a da tabela
+    criterios = tabela[['pontos', 'vitorias', 'saldo_gols', 'gols_pro']]
+    unicos = ~criterios.duplicated(keep=False)
+    assert unicos.any()
+    indice = {time: i for i, time in enumerate(simulador.times)}
+    for time, posicao in zip(tabela['time'][unicos], tabela['posicao'][unicos]):
+        assert simulador.distribuicao[indice[time], posicao - 1] == 1
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from src.match_table import MatchTable
+from src.standings import BrasileiraoStandings
+from src.utils import gerar_liga
+
+
+def _tabela_forca_bruta(df, data):
+    """Classificação com os jogos finalizados anteriores a `data`, recalculada do zero"""
+    anteriores = df[(df['status'] == 'FINISHED') & (df['data'] < data)]
+    if anteriores.empty:
+        return {}
+    ultima = anteriores.sort_values('data', kind='stable').iloc[-1]
+    temporada = anteriores[anteriores['temporada'] == ultima['temporada']]
+
+    linhas = {}
+    for p in temporada.itertuples():
+        for time, pro, contra, venceu, perdeu in (
+            (p.time_casa, p.gols_casa, p.gols_fora, p.vencedor == 'HOME_TEAM', p.vencedor == 'AWAY_TEAM'),
+            (p.time_fora, p.gols_fora, p.gols_casa, p.vencedor == 'AWAY_TEAM', p.vencedor == 'HOME_TEAM')
+        ):
+            linha = linhas.setdefault(time, [0, 0, 0, 0])
+            linha[0] += 3 if venceu else 1 if p.vencedor == 'DRAW' else 0
+            linha[1] += int(venceu)
+            linha[2] += int(pro) - int(contra)
+            linha[3] += int(pro)
+
+    ordem = sorted(linhas, key=lambda time: (*(-v for v in linhas[time]), time))
+    return {time: posicao for posicao, time in enumerate(ordem, start=1)}
+
+
+def test_snapshots_iguais_recalculo_forca_bruta():
+    df = gerar_liga(n_times=6, temporadas=2, semente=5, partidas_agendadas=3)
+    classificacao = BrasileiraoStandings(df)
+
+    datas = list(pd.Series(df['data'].unique()).sort_values())
+    datas.append(datas[-1] + pd.Timedelta(days=1))
+    for data in datas:
+        esperado = _tabela_forca_bruta(df, data)
+        for time in classificacao.times:
+            assert classificacao.posicao(time, data) == esperado.get(time), (data, time)
+
+
+def test_posicoes_finais_iguais_ultimo_snapshot():
+    df = gerar_liga(n_times=8, temporadas=3, semente=9, partidas_agendadas=4)
+    classificacao = BrasileiraoStandings(df)
+    tabela = MatchTable(df)
+
+    posicoes = BrasileiraoStandings.posicoes_finais(tabela)
+    for time in tabela.times:
+        esperada = classificacao.posicao(time)
+        assert posicoes[tabela.codigo(time)] == (0 if esperada is None else esperada)
+
+    # Tabela final igual à montada pelos snapshots
+    final = classificacao.tabela()
+    assert np.array_equal(posicoes[tabela.codificar(final['time'])], final['posicao'].to_numpy())
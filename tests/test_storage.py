@@ -0,0 +1,17 @@
+import logging
+
+from src import storage
+
+
+def test_formato_sem_pyarrow_cai_para_csv_com_aviso(tmp_path, monkeypatch, caplog):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'config').mkdir()
+    (tmp_path / 'config' / 'config.yaml').write_text('storage:\n  formato: parquet\n', encoding='utf-8')
+    monkeypatch.setattr(storage, 'FORMATO_PADRAO', 'csv')
+    monkeypatch.setattr(storage, '_aviso_formato', False)
+
+    with caplog.at_level(logging.WARNING):
+        assert storage.configuracao()['formato'] == 'csv'
+        assert storage.configuracao()['formato'] == 'csv'
+    avisos = [registro for registro in caplog.records if 'pyarrow' in registro.getMessage()]
+    assert len(avisos) == 1
@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from src import storage
+from src.data_collector import BrasileiraoDataCollector
+from src.mock_api import ServidorFootballData
+
+
+@pytest.fixture
+def servidor(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with ServidorFootballData(n_times=6, partidas_agendadas=4) as servidor:
+        monkeypatch.setenv('FOOTBALL_API_URL', servidor.base_url)
+        yield servidor
+
+
+def _particao():
+    return storage.carregar_partidas(2013).sort_values('id').reset_index(drop=True)
+
+
+def test_sync_data_e_idempotente(servidor):
+    collector = BrasileiraoDataCollector()
+
+    # Primeira sincronização: carga completa, todas as partidas são novas
+    carga = collector.sync_data()
+    assert len(carga) == 30
+    antes = _particao()
+    classificacao = storage.carregar_classificacao()
+
+    # Sem novidades na API, nada muda por mais que se repita
+    for _ in range(2):
+        assert collector.sync_data().empty
+        pd.testing.assert_frame_equal(_particao(), antes)
+    pd.testing.assert_frame_equal(storage.carregar_classificacao(), classificacao)
+
+    # Partida em aberto remarcada: só ela volta, e o upsert não duplica ids
+    partidas, _ = servidor._dados('2013', 2023)
+    agendada = next(p for p in partidas if p['status'] == 'SCHEDULED')
+    agendada['utcDate'] = '2023-12-31T20:00:00Z'
+
+    alteradas = collector.sync_data()
+    assert list(alteradas['id']) == [agendada['id']]
+    depois = _particao()
+    assert depois['id'].is_unique and len(depois) == len(antes)
+    assert depois.loc[depois['id'] == agendada['id'], 'data'].iloc[0] == pd.Timestamp('2023-12-31T20:00:00Z')
+    assert collector.sync_data().empty